@@ -0,0 +1,102 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+# Clients may reuse a stored copy but must revalidate it every time.
+# Bodies depend on the caller, so shared caches must key on the token.
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+CONDITIONAL_VARY = "Authorization"
+
+
+def make_etag(key: str, version: int, variant: str = "") -> str:
+    """
+    Weak ETag for one version of a resource. `variant` covers anything
+    else that changes the body (path and query string).
+    """
+    digest = hashlib.blake2b(
+        f"{key}|{version}|{variant}".encode(),
+        digest_size=12,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison: `W/"x"` matches `"x"`.
+    """
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def _add_vary(response: Response) -> None:
+    vary = response.headers.get("Vary")
+    if not vary:
+        response.headers["Vary"] = CONDITIONAL_VARY
+    elif CONDITIONAL_VARY.lower() not in {part.strip().lower() for part in vary.split(",")}:
+        response.headers["Vary"] = f"{vary}, {CONDITIONAL_VARY}"
+
+
+def conditional_get(
+    request: Request,
+    key: str,
+    version: int | None,
+    viewer: str = "",
+) -> Response | None:
+    """
+    Opt-in conditional GET for read routes.
+
+    Call with the resource's current version before building the body:
+
+        version = await get_resource_version(key)
+        if (not_modified := conditional_get(request, key, version)) is not None:
+            return not_modified
+
+    Returns a 304 when the client's If-None-Match is current. Otherwise
+    returns None and the request middleware adds the ETag to the 200.
+    A `None` version (resource missing or not visible) skips the check.
+
+    Pass `viewer` when the body depends on who asks (e.g. the caller's id
+    and role), so one caller's ETag never validates another's copy.
+    """
+    if version is None:
+        return None
+
+    variant = f"{request.url.path}?{request.url.query}"
+    if viewer:
+        variant = f"{variant}|{viewer}"
+
+    etag = make_etag(key, version, variant)
+    request.state.etag = etag
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response = Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL},
+        )
+        _add_vary(response)
+        return response
+
+    return None
+
+
+def apply_etag(request: Request, response: Response) -> None:
+    """
+    Called by the request middleware on every response.
+    """
+    etag = getattr(request.state, "etag", None)
+    if etag is None or response.status_code != 200:
+        return
+
+    response.headers.setdefault("ETag", etag)
+    response.headers.setdefault("Cache-Control", CONDITIONAL_CACHE_CONTROL)
+    _add_vary(response)
@@ -14,15 +14,60 @@ def _split_csv(value: str | None) -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
+def _int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+
+    return int(value)
+
+
+def _float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+
+    return float(value)
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True)
 class Settings:
     app_env: str
     log_level: str
+    log_format: str
+    log_queue: bool
+    log_sample_rate: float
+    log_slow_request_ms: float
     supabase_url: str | None
     supabase_anon_key: str | None
     supabase_service_role_key: str | None
     supabase_jwt_audience: str
     cors_allow_origins: list[str]
+    supabase_http_max_connections: int
+    supabase_http_max_keepalive_connections: int
+    supabase_http_keepalive_expiry: float
+    supabase_http_timeout: float
+    supabase_http_connect_timeout: float
+    supabase_http2: bool
+    jwks_ttl_seconds: float
+    jwks_min_refresh_interval: float
+    token_cache_max_entries: int
+    token_cache_ttl_seconds: float
+    database_url: str | None
+    pg_read_paths: frozenset[str]
+    pg_pool_min_size: int
+    pg_pool_max_size: int
+    fast_json_responses: bool
+    idempotency_key_ttl_seconds: int
+    metrics_token: str | None
 
     @property
     def supabase_issuer(self) -> str | None:
@@ -63,6 +108,10 @@ def load_settings() -> Settings:
     if not log_level:
         log_level = "WARNING" if app_env == "test" else "INFO"
 
+    log_format = os.getenv("LOG_FORMAT")
+    if not log_format:
+        log_format = "json" if app_env == "production" else "text"
+
     if not cors_allow_origins:
         cors_allow_origins = [
             "http://localhost:19006",
@@ -74,11 +123,35 @@ def load_settings() -> Settings:
     return Settings(
         app_env=app_env,
         log_level=log_level.upper(),
+        log_format=log_format.strip().lower(),
+        log_queue=_bool_env("LOG_QUEUE", True),
+        log_sample_rate=_float_env("LOG_SAMPLE_RATE", 1.0),
+        log_slow_request_ms=_float_env("LOG_SLOW_REQUEST_MS", 1000.0),
         supabase_url=os.getenv("SUPABASE_URL"),
         supabase_anon_key=os.getenv("SUPABASE_ANON_KEY"),
         supabase_service_role_key=os.getenv("SUPABASE_SERVICE_ROLE_KEY"),
         supabase_jwt_audience=os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated"),
         cors_allow_origins=cors_allow_origins,
+        supabase_http_max_connections=_int_env("SUPABASE_HTTP_MAX_CONNECTIONS", 100),
+        supabase_http_max_keepalive_connections=_int_env(
+            "SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            20,
+        ),
+        supabase_http_keepalive_expiry=_float_env("SUPABASE_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        supabase_http_timeout=_float_env("SUPABASE_HTTP_TIMEOUT", 10.0),
+        supabase_http_connect_timeout=_float_env("SUPABASE_HTTP_CONNECT_TIMEOUT", 5.0),
+        supabase_http2=_bool_env("SUPABASE_HTTP2", False),
+        jwks_ttl_seconds=_float_env("JWKS_TTL_SECONDS", 600.0),
+        jwks_min_refresh_interval=_float_env("JWKS_MIN_REFRESH_INTERVAL", 30.0),
+        token_cache_max_entries=_int_env("TOKEN_CACHE_MAX_ENTRIES", 10000),
+        token_cache_ttl_seconds=_float_env("TOKEN_CACHE_TTL_SECONDS", 300.0),
+        database_url=os.getenv("DATABASE_URL"),
+        pg_read_paths=frozenset(_split_csv(os.getenv("PG_READ_PATHS"))),
+        pg_pool_min_size=_int_env("PG_POOL_MIN_SIZE", 1),
+        pg_pool_max_size=_int_env("PG_POOL_MAX_SIZE", 10),
+        fast_json_responses=_bool_env("FAST_JSON_RESPONSES", True),
+        idempotency_key_ttl_seconds=_int_env("IDEMPOTENCY_KEY_TTL_SECONDS", 86400),
+        metrics_token=os.getenv("METRICS_TOKEN") or None,
     )
 
 
@@ -1,45 +1,57 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from typing import List, Union
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-import httpx
-from app.core.permissions import ROLE_PERMISSIONS
+from app.core.jwks import JWKSUnavailableError, jwks_manager
+from app.core.permissions import ROLE_MATCHERS, ROLE_PERMISSIONS
+from app.core.token_cache import VerifiedTokenCache
 from app.config import settings
+from app.db import RequestClients
+from app.timing import timed
 
 security = HTTPBearer()
 
-_jwks_cache = None
+token_cache = VerifiedTokenCache(
+    max_entries=settings.token_cache_max_entries,
+    max_ttl_seconds=settings.token_cache_ttl_seconds,
+)
 
 
-def get_jwks():
-    global _jwks_cache
-    if _jwks_cache is None:
-        if not settings.jwks_url:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="JWKS configuration is missing",
-            )
-
-        resp = httpx.get(settings.jwks_url, timeout=5.0)
-        resp.raise_for_status()
-        _jwks_cache = resp.json()
-    return _jwks_cache
+async def get_signing_key(kid: str | None) -> dict | None:
+    try:
+        return await jwks_manager.get_key(kid)
+    except JWKSUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Signing keys unavailable",
+        )
 
 
-def get_current_user(
+async def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(security),
 ):
     token = creds.credentials
 
+    with timed("auth"):
+        return await _verify_token(token)
+
+
+async def _verify_token(token: str) -> dict:
+    cached = token_cache.get(token)
+    if cached is not None:
+        cached["_jwt"] = token
+        return cached
+
     try:
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get("kid")
 
-        jwks = get_jwks()
-        key = next(
-            (k for k in jwks["keys"] if k["kid"] == kid),
-            None,
-        )
+        key = await get_signing_key(kid)
 
         if not key:
             raise HTTPException(
@@ -78,10 +90,13 @@ def get_current_user(
         # --------------------------------------------------
 
         payload["id"] = payload["sub"]
-        payload["_jwt"] = token
         payload["app_role"] = role
         payload["vendor_id"] = vendor_id  # 🚀 new
 
+        token_cache.set(token, payload)
+
+        payload["_jwt"] = token
+
         return payload
 
 
@@ -105,6 +120,21 @@ def get_current_jwt(
     return user["_jwt"]
 
 
+async def get_request_clients(
+    request: Request,
+    user: dict = Depends(get_current_user),
+) -> RequestClients:
+    """
+    User + service clients for this request, built once and reused by
+    every repository call the route makes.
+    """
+    clients = getattr(request.state, "db_clients", None)
+    if clients is None:
+        clients = RequestClients(user["_jwt"])
+        request.state.db_clients = clients
+    return clients
+
+
 def get_user_id(user: dict) -> str:
     return user["sub"]
 
@@ -112,14 +142,19 @@ def require_permissions(required_permissions: Union[List[str], str]):
     if isinstance(required_permissions, str):
         required_permissions = [required_permissions]
 
-    def permission_checker(current_user: dict = Depends(get_current_user)):
-        role = current_user.get("app_role", "user")
-        user_permissions = ROLE_PERMISSIONS.get(role, [])
-
-        missing_permissions = [
+    # Resolve every role up front; the request path is a dict lookup.
+    missing_by_role = {
+        role: [
             perm for perm in required_permissions
-            if not has_permission(user_permissions, perm)
+            if not matcher.allows(perm)
         ]
+        for role, matcher in ROLE_MATCHERS.items()
+    }
+
+    async def permission_checker(current_user: dict = Depends(get_current_user)):
+        role = current_user.get("app_role", "user")
+
+        missing_permissions = missing_by_role.get(role, required_permissions)
 
         if missing_permissions:
             raise HTTPException(
@@ -138,11 +173,16 @@ def require_any_permission(required_permissions: Union[List[str], str]):
     if isinstance(required_permissions, str):
         required_permissions = [required_permissions]
 
-    def permission_checker(current_user: dict = Depends(get_current_user)):
+    allowed_roles = frozenset(
+        role
+        for role, matcher in ROLE_MATCHERS.items()
+        if any(matcher.allows(perm) for perm in required_permissions)
+    )
+
+    async def permission_checker(current_user: dict = Depends(get_current_user)):
         role = current_user.get("app_role", "user")
-        user_permissions = ROLE_PERMISSIONS.get(role, [])
 
-        if not any(has_permission(user_permissions, perm) for perm in required_permissions):
+        if role not in allowed_roles:
             raise HTTPException(
                 status_code=403,
                 detail="Insufficient permissions",
@@ -156,6 +196,9 @@ def require_any_permission(required_permissions: Union[List[str], str]):
 
 def has_permission(user_permissions: list[str], required_permission: str) -> bool:
     """
+    List-based check, kept for ad-hoc callers; request handling uses
+    the compiled matchers from app.core.permissions.
+
     Checks:
     - Global wildcard (*.*)
     - Exact match
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+
+from app.config import settings
+from app.db import get_async_http_client
+
+
+logger = logging.getLogger("mojara.api")
+
+
+class JWKSUnavailableError(RuntimeError):
+    pass
+
+
+class JWKSKeyManager:
+    """
+    Holds the Supabase signing keys indexed by `kid`.
+
+    - Keys are prefetched in the app lifespan and refreshed in the
+      background every `ttl_seconds`.
+    - An unknown `kid` triggers at most one refresh at a time; concurrent
+      callers await the same in-flight fetch.
+    - Keys are swapped in one assignment, so readers keep using the
+      previous set while a refresh is running or after it fails.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        min_refresh_interval: float,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, dict] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._background_task: asyncio.Task | None = None
+
+    @property
+    def keys(self) -> dict[str, dict]:
+        return self._keys
+
+    async def _fetch(self) -> dict[str, dict]:
+        if not settings.jwks_url:
+            raise JWKSUnavailableError("JWKS configuration is missing")
+
+        resp = await get_async_http_client().get(settings.jwks_url, timeout=5.0)
+        resp.raise_for_status()
+
+        return {
+            key["kid"]: key
+            for key in resp.json().get("keys", [])
+            if key.get("kid")
+        }
+
+    async def _run_refresh(self) -> None:
+        self._last_attempt_at = time.monotonic()
+        keys = await self._fetch()
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self) -> None:
+        """
+        Coalesced refresh: joins the in-flight fetch if there is one.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run_refresh())
+
+        # Shield so a cancelled request doesn't cancel everyone's fetch.
+        await asyncio.shield(self._refresh_task)
+
+    def _refresh_allowed(self) -> bool:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return True
+
+        if not self._keys or self._last_attempt_at is None:
+            return True
+
+        return time.monotonic() - self._last_attempt_at >= self.min_refresh_interval
+
+    async def get_key(self, kid: str | None) -> dict | None:
+        if not kid:
+            return None
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: probably a rotation. Refresh once, rate limited so
+        # tokens with made-up kids can't hammer the JWKS endpoint.
+        if not self._refresh_allowed():
+            return None
+
+        try:
+            await self.refresh()
+        except Exception:
+            if not self._keys:
+                raise
+            logger.warning("jwks_refresh_failed kid=%s", kid, exc_info=True)
+
+        return self._keys.get(kid)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("jwks_background_refresh_failed", exc_info=True)
+
+    async def start(self) -> None:
+        """
+        Prefetch keys and start the TTL refresh loop.
+        A failed prefetch is logged; the first request will retry.
+        """
+        try:
+            await self.refresh()
+        except Exception:
+            logger.warning("jwks_prefetch_failed", exc_info=True)
+
+        if self._background_task is None:
+            self._background_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        tasks = [
+            task
+            for task in (self._background_task, self._refresh_task)
+            if task is not None and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._background_task = None
+        self._refresh_task = None
+
+
+jwks_manager = JWKSKeyManager(
+    ttl_seconds=settings.jwks_ttl_seconds,
+    min_refresh_interval=settings.jwks_min_refresh_interval,
+)
@@ -36,3 +36,67 @@ ROLE_PERMISSIONS: Dict[str, List[str]] = {
     role: permissions for role, permissions in _registry["roles"].items()
 }
 
+
+
+# -------------------------------------------------
+# Compiled matchers (built once at import)
+# -------------------------------------------------
+_WILDCARD = "*"
+
+
+class PermissionMatcher:
+    """
+    One role's permissions compiled for constant-time checks:
+    - `*` grants everything
+    - exact permissions live in a frozenset
+    - resource wildcards (`users.*`) live in a prefix trie keyed by
+      dot-separated segments
+    """
+
+    __slots__ = ("allow_all", "exact", "_trie")
+
+    def __init__(self, permissions: List[str]):
+        self.allow_all = _WILDCARD in permissions
+        self.exact = frozenset(
+            perm for perm in permissions
+            if perm != _WILDCARD and not perm.endswith(".*")
+        )
+        self._trie: Dict[str, dict] = {}
+
+        for perm in permissions:
+            if perm == _WILDCARD or not perm.endswith(".*"):
+                continue
+
+            node = self._trie
+            for segment in perm[:-2].split("."):
+                node = node.setdefault(segment, {})
+            node[_WILDCARD] = {}
+
+    def allows(self, required_permission: str) -> bool:
+        if self.allow_all or required_permission in self.exact:
+            return True
+
+        node = self._trie
+        if not node:
+            return False
+
+        for segment in required_permission.split("."):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if _WILDCARD in node:
+                return True
+
+        return False
+
+
+_EMPTY_MATCHER = PermissionMatcher([])
+
+ROLE_MATCHERS: Dict[str, PermissionMatcher] = {
+    role: PermissionMatcher(permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
+def get_role_matcher(role: str) -> PermissionMatcher:
+    return ROLE_MATCHERS.get(role, _EMPTY_MATCHER)
@@ -0,0 +1,82 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already-verified JWTs.
+
+    Keyed by a SHA-256 digest so raw tokens are never held as dict keys.
+    An entry expires at the token's `exp` or after `max_ttl_seconds`,
+    whichever comes first.
+    """
+
+    def __init__(self, *, max_entries: int, max_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict | None:
+        if self.max_entries <= 0:
+            return None
+
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return dict(payload)
+
+    def set(self, token: str, payload: dict) -> None:
+        if self.max_entries <= 0:
+            return
+
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+
+        if expires_at <= now:
+            return
+
+        digest = self._digest(token)
+        self._entries[digest] = (expires_at, dict(payload))
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
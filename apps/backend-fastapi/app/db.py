@@ -1,8 +1,164 @@
-from supabase import create_client, ClientOptions
+import threading
+import time
+
+import httpx
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    create_client,
+)
 
 from app.config import settings
+from app.metrics import observe_upstream, upstream_kind
+from app.timing import (
+    content_range_rows,
+    count_upstream_call,
+    get_request_timings,
+    record_upstream,
+    upstream_name,
+)
+
+
+_http_client: httpx.Client | None = None
+_service_client: Client | None = None
+_async_http_client: httpx.AsyncClient | None = None
+_async_service_client: AsyncClient | None = None
+_lock = threading.Lock()
+
+
+# -------------------------------------------------
+# 📊 Upstream call accounting (metrics + Server-Timing)
+# -------------------------------------------------
+def _on_upstream_request(request: httpx.Request) -> None:
+    request.extensions["started_at"] = time.perf_counter()
+    count_upstream_call()
+
+
+def _record_upstream_response(response: httpx.Response) -> None:
+    request = response.request
+    started_at = request.extensions.get("started_at")
+    if started_at is None:
+        return
+
+    elapsed = time.perf_counter() - started_at
+    path = request.url.path
+
+    observe_upstream(
+        upstream_kind(path),
+        elapsed,
+        "ok" if response.status_code < 400 else "error",
+    )
+    record_upstream(
+        upstream_name(path),
+        elapsed * 1000,
+        rows=content_range_rows(response.headers.get("content-range")),
+        size=len(response.content),
+    )
+
+
+def _on_upstream_response(response: httpx.Response) -> None:
+    # Read here so the timing covers the body and the size is known;
+    # the client reuses the buffered content afterwards.
+    response.read()
+    _record_upstream_response(response)
+
+
+async def _on_upstream_request_async(request: httpx.Request) -> None:
+    _on_upstream_request(request)
 
 
+async def _on_upstream_response_async(response: httpx.Response) -> None:
+    await response.aread()
+    _record_upstream_response(response)
+
+
+# -------------------------------------------------
+# 🔌 Shared HTTP transport (one pool per process)
+# -------------------------------------------------
+def _http_client_options() -> dict:
+    return {
+        "http2": settings.supabase_http2,
+        "follow_redirects": True,
+        "limits": httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(
+            settings.supabase_http_timeout,
+            connect=settings.supabase_http_connect_timeout,
+        ),
+    }
+
+
+def _build_http_client() -> httpx.Client:
+    return httpx.Client(
+        **_http_client_options(),
+        event_hooks={
+            "request": [_on_upstream_request],
+            "response": [_on_upstream_response],
+        },
+    )
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        **_http_client_options(),
+        event_hooks={
+            "request": [_on_upstream_request_async],
+            "response": [_on_upstream_response_async],
+        },
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Long-lived keep-alive pool shared by every Supabase client.
+    Auth headers are set per client, never on the pool itself.
+    """
+    global _http_client
+
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = _build_http_client()
+
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client, _service_client
+
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _service_client = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Async twin of get_http_client(), used by the async repositories.
+    Only touched from the event loop, so no lock is needed.
+    """
+    global _async_http_client
+
+    if _async_http_client is None:
+        _async_http_client = _build_async_http_client()
+
+    return _async_http_client
+
+
+async def aclose_http_client() -> None:
+    global _async_http_client, _async_service_client
+
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+    _async_http_client = None
+    _async_service_client = None
+
 
 # -------------------------------------------------
 # 🔐 User Client (Respects RLS)
@@ -21,7 +177,8 @@ def get_user_client(jwt: str):
         ClientOptions(
             headers={
                 "Authorization": f"Bearer {jwt}",
-            }
+            },
+            httpx_client=get_http_client(),
         ),
     )
 
@@ -33,11 +190,95 @@ def get_service_client():
     """
     Full admin client.
     Bypasses RLS.
+    Carries no per-request state, so one instance is shared per process.
     """
+    global _service_client
+
     if not settings.supabase_url or not settings.supabase_service_role_key:
         raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be configured")
 
-    return create_client(
+    if _service_client is None:
+        http_client = get_http_client()
+        with _lock:
+            if _service_client is None:
+                _service_client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_service_role_key,
+                    ClientOptions(httpx_client=http_client),
+                )
+
+    return _service_client
+
+
+# -------------------------------------------------
+# ⚡ Async clients (same contracts, non-blocking I/O)
+# -------------------------------------------------
+def get_async_user_client(jwt: str) -> AsyncClient:
+    """
+    Async user client on the shared async pool.
+    This respects RLS policies.
+    """
+    if not settings.supabase_url or not settings.supabase_anon_key:
+        raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY must be configured")
+
+    return AsyncClient(
         settings.supabase_url,
-        settings.supabase_service_role_key,
+        settings.supabase_anon_key,
+        AsyncClientOptions(
+            headers={
+                "Authorization": f"Bearer {jwt}",
+            },
+            httpx_client=get_async_http_client(),
+        ),
     )
+
+
+def get_async_service_client() -> AsyncClient:
+    """
+    Async admin client.
+    Bypasses RLS.
+    """
+    global _async_service_client
+
+    if not settings.supabase_url or not settings.supabase_service_role_key:
+        raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be configured")
+
+    if _async_service_client is None:
+        _async_service_client = AsyncClient(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            AsyncClientOptions(httpx_client=get_async_http_client()),
+        )
+
+    return _async_service_client
+
+
+# -------------------------------------------------
+# 🧾 Request-scoped clients
+# -------------------------------------------------
+class RequestClients:
+    """
+    Builds the user and service clients at most once per request, so a
+    flow that makes several upstream calls reuses the same client.
+    """
+
+    def __init__(self, jwt: str | None):
+        self.jwt = jwt
+        self._user: AsyncClient | None = None
+
+    @property
+    def user(self) -> AsyncClient:
+        if self._user is None:
+            if not self.jwt:
+                raise RuntimeError("No user token on this request")
+            self._user = get_async_user_client(self.jwt)
+        return self._user
+
+    @property
+    def service(self) -> AsyncClient:
+        return get_async_service_client()
+
+    @property
+    def upstream_calls(self) -> int:
+        timings = get_request_timings()
+        return timings.calls if timings is not None else 0
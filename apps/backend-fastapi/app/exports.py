@@ -0,0 +1,98 @@
+import csv
+import io
+
+import orjson
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# One CSV row per order item; orders without items get a single row with
+# the item columns left empty.
+CSV_COLUMNS = [
+    "order_id",
+    "created_at",
+    "status",
+    "market_id",
+    "vendor_id",
+    "user_id",
+    "order_total",
+    "refunded_total",
+    "refund_count",
+    "product_id",
+    "product_name",
+    "quantity",
+    "unit_price",
+    "line_total",
+]
+
+# Spreadsheet apps run cells starting with these as formulas.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_text(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_rows(order: dict):
+    header = [
+        order["id"],
+        order["created_at"],
+        order["status"],
+        order["market_id"],
+        order["vendor_id"],
+        order["user_id"],
+        order["total"],
+        order["refunded_total"],
+        len(order["refunds"]),
+    ]
+
+    if not order["items"]:
+        yield header + [""] * 5
+        return
+
+    for item in order["items"]:
+        yield header + [
+            item["product_id"],
+            _csv_text(item["name"]),
+            item["quantity"],
+            item["unit_price"],
+            item["line_total"],
+        ]
+
+
+async def csv_chunks(batches):
+    """
+    Header line, then one chunk per batch of orders.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for order in batch:
+            writer.writerows(_csv_rows(order))
+        yield buffer.getvalue().encode()
+
+
+async def ndjson_chunks(batches):
+    """
+    One JSON object per order (items and refunds nested), one chunk per
+    batch.
+    """
+    async for batch in batches:
+        yield b"".join(orjson.dumps(order) + b"\n" for order in batch)
+
+
+def export_chunks(export_format: str, batches):
+    if export_format == "ndjson":
+        return ndjson_chunks(batches)
+    return csv_chunks(batches)
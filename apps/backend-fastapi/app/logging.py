@@ -1,20 +1,132 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
+from datetime import datetime, UTC
 
 from app.config import settings
 
 
+LOG_QUEUE_SIZE = 10000
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.Handler | None = None
+# Installed by configure_logging; fed by _listener while the queue runs.
+_stream_handler: logging.Handler | None = None
+
+
+# -------------------------------------------------
+# Formatters
+# -------------------------------------------------
+class KeyValueFormatter(logging.Formatter):
+    """
+    Text format: `LEVEL:logger:event key=value ...`.
+    """
+
+    def __init__(self):
+        super().__init__("%(levelname)s:%(name)s:%(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if not fields:
+            return line
+
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        first, newline, rest = line.partition("\n")
+        return f"{first} {pairs}{newline}{rest}"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, same field layout as the worker logger:
+    timestamp, level, message, then the event fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **(getattr(record, "fields", None) or {}),
+        }
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+# -------------------------------------------------
+# Non-blocking handler
+# -------------------------------------------------
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Never blocks the event loop: when the queue is full the record is
+    dropped and counted instead of waiting on the writer thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render exceptions now; tracebacks can't cross to the writer thread.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JsonFormatter()
+    return KeyValueFormatter()
+
+
 def configure_logging() -> logging.Logger:
+    global _listener, _queue_handler, _stream_handler
+
     level_name = settings.log_level.upper()
     level = getattr(logging, level_name, logging.INFO)
 
     root_logger = logging.getLogger()
-    if not root_logger.handlers:
-        logging.basicConfig(
-            level=level,
-            format="%(levelname)s:%(name)s:%(message)s",
+    if _stream_handler is None and not root_logger.handlers:
+        _stream_handler = logging.StreamHandler()
+        _stream_handler.setFormatter(_build_formatter())
+        root_logger.addHandler(_stream_handler)
+
+    # Keyed on the root logger's handlers, so a restart after
+    # shutdown_logging(), or after something else reset the handlers,
+    # installs the queue again.
+    queue_attached = _queue_handler is not None and _queue_handler in root_logger.handlers
+    if settings.log_queue and _stream_handler is not None and not queue_attached:
+        if _listener is not None:
+            _listener.stop()
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue,
+            _stream_handler,
+            respect_handler_level=True,
         )
-    else:
-        root_logger.setLevel(level)
+        _listener.start()
+        root_logger.addHandler(_queue_handler)
+        root_logger.removeHandler(_stream_handler)
+        atexit.unregister(shutdown_logging)
+        atexit.register(shutdown_logging)
+
+    root_logger.setLevel(level)
 
     logging.getLogger("httpx").setLevel(max(level, logging.WARNING))
     logging.getLogger("uvicorn.access").setLevel(max(level, logging.INFO))
@@ -22,3 +134,53 @@ def configure_logging() -> logging.Logger:
     logger = logging.getLogger("mojara.api")
     logger.setLevel(level)
     return logger
+
+
+def shutdown_logging() -> None:
+    """
+    Flushes queued records. Called from the app lifespan on shutdown.
+
+    The queue handler is swapped back for the stream handler, so records
+    logged after shutdown are still written, synchronously.
+    """
+    global _listener, _queue_handler
+
+    if _listener is not None:
+        root_logger = logging.getLogger()
+        root_logger.addHandler(_stream_handler)
+        root_logger.removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
+
+
+# -------------------------------------------------
+# Structured events + request sampling
+# -------------------------------------------------
+def log_event(
+    logger: logging.Logger,
+    level: int,
+    event: str,
+    *,
+    exc_info: bool = False,
+    **fields,
+) -> None:
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+
+def should_log_request(status_code: int, duration_ms: float) -> bool:
+    """
+    Errors and slow requests are always kept; fast successful requests
+    are sampled at LOG_SAMPLE_RATE.
+    """
+    if status_code >= 400 or duration_ms >= settings.log_slow_request_ms:
+        return True
+
+    rate = settings.log_sample_rate
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+
+    return random.random() < rate
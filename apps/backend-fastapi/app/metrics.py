@@ -0,0 +1,124 @@
+import asyncio
+from contextvars import ContextVar
+from functools import wraps
+
+import anyio.to_thread
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+
+# -------------------------------------------------
+# HTTP
+# -------------------------------------------------
+request_duration = Histogram(
+    "api_request_duration_seconds",
+    "Time spent handling a request",
+    ["route", "method", "status"],
+)
+
+requests_in_flight = Gauge(
+    "api_requests_in_flight",
+    "Requests currently being handled",
+    ["method"],
+)
+
+threadpool_in_use = Gauge(
+    "api_threadpool_in_use",
+    "Worker threads currently running sync endpoints and dependencies",
+)
+
+threadpool_capacity = Gauge(
+    "api_threadpool_capacity",
+    "Size of the threadpool used for sync endpoints and dependencies",
+)
+
+# -------------------------------------------------
+# Upstream (PostgREST / RPC / auth / direct Postgres)
+# -------------------------------------------------
+upstream_duration = Histogram(
+    "api_upstream_duration_seconds",
+    "Time spent in one upstream call",
+    ["function", "kind"],
+)
+
+upstream_calls = Counter(
+    "api_upstream_calls_total",
+    "Upstream calls made by repository functions",
+    ["function", "kind", "outcome"],
+)
+
+_current_function: ContextVar[str] = ContextVar(
+    "repository_function",
+    default="unknown",
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope: dict) -> str:
+    """
+    Route template (e.g. /orders/{order_id}) so raw ids never become
+    label values.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def current_repository_function() -> str:
+    return _current_function.get()
+
+
+def instrument_repository(func):
+    """
+    Tags every upstream call made inside `func` with its name
+    (`orders.get_order_by_id`) for the upstream metrics.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_function.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_function.reset(token)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_function.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_function.reset(token)
+
+    return wrapper
+
+
+def upstream_kind(path: str) -> str:
+    if "/rest/v1/rpc/" in path:
+        return "rpc"
+    if "/rest/v1/" in path:
+        return "rest"
+    if "/auth/v1/" in path:
+        return "auth"
+    return "other"
+
+
+def observe_upstream(kind: str, seconds: float, outcome: str) -> None:
+    function = current_repository_function()
+    upstream_duration.labels(function, kind).observe(seconds)
+    upstream_calls.labels(function, kind, outcome).inc()
+
+
+def refresh_runtime_metrics() -> None:
+    # Must run on the event loop thread.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    threadpool_in_use.set(limiter.borrowed_tokens)
+    threadpool_capacity.set(limiter.total_tokens)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    refresh_runtime_metrics()
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+from jose import jwt as jose_jwt
+
+from app.config import settings
+from app.metrics import observe_upstream
+from app.timing import count_upstream_call, record_upstream
+
+
+_pool = None
+_pool_lock: asyncio.Lock | None = None
+
+# Only these database roles may be assumed from a user token.
+_USER_ROLES = {"anon", "authenticated"}
+
+
+# -------------------------------------------------
+# 🔀 Per-function switch (PG_READ_PATHS)
+# -------------------------------------------------
+def pg_read_enabled(path: str) -> bool:
+    """
+    True when `path` (e.g. "orders.list") should skip PostgREST and
+    read straight from Postgres. Needs DATABASE_URL plus the path (or
+    "*") in PG_READ_PATHS.
+    """
+    if not settings.database_url:
+        return False
+
+    paths = settings.pg_read_paths
+    return "*" in paths or path in paths
+
+
+# -------------------------------------------------
+# 🐘 asyncpg pool (optional dependency)
+# -------------------------------------------------
+async def _create_pool():
+    import asyncpg
+
+    return await asyncpg.create_pool(
+        settings.database_url,
+        min_size=settings.pg_pool_min_size,
+        max_size=settings.pg_pool_max_size,
+        # Supabase pooler runs in transaction mode.
+        statement_cache_size=0,
+    )
+
+
+async def get_pg_pool():
+    global _pool, _pool_lock
+
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await _create_pool()
+
+    return _pool
+
+
+async def open_pg_pool() -> None:
+    if settings.database_url and settings.pg_read_paths:
+        await get_pg_pool()
+
+
+async def close_pg_pool() -> None:
+    global _pool, _pool_lock
+
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
+    _pool_lock = None
+
+
+# -------------------------------------------------
+# 🔐 Transactions
+# -------------------------------------------------
+def _claims_for(jwt: str) -> dict:
+    # The token was verified by get_current_user before reaching here.
+    return jose_jwt.get_unverified_claims(jwt)
+
+
+@asynccontextmanager
+async def user_transaction(jwt: str):
+    """
+    Read-only transaction that behaves like a PostgREST request:
+    `request.jwt.claims` and `role` are set locally, so RLS applies.
+    """
+    claims = _claims_for(jwt)
+    role = claims.get("role")
+    if role not in _USER_ROLES:
+        role = "authenticated"
+
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction(readonly=True):
+            await conn.execute(
+                "select set_config('request.jwt.claims', $1, true), "
+                "set_config('role', $2, true)",
+                json.dumps(claims),
+                role,
+            )
+            yield conn
+
+
+@asynccontextmanager
+async def service_transaction():
+    """
+    Read-only transaction as the pool's own role (bypasses RLS,
+    same as the service client). The claims carry the service role, so
+    functions that check auth.jwt() (e.g. search_orders) see the same
+    caller as a service-client RPC.
+    """
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction(readonly=True):
+            await conn.execute(
+                "select set_config('request.jwt.claims', $1, true)",
+                json.dumps({"role": "service_role"}),
+            )
+            yield conn
+
+
+async def fetch_value(conn, sql: str, *args):
+    count_upstream_call()
+    started_at = time.perf_counter()
+    outcome = "error"
+    try:
+        value = await conn.fetchval(sql, *args)
+        outcome = "ok"
+        return value
+    finally:
+        elapsed = time.perf_counter() - started_at
+        observe_upstream("pg", elapsed, outcome)
+        record_upstream("pg", elapsed * 1000)
+
+
+async def fetch_json(conn, sql: str, *args):
+    """
+    Run a query that returns a single JSON value, e.g.
+    `select coalesce(json_agg(t), '[]'::json) from (...) t`.
+    Rows come back in the same shape PostgREST would return.
+    """
+    value = await fetch_value(conn, sql, *args)
+    if value is None:
+        return None
+
+    return json.loads(value)
@@ -1,27 +1,37 @@
+import asyncio
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
 from postgrest import APIError
 
-from app.db import get_service_client
+from app.db import get_async_service_client
+from app.metrics import instrument_repository
 
 
 TREND_WINDOW_DAYS = 30
 
 
-def _count_rows(table: str, *, filters: list[tuple[str, str, str]] | None = None) -> int:
-    client = get_service_client()
+def _count_query(client, table: str, filters: list[tuple[str, str, str]] | None = None):
     query = client.table(table).select("*", count="exact", head=True)
 
     for filter_name, field, value in filters or []:
         query = getattr(query, filter_name)(field, value)
 
-    result = query.execute()
+    return query
+
+
+async def _count_rows(
+    table: str,
+    *,
+    filters: list[tuple[str, str, str]] | None = None,
+) -> int:
+    client = get_async_service_client()
+    result = await _count_query(client, table, filters).execute()
     return result.count or 0
 
 
-def get_admin_overview():
+def _overview_counts() -> dict[str, tuple[str, list[tuple[str, str, str]] | None]]:
     now = datetime.now(timezone.utc)
     start_7d = (now - timedelta(days=7)).isoformat()
     start_today = datetime.combine(
@@ -30,46 +40,64 @@ def get_admin_overview():
         tzinfo=timezone.utc,
     ).isoformat()
 
+    return {
+        "total_orders_7d": ("orders", [("gte", "created_at", start_7d)]),
+        "orders_today": ("orders", [("gte", "created_at", start_today)]),
+        "active_vendors": ("vendors", None),
+        "active_price_agreements": ("active_price_agreements", None),
+        "pending_orders": ("orders", [("eq", "status", "pending")]),
+    }
+
+
+@instrument_repository
+async def get_admin_overview():
+    counts = _overview_counts()
+
     try:
-        return {
-            "total_orders_7d": _count_rows(
-                "orders",
-                filters=[("gte", "created_at", start_7d)],
-            ),
-            "orders_today": _count_rows(
-                "orders",
-                filters=[("gte", "created_at", start_today)],
-            ),
-            "active_vendors": _count_rows("vendors"),
-            "active_price_agreements": _count_rows("active_price_agreements"),
-            "pending_orders": _count_rows(
-                "orders",
-                filters=[("eq", "status", "pending")],
-            ),
-        }
+        # The five counts are independent, so they share one round-trip window.
+        values = await asyncio.gather(
+            *(
+                _count_rows(table, filters=filters)
+                for table, filters in counts.values()
+            )
+        )
     except (APIError, ConnectionError) as exc:
         raise HTTPException(status_code=500, detail=f"Failed to load admin overview: {exc}")
 
+    return dict(zip(counts.keys(), values))
+
 
-def get_admin_orders_trend():
-    client = get_service_client()
+def _trend_start():
     now = datetime.now(timezone.utc)
-    start = (now - timedelta(days=TREND_WINDOW_DAYS - 1)).date()
+    return (now - timedelta(days=TREND_WINDOW_DAYS - 1)).date()
+
+
+def _trend_query(client, start):
+    return (
+        client.table("orders")
+        .select("created_at")
+        .gte("created_at", datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc).isoformat())
+        .order("created_at")
+    )
+
+
+@instrument_repository
+async def get_admin_orders_trend():
+    client = get_async_service_client()
+    start = _trend_start()
 
     try:
-        result = (
-            client.table("orders")
-            .select("created_at")
-            .gte("created_at", datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc).isoformat())
-            .order("created_at")
-            .execute()
-        )
+        result = await _trend_query(client, start).execute()
     except (APIError, ConnectionError) as exc:
         raise HTTPException(status_code=500, detail=f"Failed to load orders trend: {exc}")
 
+    return _build_trend(result.data, start)
+
+
+def _build_trend(rows, start):
     counts = Counter()
 
-    for row in result.data or []:
+    for row in rows or []:
         created_at = row.get("created_at")
         if not created_at:
             continue
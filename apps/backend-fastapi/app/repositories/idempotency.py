@@ -0,0 +1,17 @@
+# repositories/idempotency.py
+#
+# Maintenance for public.idempotency_keys. Keys are claimed and stored
+# by the *_idempotent RPCs (see create_order / refund_order);
+# expired rows are only removed here.
+
+from app.db import get_service_client
+from app.metrics import instrument_repository
+
+
+@instrument_repository
+def purge_expired_idempotency_keys() -> int:
+    """
+    Deletes expired idempotency keys and returns how many were removed.
+    """
+    res = get_service_client().rpc("purge_expired_idempotency_keys", {}).execute()
+    return res.data or 0
@@ -1,8 +1,10 @@
 from fastapi import HTTPException
 from app.db import get_user_client
+from app.metrics import instrument_repository
 from postgrest.exceptions import APIError
 
 
+@instrument_repository
 def reserve_inventory(
     jwt: str,
     product_id: str,
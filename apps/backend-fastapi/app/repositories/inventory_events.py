@@ -1,16 +1,15 @@
-from app.db import get_user_client
+from app.db import get_async_user_client
+from app.metrics import instrument_repository
 
 
-def list_inventory_events(
-    jwt: str,
+def _inventory_events_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     product_id: str,
-    limit: int = 10,
+    limit: int,
 ):
-    supabase = get_user_client(jwt)
-
-    res = (
+    return (
         supabase
         .table("inventory_events")
         .select("*")
@@ -19,7 +18,21 @@ def list_inventory_events(
         .eq("product_id", product_id)
         .order("created_at", desc=True)
         .limit(limit)
-        .execute()
     )
 
+
+@instrument_repository
+async def list_inventory_events(
+    jwt: str,
+    market_id: str,
+    vendor_id: str,
+    product_id: str,
+    limit: int = 10,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _inventory_events_query(
+        supabase, market_id, vendor_id, product_id, limit
+    ).execute()
+
     return res.data or []
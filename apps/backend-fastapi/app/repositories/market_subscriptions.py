@@ -2,21 +2,63 @@ from fastapi import HTTPException
 import httpx
 from postgrest import APIError
 
-from app.db import get_user_client
+from app.db import get_async_user_client
+from app.metrics import instrument_repository
 
 
-def list_market_subscriptions(jwt: str, user_id: str):
-    supabase = get_user_client(jwt)
+def _subscriptions_query(supabase, user_id: str):
+    return (
+        supabase
+        .table("market_subscriptions")
+        .select("market_id, created_at")
+        .eq("user_id", user_id)
+        .order("created_at", desc=False)
+    )
+
+
+def _insert_query(supabase, user_id: str, market_id: str):
+    return (
+        supabase
+        .table("market_subscriptions")
+        .insert({
+            "user_id": user_id,
+            "market_id": market_id,
+        })
+    )
+
+
+def _existing_query(supabase, user_id: str, market_id: str, columns: str):
+    return (
+        supabase
+        .table("market_subscriptions")
+        .select(columns)
+        .eq("user_id", user_id)
+        .eq("market_id", market_id)
+        .limit(1)
+    )
+
+
+def _delete_query(supabase, user_id: str, market_id: str):
+    return (
+        supabase
+        .table("market_subscriptions")
+        .delete()
+        .eq("user_id", user_id)
+        .eq("market_id", market_id)
+    )
+
+
+def _is_unique_violation(message: str) -> bool:
+    lowered = message.lower()
+    return "duplicate" in lowered or "unique" in lowered
+
+
+@instrument_repository
+async def list_market_subscriptions(jwt: str, user_id: str, client=None):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        result = (
-            supabase
-            .table("market_subscriptions")
-            .select("market_id, created_at")
-            .eq("user_id", user_id)
-            .order("created_at", desc=False)
-            .execute()
-        )
+        result = await _subscriptions_query(supabase, user_id).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as exc:
@@ -25,34 +67,25 @@ def list_market_subscriptions(jwt: str, user_id: str):
     return result.data or []
 
 
-def create_market_subscription(jwt: str, user_id: str, market_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def create_market_subscription(
+    jwt: str,
+    user_id: str,
+    market_id: str,
+    client=None,
+):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        result = (
-            supabase
-            .table("market_subscriptions")
-            .insert({
-                "user_id": user_id,
-                "market_id": market_id,
-            })
-            .execute()
-        )
+        result = await _insert_query(supabase, user_id, market_id).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as exc:
         message = str(exc)
-        lowered = message.lower()
-        if "duplicate" in lowered or "unique" in lowered:
-            existing = (
-                supabase
-                .table("market_subscriptions")
-                .select("market_id, created_at")
-                .eq("user_id", user_id)
-                .eq("market_id", market_id)
-                .limit(1)
-                .execute()
-            )
+        if _is_unique_violation(message):
+            existing = await _existing_query(
+                supabase, user_id, market_id, "market_id, created_at"
+            ).execute()
             if existing.data:
                 return existing.data[0]
         raise HTTPException(500, message)
@@ -63,19 +96,19 @@ def create_market_subscription(jwt: str, user_id: str, market_id: str):
     return result.data[0]
 
 
-def delete_market_subscription(jwt: str, user_id: str, market_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def delete_market_subscription(
+    jwt: str,
+    user_id: str,
+    market_id: str,
+    client=None,
+):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        existing = (
-            supabase
-            .table("market_subscriptions")
-            .select("market_id")
-            .eq("user_id", user_id)
-            .eq("market_id", market_id)
-            .limit(1)
-            .execute()
-        )
+        existing = await _existing_query(
+            supabase, user_id, market_id, "market_id"
+        ).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as exc:
@@ -84,13 +117,6 @@ def delete_market_subscription(jwt: str, user_id: str, market_id: str):
     if not existing.data:
         raise HTTPException(404, "Market subscription not found")
 
-    (
-        supabase
-        .table("market_subscriptions")
-        .delete()
-        .eq("user_id", user_id)
-        .eq("market_id", market_id)
-        .execute()
-    )
+    await _delete_query(supabase, user_id, market_id).execute()
 
     return True
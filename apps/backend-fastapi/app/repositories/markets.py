@@ -1,18 +1,9 @@
 from uuid import UUID
-from app.db import get_user_client
+from app.db import get_async_user_client
+from app.metrics import instrument_repository
 
 
-def list_markets(
-    jwt: str,
-    *,
-    search: str | None = None,
-):
-    """
-    Returns all markets visible to the current user.
-    Visibility is enforced entirely by Supabase RLS.
-    """
-    supabase = get_user_client(jwt)
-
+def _markets_query(supabase, search: str | None = None):
     query = (
         supabase
         .table("markets")
@@ -24,30 +15,39 @@ def list_markets(
             f"name.ilike.%{search}%,location.ilike.%{search}%"
         )
 
-    res = query.order("created_at", desc=False).execute()
+    return query.order("created_at", desc=False)
 
-    return res.data
 
-
-def get_market_by_id(jwt: str, market_id: UUID):
-    """
-    Fetch a single market.
-    RLS ensures access control.
-    Returns None if not found or not allowed.
-    """
-    supabase = get_user_client(jwt)
-
-    res = (
+def _market_query(supabase, market_id: UUID):
+    return (
         supabase
         .table("markets")
         .select("*")
         .eq("id", str(market_id))
         .limit(1)
-        .execute()
     )
 
+
+@instrument_repository
+async def list_markets(
+    jwt: str,
+    *,
+    search: str | None = None,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _markets_query(supabase, search).execute()
+
+    return res.data
+
+
+@instrument_repository
+async def get_market_by_id(jwt: str, market_id: UUID):
+    supabase = get_async_user_client(jwt)
+
+    res = await _market_query(supabase, market_id).execute()
+
     if not res.data:
         return None
 
     return res.data[0]
-
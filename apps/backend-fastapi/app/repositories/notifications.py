@@ -1,26 +1,115 @@
-from app.db import get_user_client
+from app.db import get_async_user_client
+from app.metrics import instrument_repository
+from app.pg import fetch_value, pg_read_enabled, user_transaction
 from fastapi import HTTPException
 import httpx
 from postgrest import APIError
 from datetime import datetime, UTC
 
 
+# =========================
+# Query builders
+# =========================
+
+def _subscriptions_query(supabase, user_id: str):
+    return (
+        supabase
+        .table("notification_subscriptions")
+        .select("*")
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+    )
+
+
+def _existing_subscription_query(supabase, user_id: str, payload: dict):
+    return (
+        supabase
+        .table("notification_subscriptions")
+        .select("id")
+        .eq("user_id", user_id)
+        .eq("vendor_id", payload["vendor_id"])
+        .eq("event_type", payload["event_type"])
+        .eq("min_severity", payload["min_severity"])
+        .eq("channel", payload.get("channel", "push"))
+        .limit(1)
+    )
+
+
+def _owned_row_query(supabase, table: str, row_id: str, user_id: str):
+    return (
+        supabase
+        .table(table)
+        .select("id")
+        .eq("id", row_id)
+        .eq("user_id", user_id)
+        .limit(1)
+    )
+
+
+def _notifications_query(supabase, user_id: str):
+    return (
+        supabase
+        .table("notifications")
+        .select("*")
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+    )
+
+
+def _mark_read_query(supabase, notification_id: str):
+    return (
+        supabase
+        .table("notifications")
+        .update({"read_at": datetime.now(UTC).isoformat()})
+        .eq("id", notification_id)
+    )
+
+
+def _mark_all_read_query(supabase, user_id: str):
+    return (
+        supabase
+        .table("notifications")
+        .update({"read_at": datetime.now(UTC).isoformat()})
+        .eq("user_id", user_id)
+        .is_("read_at", None)
+    )
+
+
+def _unread_count_query(supabase, user_id: str):
+    return (
+        supabase
+        .table("notifications")
+        .select("id", count="exact")
+        .eq("user_id", user_id)
+        .is_("read_at", None)
+    )
+
+
+_UNREAD_COUNT_SQL = """
+    select count(*)
+    from public.notifications
+    where user_id = $1::uuid
+      and read_at is null
+"""
+
+
+def _raise_insert_error(e: APIError):
+    message = str(e).lower()
+    if "duplicate" in message or "unique" in message:
+        raise HTTPException(409, "Notification subscription already exists")
+    raise HTTPException(500, str(e))
+
+
 # =========================
 # Queries
 # =========================
 
-def get_user_subscriptions(jwt: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def get_user_subscriptions(jwt: str, user_id: str, client=None):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        res = (
-            supabase
-            .table("notification_subscriptions")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
+        res = await _subscriptions_query(supabase, user_id).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as e:
@@ -33,32 +122,22 @@ def get_user_subscriptions(jwt: str, user_id: str):
 # Mutations
 # =========================
 
-def create_subscription(jwt: str, user_id: str, payload: dict):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def create_subscription(jwt: str, user_id: str, payload: dict, client=None):
+    supabase = client or get_async_user_client(jwt)
 
     data = {
         **payload,
         "user_id": user_id,
     }
 
-    existing = (
-        supabase
-        .table("notification_subscriptions")
-        .select("id")
-        .eq("user_id", user_id)
-        .eq("vendor_id", payload["vendor_id"])
-        .eq("event_type", payload["event_type"])
-        .eq("min_severity", payload["min_severity"])
-        .eq("channel", payload.get("channel", "push"))
-        .limit(1)
-        .execute()
-    )
+    existing = await _existing_subscription_query(supabase, user_id, payload).execute()
 
     if existing.data:
         raise HTTPException(409, "Notification subscription already exists")
 
     try:
-        res = (
+        res = await (
             supabase
             .table("notification_subscriptions")
             .insert(data)
@@ -66,10 +145,7 @@ def create_subscription(jwt: str, user_id: str, payload: dict):
             .execute()
         )
     except APIError as e:
-        message = str(e).lower()
-        if "duplicate" in message or "unique" in message:
-            raise HTTPException(409, "Notification subscription already exists")
-        raise HTTPException(500, str(e))
+        _raise_insert_error(e)
 
     if not res.data:
         raise HTTPException(400, "Failed to create subscription")
@@ -77,19 +153,19 @@ def create_subscription(jwt: str, user_id: str, payload: dict):
     return res.data
 
 
-def delete_subscription(jwt: str, subscription_id: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def delete_subscription(
+    jwt: str,
+    subscription_id: str,
+    user_id: str,
+    client=None,
+):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        existing = (
-            supabase
-            .table("notification_subscriptions")
-            .select("id")
-            .eq("id", subscription_id)
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
+        existing = await _owned_row_query(
+            supabase, "notification_subscriptions", subscription_id, user_id
+        ).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as e:
@@ -98,27 +174,23 @@ def delete_subscription(jwt: str, subscription_id: str, user_id: str):
     if not existing.data:
         raise HTTPException(404, "Subscription not found")
 
-    supabase \
-        .table("notification_subscriptions") \
-        .delete() \
-        .eq("id", subscription_id) \
+    await (
+        supabase
+        .table("notification_subscriptions")
+        .delete()
+        .eq("id", subscription_id)
         .execute()
+    )
 
     return True
 
 
-def get_user_notifications(jwt: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def get_user_notifications(jwt: str, user_id: str, client=None):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        res = (
-            supabase
-            .table("notifications")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
+        res = await _notifications_query(supabase, user_id).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as e:
@@ -127,19 +199,19 @@ def get_user_notifications(jwt: str, user_id: str):
     return res.data or []
 
 
-def mark_notification_read(jwt: str, notification_id: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def mark_notification_read(
+    jwt: str,
+    notification_id: str,
+    user_id: str,
+    client=None,
+):
+    supabase = client or get_async_user_client(jwt)
 
     try:
-        existing = (
-            supabase
-            .table("notifications")
-            .select("id")
-            .eq("id", notification_id)
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
+        existing = await _owned_row_query(
+            supabase, "notifications", notification_id, user_id
+        ).execute()
     except httpx.ConnectError:
         raise HTTPException(503, "Database unavailable")
     except APIError as e:
@@ -148,40 +220,28 @@ def mark_notification_read(jwt: str, notification_id: str, user_id: str):
     if not existing.data:
         raise HTTPException(404, "Notification not found")
 
-    supabase \
-        .table("notifications") \
-        .update({"read_at": datetime.now(UTC).isoformat()}) \
-        .eq("id", notification_id) \
-        .execute()
+    await _mark_read_query(supabase, notification_id).execute()
 
     return True
 
 
-def mark_all_notifications_read(jwt: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def mark_all_notifications_read(jwt: str, user_id: str, client=None):
+    supabase = client or get_async_user_client(jwt)
 
-    res = (
-        supabase
-        .table("notifications")
-        .update({"read_at": datetime.now(UTC).isoformat()})
-        .eq("user_id", user_id)
-        .is_("read_at", None)
-        .execute()
-    )
+    res = await _mark_all_read_query(supabase, user_id).execute()
 
     return len(res.data or [])
 
 
-def get_unread_count(jwt: str, user_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def get_unread_count(jwt: str, user_id: str, client=None):
+    if pg_read_enabled("notifications.unread_count"):
+        async with user_transaction(jwt) as conn:
+            return await fetch_value(conn, _UNREAD_COUNT_SQL, user_id)
 
-    res = (
-        supabase
-        .table("notifications")
-        .select("id", count="exact")
-        .eq("user_id", user_id)
-        .is_("read_at", None)
-        .execute()
-    )
+    supabase = client or get_async_user_client(jwt)
+
+    res = await _unread_count_query(supabase, user_id).execute()
 
     return res.count or 0
@@ -1,9 +1,16 @@
 # repositories/orders.py
 
-from app.db import get_service_client, get_user_client
+from app.config import settings
+from app.db import (
+    get_async_service_client,
+    get_async_user_client,
+    get_service_client,
+)
+from app.metrics import instrument_repository
+from app.pg import fetch_json, pg_read_enabled, service_transaction, user_transaction
+from app.timing import timed
 from fastapi import HTTPException
 from postgrest import APIError
-import httpx
 import base64
 
 
@@ -11,321 +18,893 @@ import base64
 # Queries
 # =========================
 
-def get_orders_for_user_cursor(
-    jwt: str,
-    user_id: str,
+ORDER_LIST_SELECT = """
+    id,
+    market_id,
+    vendor_id,
+    user_id,
+    status,
+    total,
+    refunded_total,
+    created_at,
+    order_items (
+        product_id,
+        product_name,
+        quantity,
+        unit_price
+    )
+"""
+
+# view=summary: header fields plus the rollups kept by
+# refresh_order_item_rollups(), no embedded items.
+ORDER_SUMMARY_SELECT = """
+    id,
+    market_id,
+    vendor_id,
+    user_id,
+    status,
+    total,
+    refunded_total,
+    created_at,
+    item_count,
+    first_item_name
+"""
+
+ORDER_LIST_SELECTS = {
+    "summary": ORDER_SUMMARY_SELECT,
+    "full": ORDER_LIST_SELECT,
+}
+
+ORDER_DETAIL_SELECT = """
+    id,
+    market_id,
+    vendor_id,
+    user_id,
+    status,
+    total,
+    refunded_total,
+    created_at,
+    order_items (
+        product_id,
+        product_name,
+        quantity,
+        unit_price,
+        line_total
+    ),
+    refunds (
+        id,
+        amount,
+        reason,
+        created_at
+    ),
+    order_events (
+        id,
+        event,
+        amount,
+        reason,
+        created_at
+    )
+"""
+
+
+# =========================
+# Keyset pagination
+# =========================
+
+# sort -> (key column, descending). Every sort is a (key, id) keyset
+# backed by a matching composite index, so page N costs the same as
+# page 1. See 202610170001_order_keyset_indexes.sql.
+ORDER_SORT_KEYS = {
+    "newest": ("created_at", True),
+    "oldest": ("created_at", False),
+    "highest": ("total", True),
+}
+
+_ORDER_KEY_CASTS = {
+    "created_at": "::text::timestamptz",
+    "total": "::text::numeric",
+}
+
+
+def _sort_key(sort: str) -> tuple[str, bool]:
+    return ORDER_SORT_KEYS.get(sort, ORDER_SORT_KEYS["newest"])
+
+
+# =========================
+# Search
+# =========================
+
+# Trigram indexes can't narrow shorter terms.
+MIN_TEXT_SEARCH_LENGTH = 3
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def _as_uuid(digits: str) -> str:
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _order_search_terms(search: str) -> tuple[tuple[str, str] | None, str | None]:
+    """
+    Splits a search box value into the two indexed lookups:
+
+    - an id range for order id prefixes ("#3f2a9c1e" -> 3f2a9c1e-0000-... to
+      3f2a9c1e-ffff-...), served by the primary key;
+    - a term matched against order_search.search_text (customer email
+      and product names), served by the trigram index. That table is not
+      readable by API roles; the term is only matched inside the
+      search_orders() RPC.
+    """
+    term = search.strip().lower()
+
+    id_range = None
+    digits = term.lstrip("#").replace("-", "")
+    if digits and len(digits) <= 32 and set(digits) <= _HEX_DIGITS:
+        id_range = (
+            _as_uuid(digits.ljust(32, "0")),
+            _as_uuid(digits.ljust(32, "f")),
+        )
+
+    text = "".join(char for char in term if char not in '"\\%*')
+    if len(text) < MIN_TEXT_SEARCH_LENGTH:
+        text = None
+
+    return id_range, text
+
+
+def _search_orders_params(
+    text: str,
+    vendor_id: str | None,
+    id_range: tuple[str, str] | None,
+) -> dict:
+    id_from, id_to = id_range or (None, None)
+    return {
+        "p_text": text,
+        "p_vendor_id": vendor_id,
+        "p_id_from": id_from,
+        "p_id_to": id_to,
+    }
+
+
+def _orders_cursor_query(
+    supabase,
+    *,
+    user_id: str | None = None,
+    vendor_id: str | None = None,
     status: str | None = None,
+    search: str | None = None,
     sort: str = "newest",
     cursor: str | None = None,
     limit: int = 20,
+    view: str = "full",
 ):
-    supabase = get_user_client(jwt)
+    key, desc = _sort_key(sort)
+    id_range, text = _order_search_terms(search) if search else (None, None)
+
+    # ✅ Search (indexed: id prefix range or search_text trigram match).
+    # Text terms go through search_orders(), which returns orders rows, so
+    # the select, filters and keyset below apply to it unchanged.
+    if text:
+        source = supabase.rpc("search_orders", _search_orders_params(text, vendor_id, id_range))
+    else:
+        source = supabase.table("orders")
 
-    # Base query
     query = (
-        supabase
-        .table("orders")
-        .select(
-            """
-            id,
-            market_id,
-            vendor_id,
-            user_id,
-            status,
-            total,
-            created_at,
-            order_items (
-                product_id,
-                quantity,
-                unit_price,
-                products ( name )
-            )
-            """
-        )
-        .eq("user_id", user_id)
+        source
+        .select(ORDER_LIST_SELECTS[view])
         .limit(limit + 1)  # fetch extra to detect next page
     )
 
-    # Status filter
+    # Items in cart order, matching first_item_name.
+    if view == "full":
+        query = query.order("line_number", foreign_table="order_items")
+
+    if user_id:
+        query = query.eq("user_id", user_id)
+
+    if vendor_id:
+        query = query.eq("vendor_id", vendor_id)
+
+    if search and not text:
+        if id_range:
+            query = query.gte("id", id_range[0]).lte("id", id_range[1])
+        else:
+            query = query.in_("id", [])
+
+    # ✅ Status
     if status:
         query = query.eq("status", status)
 
-    # Sorting
-    if sort == "newest":
-        query = query.order("created_at", desc=True).order("id", desc=True)
-    elif sort == "oldest":
-        query = query.order("created_at", desc=False).order("id", desc=False)
-    elif sort == "highest":
-        query = query.order("total", desc=True).order("id", desc=True)
+    # ✅ Sorting
+    query = query.order(key, desc=desc).order("id", desc=desc)
 
-    # Cursor filtering
+    # ✅ Cursor: (key, id) strictly after the last row of the previous page.
+    # The plain lte/gte bound is what lets Postgres seek the index.
     if cursor:
-        created_at, order_id = decode_cursor(cursor)
-
-        if sort in ["newest", "highest"]:
-            query = (
-                query
-                .lt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.lt.{order_id}")
-            )
-        else:  # oldest
-            query = (
-                query
-                .gt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.gt.{order_id}")
-            )
+        value, order_id = decode_cursor(cursor, sort)
+        op = "lt" if desc else "gt"
 
-    res = query.execute()
-    rows = res.data or []
+        query = query.lte(key, value) if desc else query.gte(key, value)
+        query = query.or_(
+            f'{key}.{op}."{value}",'
+            f'and({key}.eq."{value}",id.{op}.{order_id})'
+        )
 
-    has_more = len(rows) == limit + 1
-    rows = rows[:limit]
+    return query
 
-    next_cursor = None
-    if has_more:
-        last = rows[-1]
-        next_cursor = encode_cursor(last["created_at"], last["id"])
 
-    return {
-        "data": _normalize_orders(rows),
-        "next_cursor": next_cursor,
-    }
+_ORDER_LIST_COLUMNS_SQL = {
+    "summary": "o.item_count, o.first_item_name",
+    "full": """coalesce(
+                    (
+                        select json_agg(json_build_object(
+                            'product_id', oi.product_id,
+                            'product_name', oi.product_name,
+                            'quantity', oi.quantity,
+                            'unit_price', oi.unit_price
+                        ) order by oi.line_number)
+                        from public.order_items oi
+                        where oi.order_id = o.id
+                    ),
+                    '[]'::json
+                ) as order_items""",
+}
 
 
-def get_orders_for_vendor_cursor(
-    jwt: str,
-    vendor_id: str,
+def _orders_cursor_sql(
+    *,
+    user_id: str | None = None,
+    vendor_id: str | None = None,
     status: str | None = None,
     search: str | None = None,
     sort: str = "newest",
     cursor: str | None = None,
     limit: int = 20,
+    view: str = "full",
 ):
-    supabase = get_user_client(jwt)
+    """
+    Direct-Postgres twin of _orders_cursor_query (PG_READ_PATHS=orders.list).
+    Returns the same JSON shape as ORDER_LIST_SELECTS[view].
+    """
+    key, desc = _sort_key(sort)
+    direction = "desc" if desc else "asc"
 
-    query = (
-        supabase
-        .table("orders")
-        .select(
-            """
-            id,
-            market_id,
-            vendor_id,
-            user_id,
-            status,
-            total,
-            created_at,
-            order_items (
-                product_id,
-                quantity,
-                unit_price,
-                products ( name )
-            )
-            """
-        )
-        .eq("vendor_id", vendor_id)
-        .limit(limit + 1)
-    )
+    args: list = []
+    where: list[str] = []
 
-    # ✅ Search (UUID cast to text handled in DB)
-    if search:
-        query = query.ilike("id", f"%{search}%")
+    def arg(value) -> str:
+        args.append(value)
+        return f"${len(args)}"
 
-    # ✅ Status
-    if status:
-        query = query.eq("status", status)
+    source = "public.orders o"
 
-    # ✅ Sorting
-    if sort == "newest":
-        query = query.order("created_at", desc=True).order("id", desc=True)
-    elif sort == "oldest":
-        query = query.order("created_at", desc=False).order("id", desc=False)
-    elif sort == "highest":
-        query = query.order("total", desc=True).order("id", desc=True)
-
-    # ✅ Cursor
-    if cursor:
-        created_at, order_id = decode_cursor(cursor)
+    if user_id:
+        where.append(f"o.user_id = {arg(user_id)}::uuid")
+
+    if vendor_id:
+        where.append(f"o.vendor_id = {arg(vendor_id)}::uuid")
 
-        if sort in ["newest", "highest"]:
-            query = (
-                query
-                .lt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.lt.{order_id}")
+    if search:
+        id_range, text = _order_search_terms(search)
+        if text:
+            params = _search_orders_params(text, vendor_id, id_range)
+            source = (
+                f"public.search_orders({arg(params['p_text'])}, {arg(params['p_vendor_id'])}::uuid, "
+                f"{arg(params['p_id_from'])}::uuid, {arg(params['p_id_to'])}::uuid) o"
             )
+        elif id_range:
+            where.append(f"o.id between {arg(id_range[0])}::uuid and {arg(id_range[1])}::uuid")
         else:
-            query = (
-                query
-                .gt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.gt.{order_id}")
-            )
+            where.append("false")
 
-    res = query.execute()
-    rows = res.data or []
+    if status:
+        where.append(f"o.status = {arg(status)}")
+
+    if cursor:
+        value, order_id = decode_cursor(cursor, sort)
+        op = "<" if desc else ">"
+        where.append(
+            f"(o.{key}, o.id) {op} "
+            f"({arg(value)}{_ORDER_KEY_CASTS[key]}, {arg(order_id)}::uuid)"
+        )
+
+    where_sql = f"where {' and '.join(where)}" if where else ""
+
+    sql = f"""
+        select coalesce(json_agg(t), '[]'::json)
+        from (
+            select
+                o.id,
+                o.market_id,
+                o.vendor_id,
+                o.user_id,
+                o.status,
+                o.total,
+                o.refunded_total,
+                o.created_at,
+                {_ORDER_LIST_COLUMNS_SQL[view]}
+            from {source}
+            {where_sql}
+            order by o.{key} {direction}, o.id {direction}
+            limit {arg(limit + 1)}
+        ) t
+    """
+
+    return sql, args
+
+
+def _cursor_page(rows, limit: int, sort: str = "newest", view: str = "full"):
+    rows = rows or []
 
     has_more = len(rows) == limit + 1
     rows = rows[:limit]
 
     next_cursor = None
     if has_more:
+        key, _ = _sort_key(sort)
         last = rows[-1]
-        next_cursor = encode_cursor(last["created_at"], last["id"])
+        next_cursor = encode_cursor(last[key], last["id"], sort)
 
     return {
-        "data": _normalize_orders(rows),
+        # Summary rows are already in their response shape.
+        "data": rows if view == "summary" else _normalize_orders(rows),
         "next_cursor": next_cursor,
     }
 
 
-def get_orders_for_admin_cursor(
+async def _orders_page(jwt: str | None, **filters):
+    """
+    One keyset page of orders. `jwt=None` reads with the service role
+    (admin scope); otherwise RLS applies as the calling user.
+    """
+    if pg_read_enabled("orders.list"):
+        sql, args = _orders_cursor_sql(**filters)
+        transaction = service_transaction() if jwt is None else user_transaction(jwt)
+        async with transaction as conn:
+            rows = await fetch_json(conn, sql, *args)
+    else:
+        supabase = (
+            get_async_service_client() if jwt is None else get_async_user_client(jwt)
+        )
+        res = await _orders_cursor_query(supabase, **filters).execute()
+        rows = res.data
+
+    return _cursor_page(rows, filters["limit"], filters["sort"], filters["view"])
+
+
+@instrument_repository
+async def get_orders_for_user_cursor(
+    jwt: str,
+    user_id: str,
+    status: str | None = None,
+    sort: str = "newest",
+    cursor: str | None = None,
+    limit: int = 20,
+    view: str = "full",
+):
+    return await _orders_page(
+        jwt,
+        user_id=user_id,
+        status=status,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        view=view,
+    )
+
+
+@instrument_repository
+async def get_orders_for_vendor_cursor(
+    jwt: str,
+    vendor_id: str,
     status: str | None = None,
     search: str | None = None,
     sort: str = "newest",
     cursor: str | None = None,
     limit: int = 20,
+    view: str = "full",
 ):
-    supabase = get_service_client()
+    return await _orders_page(
+        jwt,
+        vendor_id=vendor_id,
+        status=status,
+        search=search,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        view=view,
+    )
+
+
+@instrument_repository
+async def get_orders_for_admin_cursor(
+    status: str | None = None,
+    search: str | None = None,
+    sort: str = "newest",
+    cursor: str | None = None,
+    limit: int = 20,
+    view: str = "full",
+):
+    return await _orders_page(
+        None,
+        status=status,
+        search=search,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        view=view,
+    )
+
+
+# =========================
+# Timeline
+# =========================
+
+# Events returned with an order; older events are paged through
+# GET /orders/{order_id}/events. Events and refunds are read newest first
+# from the (order_id, created_at) indexes; refunds are never truncated.
+ORDER_TIMELINE_LIMIT = 20
+
+# Cursor "sort" for timeline pages, so list cursors can't be replayed here.
+TIMELINE_CURSOR_SORT = "timeline"
+
+ORDER_TIMELINE_SELECT = """
+    id,
+    user_id,
+    vendor_id,
+    order_events (
+        id,
+        event,
+        amount,
+        reason,
+        created_at
+    )
+"""
+
+
+def _latest_events(query, limit: int):
+    return (
+        query
+        .order("created_at", desc=True, foreign_table="order_events")
+        .order("id", desc=True, foreign_table="order_events")
+        .limit(limit + 1, foreign_table="order_events")
+    )
+
+
+def _timeline_page(rows, limit: int):
+    """
+    Splits newest-first event rows into (page, cursor for older events).
+    """
+    rows = rows or []
+    page = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"], TIMELINE_CURSOR_SORT)
 
+    return page, next_cursor
+
+
+def _order_detail_query(supabase, order_id: str):
     query = (
         supabase
         .table("orders")
-        .select(
-            """
-            id,
-            market_id,
-            vendor_id,
-            user_id,
-            status,
-            total,
-            created_at,
-            order_items (
-                product_id,
-                quantity,
-                unit_price,
-                products ( name )
-            )
-            """
-        )
-        .limit(limit + 1)
+        .select(ORDER_DETAIL_SELECT)
+        .eq("id", order_id)
+        .order("line_number", foreign_table="order_items")
+        .order("created_at", desc=True, foreign_table="refunds")
+        .limit(1)
     )
+    return _latest_events(query, ORDER_TIMELINE_LIMIT)
 
-    if search:
-        query = query.ilike("id", f"%{search}%")
 
-    if status:
-        query = query.eq("status", status)
+def _order_detail_result(res, user_id: str, vendor_id: str | None, is_admin: bool):
+    if not res.data:
+        raise HTTPException(404, "Order not found")
+
+    order = res.data[0]
+
+    # permission check
+    assert_user_can_view_order(order, user_id, vendor_id, is_admin=is_admin)
+
+    order["order_events"], events_next_cursor = _timeline_page(
+        order.get("order_events"),
+        ORDER_TIMELINE_LIMIT,
+    )
+
+    with timed("normalize"):
+        return {
+            **_normalize_order(order),
+            "events_next_cursor": events_next_cursor,
+        }
+
+
+@instrument_repository
+async def get_order_by_id(
+    jwt: str,
+    order_id: str,
+    user_id: str,
+    vendor_id: str | None,
+    is_admin: bool = False,
+):
+    supabase = get_async_service_client() if is_admin else get_async_user_client(jwt)
+
+    try:
+        res = await _order_detail_query(supabase, order_id).execute()
+    except APIError:
+        raise HTTPException(404, "Order not found")
+
+    return _order_detail_result(res, user_id, vendor_id, is_admin)
 
-    if sort == "newest":
-        query = query.order("created_at", desc=True).order("id", desc=True)
-    elif sort == "oldest":
-        query = query.order("created_at", desc=False).order("id", desc=False)
-    elif sort == "highest":
-        query = query.order("total", desc=True).order("id", desc=True)
 
+def _order_timeline_query(
+    supabase,
+    order_id: str,
+    cursor: str | None = None,
+    limit: int = ORDER_TIMELINE_LIMIT,
+):
+    query = _latest_events(
+        supabase
+        .table("orders")
+        .select(ORDER_TIMELINE_SELECT)
+        .eq("id", order_id)
+        .limit(1),
+        limit,
+    )
+
+    # Embedded filters narrow order_events only, not the order row.
     if cursor:
-        created_at, order_id = decode_cursor(cursor)
+        value, event_id = decode_cursor(cursor, TIMELINE_CURSOR_SORT)
+        query = query.lte("order_events.created_at", value).or_(
+            f'created_at.lt."{value}",'
+            f'and(created_at.eq."{value}",id.lt.{event_id})',
+            reference_table="order_events",
+        )
 
-        if sort in ["newest", "highest"]:
-            query = (
-                query
-                .lt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.lt.{order_id}")
-            )
-        else:
-            query = (
-                query
-                .gt("created_at", created_at)
-                .or_(f"created_at.eq.{created_at},id.gt.{order_id}")
-            )
+    return query
 
-    res = query.execute()
-    rows = res.data or []
 
-    has_more = len(rows) == limit + 1
-    rows = rows[:limit]
+def _order_timeline_result(res, limit: int, user_id: str, vendor_id: str | None, is_admin: bool):
+    if not res.data:
+        raise HTTPException(404, "Order not found")
 
-    next_cursor = None
-    if has_more:
-        last = rows[-1]
-        next_cursor = encode_cursor(last["created_at"], last["id"])
+    order = res.data[0]
+    assert_user_can_view_order(order, user_id, vendor_id, is_admin=is_admin)
+
+    rows, next_cursor = _timeline_page(order.get("order_events"), limit)
 
     return {
-        "data": _normalize_orders(rows),
+        "data": [_normalize_event(row) for row in rows],
         "next_cursor": next_cursor,
     }
 
 
-def get_order_by_id(
+@instrument_repository
+async def get_order_timeline(
     jwt: str,
     order_id: str,
     user_id: str,
     vendor_id: str | None,
     is_admin: bool = False,
+    cursor: str | None = None,
+    limit: int = ORDER_TIMELINE_LIMIT,
 ):
-    supabase = get_service_client() if is_admin else get_user_client(jwt)
+    """
+    One page of the order's events, newest first.
+    """
+    supabase = get_async_service_client() if is_admin else get_async_user_client(jwt)
 
     try:
-        res = (
+        res = await _order_timeline_query(supabase, order_id, cursor, limit).execute()
+    except APIError:
+        raise HTTPException(404, "Order not found")
+
+    return _order_timeline_result(res, limit, user_id, vendor_id, is_admin)
+
+
+@instrument_repository
+async def get_order_version(
+    jwt: str,
+    order_id: str,
+    user_id: str,
+    vendor_id: str | None,
+    is_admin: bool = False,
+) -> int | None:
+    """
+    orders.version for conditional GETs. Same client and ownership
+    check as the detail read: an order the caller can't see has no
+    version, so the full path answers with its usual 403/404.
+    """
+    supabase = get_async_service_client() if is_admin else get_async_user_client(jwt)
+
+    try:
+        res = await (
             supabase
             .table("orders")
-            .select(
-                """
-                id,
-                market_id,
-                vendor_id,
-                user_id,
-                status,
-                total,
-                created_at,
-                order_items (
-                    product_id,
-                    quantity,
-                    unit_price,
-                    line_total,
-                    products ( name )
-                ),
-                refunds (
-                    id,
-                    amount,
-                    reason,
-                    created_at
-                ),
-                order_events (
-                    id,
-                    event,
-                    amount,
-                    reason,
-                    created_at
-                )
-                """
-            )
+            .select("version, user_id, vendor_id")
             .eq("id", order_id)
             .limit(1)
             .execute()
         )
     except APIError:
-        raise HTTPException(404, "Order not found")
+        return None
 
     if not res.data:
-        raise HTTPException(404, "Order not found")
+        return None
 
     order = res.data[0]
+    try:
+        assert_user_can_view_order(order, user_id, vendor_id, is_admin=is_admin)
+    except HTTPException:
+        return None
 
-    # permission check
-    assert_user_can_view_order(order, user_id, vendor_id, is_admin=is_admin)
+    return order["version"]
+
+
+# =========================
+# Export
+# =========================
+
+# Orders per keyset batch. Each batch is its own upstream request, so
+# memory stays at one batch however many orders the export covers.
+EXPORT_BATCH_SIZE = 500
+
+ORDER_EXPORT_SELECT = """
+    id,
+    market_id,
+    vendor_id,
+    user_id,
+    status,
+    total,
+    refunded_total,
+    created_at,
+    order_items (
+        product_id,
+        product_name,
+        quantity,
+        unit_price,
+        line_total
+    ),
+    refunds (
+        id,
+        amount,
+        reason,
+        created_at
+    )
+"""
+
+
+def _orders_export_query(
+    supabase,
+    *,
+    vendor_id: str | None = None,
+    status: str | None = None,
+    created_from: str | None = None,
+    created_to: str | None = None,
+    after: tuple[str, str] | None = None,
+    limit: int = EXPORT_BATCH_SIZE,
+):
+    query = (
+        supabase
+        .table("orders")
+        .select(ORDER_EXPORT_SELECT)
+        .order("line_number", foreign_table="order_items")
+        .limit(limit)
+    )
+
+    if vendor_id:
+        query = query.eq("vendor_id", vendor_id)
+
+    if status:
+        query = query.eq("status", status)
+
+    if created_from:
+        query = query.gte("created_at", created_from)
+
+    if created_to:
+        query = query.lt("created_at", created_to)
+
+    query = query.order("created_at").order("id")
+
+    # Same (created_at, id) keyset as the "oldest" list sort.
+    if after:
+        value, order_id = after
+        query = query.gte("created_at", value).or_(
+            f'created_at.gt."{value}",'
+            f'and(created_at.eq."{value}",id.gt.{order_id})'
+        )
+
+    return query
+
+
+def _orders_export_sql(
+    *,
+    vendor_id: str | None = None,
+    status: str | None = None,
+    created_from: str | None = None,
+    created_to: str | None = None,
+    after: tuple[str, str] | None = None,
+    limit: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Direct-Postgres twin of _orders_export_query (PG_READ_PATHS=orders.export).
+    """
+    args: list = []
+    where: list[str] = []
+
+    def arg(value) -> str:
+        args.append(value)
+        return f"${len(args)}"
+
+    if vendor_id:
+        where.append(f"o.vendor_id = {arg(vendor_id)}::uuid")
+
+    if status:
+        where.append(f"o.status = {arg(status)}")
+
+    if created_from:
+        where.append(f"o.created_at >= {arg(created_from)}::text::timestamptz")
+
+    if created_to:
+        where.append(f"o.created_at < {arg(created_to)}::text::timestamptz")
+
+    if after:
+        value, order_id = after
+        where.append(
+            f"(o.created_at, o.id) > "
+            f"({arg(value)}::text::timestamptz, {arg(order_id)}::uuid)"
+        )
+
+    where_sql = f"where {' and '.join(where)}" if where else ""
+
+    sql = f"""
+        select coalesce(json_agg(t), '[]'::json)
+        from (
+            select
+                o.id,
+                o.market_id,
+                o.vendor_id,
+                o.user_id,
+                o.status,
+                o.total,
+                o.refunded_total,
+                o.created_at,
+                coalesce(
+                    (
+                        select json_agg(json_build_object(
+                            'product_id', oi.product_id,
+                            'product_name', oi.product_name,
+                            'quantity', oi.quantity,
+                            'unit_price', oi.unit_price,
+                            'line_total', oi.line_total
+                        ) order by oi.line_number)
+                        from public.order_items oi
+                        where oi.order_id = o.id
+                    ),
+                    '[]'::json
+                ) as order_items,
+                coalesce(
+                    (
+                        select json_agg(json_build_object(
+                            'id', r.id,
+                            'amount', r.amount,
+                            'reason', r.reason,
+                            'created_at', r.created_at
+                        ) order by r.created_at)
+                        from public.refunds r
+                        where r.order_id = o.id
+                    ),
+                    '[]'::json
+                ) as refunds
+            from public.orders o
+            {where_sql}
+            order by o.created_at, o.id
+            limit {arg(limit)}
+        ) t
+    """
+
+    return sql, args
+
+
+def _export_orders(rows):
+    with timed("normalize"):
+        orders = []
+        for row in rows or []:
+            order = _normalize_order(row)
+            order.pop("events")
+            orders.append(order)
+        return orders
+
+
+@instrument_repository
+async def get_orders_export_batch(
+    jwt: str | None,
+    *,
+    after: tuple[str, str] | None = None,
+    limit: int = EXPORT_BATCH_SIZE,
+    **filters,
+):
+    """
+    One keyset batch of orders with items and refunds, oldest first.
+    `jwt=None` reads with the service role (admin export).
+    """
+    if pg_read_enabled("orders.export"):
+        sql, args = _orders_export_sql(after=after, limit=limit, **filters)
+        transaction = service_transaction() if jwt is None else user_transaction(jwt)
+        async with transaction as conn:
+            rows = await fetch_json(conn, sql, *args)
+    else:
+        supabase = (
+            get_async_service_client() if jwt is None else get_async_user_client(jwt)
+        )
+        res = await _orders_export_query(
+            supabase, after=after, limit=limit, **filters
+        ).execute()
+        rows = res.data
+
+    return _export_orders(rows)
+
+
+async def iter_orders_for_export(
+    jwt: str | None,
+    *,
+    vendor_id: str | None = None,
+    status: str | None = None,
+    created_from: str | None = None,
+    created_to: str | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Yields every matching order in batches, oldest first. The next batch
+    is only requested once the previous one has been consumed.
+    """
+    after = None
+    while True:
+        batch = await get_orders_export_batch(
+            jwt,
+            vendor_id=vendor_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            after=after,
+            limit=batch_size,
+        )
+        if batch:
+            yield batch
 
-    return _normalize_order(order)
+        if len(batch) < batch_size:
+            return
 
+        last = batch[-1]
+        after = (last["created_at"], last["id"])
 
 
 # =========================
 # Mutations
 # =========================
 
-def create_order(jwt, market_id, vendor_id, customer_id, items):
-    supabase = get_user_client(jwt)
-    
-    res = supabase.rpc(
+def _idempotent_rpc(supabase, rpc_name: str, params: dict, idempotency_key: str | None):
+    """
+    With a key, calls the `*_idempotent` wrapper instead: a retry with the
+    same key returns the stored result without running the RPC again.
+    """
+    if idempotency_key is None:
+        return supabase.rpc(rpc_name, params)
+
+    return supabase.rpc(
+        rpc_name.removesuffix("_atomic") + "_idempotent",
+        {
+            "p_idempotency_key": idempotency_key,
+            "p_ttl_seconds": settings.idempotency_key_ttl_seconds,
+            **params,
+        },
+    )
+
+
+def _create_order_rpc(supabase, market_id, vendor_id, customer_id, items, idempotency_key=None):
+    return _idempotent_rpc(
+        supabase,
         "create_order_atomic",
         {
             "p_market_id": market_id,
@@ -333,6 +912,16 @@ def create_order(jwt, market_id, vendor_id, customer_id, items):
             "p_customer_id": customer_id,
             "p_items": items,
         },
+        idempotency_key,
+    )
+
+
+@instrument_repository
+async def create_order(jwt, market_id, vendor_id, customer_id, items, idempotency_key=None):
+    supabase = get_async_user_client(jwt)
+
+    res = await _create_order_rpc(
+        supabase, market_id, vendor_id, customer_id, items, idempotency_key
     ).execute()
 
     if not res.data:
@@ -341,15 +930,22 @@ def create_order(jwt, market_id, vendor_id, customer_id, items):
     return res.data
 
 
-def confirm_order(jwt: str, order_id: str, vendor_id: str):
-    supabase = get_user_client(jwt)
-
-    res = supabase.rpc(
-        "confirm_order_atomic",
+def _transition_rpc(supabase, rpc_name: str, order_id: str, vendor_id: str):
+    return supabase.rpc(
+        rpc_name,
         {
             "p_order_id": order_id,
             "p_vendor_id": vendor_id,
         },
+    )
+
+
+@instrument_repository
+async def confirm_order(jwt: str, order_id: str, vendor_id: str):
+    supabase = get_async_user_client(jwt)
+
+    res = await _transition_rpc(
+        supabase, "confirm_order_atomic", order_id, vendor_id
     ).execute()
 
     if not res.data:
@@ -358,15 +954,12 @@ def confirm_order(jwt: str, order_id: str, vendor_id: str):
     return res.data
 
 
-def cancel_order(jwt: str, order_id: str, vendor_id: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def cancel_order(jwt: str, order_id: str, vendor_id: str):
+    supabase = get_async_user_client(jwt)
 
-    res = supabase.rpc(
-        "cancel_order_atomic",
-        {
-            "p_order_id": order_id,
-            "p_vendor_id": vendor_id,
-        },
+    res = await _transition_rpc(
+        supabase, "cancel_order_atomic", order_id, vendor_id
     ).execute()
 
     if not res.data:
@@ -375,19 +968,62 @@ def cancel_order(jwt: str, order_id: str, vendor_id: str):
     return res.data
 
 
+def _bulk_transition_rpc(supabase, rpc_name: str, order_ids: list[str], vendor_id: str):
+    return supabase.rpc(
+        rpc_name,
+        {
+            "p_order_ids": order_ids,
+            "p_vendor_id": vendor_id,
+        },
+    )
+
+
+@instrument_repository
+async def confirm_orders_bulk(jwt: str, order_ids: list[str], vendor_id: str):
+    supabase = get_async_user_client(jwt)
+
+    res = await _bulk_transition_rpc(
+        supabase, "confirm_orders_bulk", order_ids, vendor_id
+    ).execute()
+
+    return res.data or []
+
+
+@instrument_repository
+async def cancel_orders_bulk(jwt: str, order_ids: list[str], vendor_id: str):
+    supabase = get_async_user_client(jwt)
+
+    res = await _bulk_transition_rpc(
+        supabase, "cancel_orders_bulk", order_ids, vendor_id
+    ).execute()
+
+    return res.data or []
+
+
 # =========================
 # Normalization
 # =========================
 
 def _normalize_orders(rows):
-    return [_normalize_order(row) for row in rows or []]
+    with timed("normalize"):
+        return [_normalize_order(row) for row in rows or []]
+
+
+def _normalize_event(event):
+    return {
+        "id": event["id"],
+        "type": event["event"],
+        "amount": event["amount"],
+        "reason": event["reason"],
+        "created_at": event["created_at"],
+    }
 
 
 def _normalize_order(order):
     items = [
         {
             "product_id": i["product_id"],
-            "name": i["products"]["name"],
+            "name": i["product_name"],
             "quantity": i["quantity"],
             "unit_price": i["unit_price"],
             "line_total": i.get("line_total")
@@ -406,27 +1042,23 @@ def _normalize_order(order):
         for r in order.get("refunds", [])
     ]
 
-    refunded_total = sum(r["amount"] for r in refunds)
-
-    events = [
-        {
-            "id": e["id"],
-            "type": e["event"],
-            "amount": e["amount"],
-            "reason": e["reason"],
-            "created_at": e["created_at"],
-        }
-        for e in order.get("order_events", [])
-    ]
+    events = [_normalize_event(e) for e in order.get("order_events", [])]
 
     events.sort(key=lambda e: e["created_at"])
 
 
+    # The raw embeds are replaced by their normalized copies, not repeated.
+    # refunded_total is the stored orders column, not a sum of `refunds`.
+    header = {
+        key: value
+        for key, value in order.items()
+        if key not in ("order_items", "order_events")
+    }
+
     return {
-        **order,
+        **header,
         "items": items,
         "refunds": refunds,
-        "refunded_total": refunded_total,
         "events": events,
     }
 
@@ -435,10 +1067,16 @@ def _normalize_order(order):
 # Refunds
 # =========================
 
-def refund_order(jwt: str, order_id: str, amount: float, reason: str, vendor_id: str):
-    supabase = get_user_client(jwt)
-
-    res = supabase.rpc(
+def _refund_rpc(
+    supabase,
+    order_id: str,
+    amount: float,
+    reason: str,
+    vendor_id: str,
+    idempotency_key: str | None = None,
+):
+    return _idempotent_rpc(
+        supabase,
         "refund_order_atomic",
         {
             "p_order_id": order_id,
@@ -446,6 +1084,23 @@ def refund_order(jwt: str, order_id: str, amount: float, reason: str, vendor_id:
             "p_reason": reason,
             "p_vendor_id": vendor_id,
         },
+        idempotency_key,
+    )
+
+
+@instrument_repository
+async def refund_order(
+    jwt: str,
+    order_id: str,
+    amount: float,
+    reason: str,
+    vendor_id: str,
+    idempotency_key: str | None = None,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _refund_rpc(
+        supabase, order_id, amount, reason, vendor_id, idempotency_key
     ).execute()
 
     if not res.data:
@@ -475,25 +1130,53 @@ def assert_user_can_view_order(
     raise HTTPException(403, "You are not allowed to view this order")
 
 
-def encode_cursor(created_at: str, order_id: str) -> str:
-    raw = f"{created_at}|{order_id}"
+def encode_cursor(value, order_id: str, sort: str = "newest") -> str:
+    raw = f"{sort}|{value}|{order_id}"
     return base64.urlsafe_b64encode(raw.encode()).decode()
 
-def decode_cursor(cursor: str) -> tuple[str, str]:
-    decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
-    created_at, order_id = decoded.split("|")
-    return created_at, order_id
 
+def decode_cursor(cursor: str, sort: str = "newest") -> tuple[str, str]:
+    """
+    Returns the (sort key value, order id) of the last row of the
+    previous page. A cursor only continues the sort that issued it.
+    """
+    try:
+        decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(400, "Invalid cursor")
+
+    parts = decoded.split("|")
+    if len(parts) == 2:
+        # Older `created_at|id` cursors.
+        cursor_sort = sort if _sort_key(sort)[0] == "created_at" else None
+        value, order_id = parts
+    elif len(parts) == 3:
+        cursor_sort, value, order_id = parts
+    else:
+        raise HTTPException(400, "Invalid cursor")
+
+    if cursor_sort != sort:
+        raise HTTPException(400, "Cursor does not match sort order")
+
+    return value, order_id
 
 
-def get_orders_summary(
-    jwt: str,
+
+EMPTY_ORDERS_SUMMARY = {
+    "total_orders": 0,
+    "pending": 0,
+    "confirmed": 0,
+    "canceled": 0,
+    "total_revenue": 0,
+}
+
+
+def _summary_rpc(
+    client,
     *,
     vendor_id: str | None = None,
     user_id: str | None = None,
 ):
-    client = get_user_client(jwt)
-
     if vendor_id:
         scope_column = "vendor_id"
         scope_value = vendor_id
@@ -503,24 +1186,20 @@ def get_orders_summary(
     else:
         raise ValueError("Either vendor_id or user_id required")
 
-    result = client.rpc(
+    return client.rpc(
         "orders_summary_by_scope",
         {
             "scope_column": scope_column,
             "scope_value": scope_value,
         },
-    ).execute()
+    )
 
-    if not result.data:
-        return {
-            "total_orders": 0,
-            "pending": 0,
-            "confirmed": 0,
-            "canceled": 0,
-            "total_revenue": 0,
-        }
 
-    row = result.data[0]
+def _summary_result(data):
+    if not data:
+        return dict(EMPTY_ORDERS_SUMMARY)
+
+    row = data[0]
 
     return {
         "total_orders": row["total_orders"],
@@ -529,3 +1208,40 @@ def get_orders_summary(
         "canceled": row["canceled"],
         "total_revenue": float(row["total_revenue"] or 0),
     }
+
+
+@instrument_repository
+async def get_orders_summary(
+    jwt: str,
+    *,
+    vendor_id: str | None = None,
+    user_id: str | None = None,
+):
+    client = get_async_user_client(jwt)
+
+    result = await _summary_rpc(client, vendor_id=vendor_id, user_id=user_id).execute()
+
+    return _summary_result(result.data)
+
+
+# =========================
+# Summary counter maintenance (ops)
+# =========================
+
+@instrument_repository
+def rebuild_order_summary_counters() -> int:
+    """
+    Recomputes order_summary_counters from orders. Order writes wait
+    for the rebuild to commit; reads are not blocked.
+    """
+    res = get_service_client().rpc("rebuild_order_summary_counters", {}).execute()
+    return res.data or 0
+
+
+@instrument_repository
+def check_order_summary_counters() -> list[dict]:
+    """
+    Rows where the counters disagree with orders (empty when consistent).
+    """
+    res = get_service_client().rpc("check_order_summary_counters", {}).execute()
+    return res.data or []
@@ -1,34 +1,119 @@
 # repositories/prices.py
-from app.db import get_service_client, get_user_client
+from app.db import (
+    get_async_service_client,
+    get_async_user_client,
+    get_user_client,
+)
+from app.metrics import instrument_repository
+from app.pg import fetch_json, pg_read_enabled, service_transaction
 from fastapi import HTTPException
 from postgrest import APIError
 from uuid import UUID
 
+ACTIVE_PRICE_AGREEMENTS_SELECT = """
+    market_id,
+    size_band_id,
+    reference_price,
+    confidence_score,
+    sample_count,
+    valid_from,
+    valid_until
+"""
+
+ADMIN_PRICE_AGREEMENTS_SELECT = """
+    id,
+    market_id,
+    size_band_id,
+    reference_price,
+    confidence_score,
+    sample_count,
+    status,
+    valid_from,
+    valid_until,
+    created_at
+"""
+
+
+def _active_price_agreements_query(supabase):
+    return (
+        supabase
+        .from_("active_price_agreements")
+        .select(ACTIVE_PRICE_AGREEMENTS_SELECT)
+        .order("market_id")
+        .order("size_band_id")
+    )
+
+
+_ACTIVE_PRICE_AGREEMENTS_SQL = f"""
+    select coalesce(json_agg(t), '[]'::json)
+    from (
+        select {ACTIVE_PRICE_AGREEMENTS_SELECT}
+        from public.active_price_agreements
+        order by market_id, size_band_id
+    ) t
+"""
+
+
+def _admin_price_agreements_query(
+    supabase,
+    status: str | None = None,
+    market_id: str | None = None,
+):
+    query = (
+        supabase
+        .from_("price_agreements")
+        .select(ADMIN_PRICE_AGREEMENTS_SELECT)
+    )
+
+    if status:
+        query = query.eq("status", status)
+    if market_id:
+        query = query.eq("market_id", market_id)
+
+    return query.order("created_at", desc=True)
+
+
+def _price_status_query(supabase, price_id: UUID):
+    return (
+        supabase
+        .from_("price_agreements")
+        .select("id, status")
+        .eq("id", str(price_id))
+        .limit(1)
+    )
+
+
+def _lockable_agreement(res):
+    if not res.data:
+        raise HTTPException(404, "Price agreement not found")
+
+    agreement = res.data[0]
+
+    if agreement["status"] != "draft":
+        raise HTTPException(400, f"Cannot lock price with status '{agreement['status']}'")
+
+    return agreement
+
+
+def _lock_query(supabase, price_id: UUID):
+    return supabase.from_("price_agreements").update(
+        {"status": "locked"}
+    ).eq("id", str(price_id))
+
+
 # -----------------------------------------
 # Active Price Agreements
 # -----------------------------------------
-def get_active_price_agreements():
-    supabase = get_service_client()
+@instrument_repository
+async def get_active_price_agreements():
+    if pg_read_enabled("prices.active"):
+        async with service_transaction() as conn:
+            return await fetch_json(conn, _ACTIVE_PRICE_AGREEMENTS_SQL)
+
+    supabase = get_async_service_client()
 
     try:
-        res = (
-            supabase
-            .from_("active_price_agreements")
-            .select(
-                """
-                market_id,
-                size_band_id,
-                reference_price,
-                confidence_score,
-                sample_count,
-                valid_from,
-                valid_until
-                """
-            )
-            .order("market_id")
-            .order("size_band_id")
-            .execute()
-        )
+        res = await _active_price_agreements_query(supabase).execute()
     except (APIError, ConnectionError) as e:
         raise HTTPException(500, f"Database error: {e}")
 
@@ -37,39 +122,16 @@ def get_active_price_agreements():
 # -----------------------------------------
 # Admin Price Agreements
 # -----------------------------------------
-def get_admin_price_agreements(
+@instrument_repository
+async def get_admin_price_agreements(
     jwt: str,
     status: str | None = None,
     market_id: str | None = None,
 ):
-    supabase = get_user_client(jwt)
+    supabase = get_async_user_client(jwt)
 
     try:
-        query = (
-            supabase
-            .from_("price_agreements")
-            .select(
-                """
-                id,
-                market_id,
-                size_band_id,
-                reference_price,
-                confidence_score,
-                sample_count,
-                status,
-                valid_from,
-                valid_until,
-                created_at
-                """
-            )
-        )
-
-        if status:
-            query = query.eq("status", status)
-        if market_id:
-            query = query.eq("market_id", market_id)
-
-        res = query.order("created_at", desc=True).execute()
+        res = await _admin_price_agreements_query(supabase, status, market_id).execute()
     except (APIError, ConnectionError) as e:
         raise HTTPException(500, f"Database error: {e}")
 
@@ -78,34 +140,19 @@ def get_admin_price_agreements(
 # -----------------------------------------
 # Lock Price Agreement
 # -----------------------------------------
-def lock_price_agreement(price_id: UUID, jwt: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def lock_price_agreement(price_id: UUID, jwt: str):
+    supabase = get_async_user_client(jwt)
 
-    # Fetch current status
     try:
-        res = (
-            supabase
-            .from_("price_agreements")
-            .select("id, status")
-            .eq("id", str(price_id))
-            .limit(1)
-            .execute()
-        )
-    except APIError as e:
-        raise HTTPException(404, "Price agreement not found")
-
-    if not res.data:
+        res = await _price_status_query(supabase, price_id).execute()
+    except APIError:
         raise HTTPException(404, "Price agreement not found")
 
-    agreement = res.data[0]
-
-    if agreement["status"] != "draft":
-        raise HTTPException(400, f"Cannot lock price with status '{agreement['status']}'")
+    _lockable_agreement(res)
 
     try:
-        supabase.from_("price_agreements").update(
-            {"status": "locked"}
-        ).eq("id", str(price_id)).execute()
+        await _lock_query(supabase, price_id).execute()
     except APIError as e:
         raise HTTPException(500, str(e))
 
@@ -114,6 +161,7 @@ def lock_price_agreement(price_id: UUID, jwt: str):
 # -----------------------------------------
 # User-submitted price signal
 # -----------------------------------------
+@instrument_repository
 def submit_price_signal(jwt: str, user_id: str, market_id: str, size_band_id: str, price_per_kg: float):
     supabase = get_user_client(jwt)
 
@@ -154,6 +202,7 @@ def submit_price_signal(jwt: str, user_id: str, market_id: str, size_band_id: st
 # -----------------------------------------
 # Explain Prices
 # -----------------------------------------
+@instrument_repository
 def get_price_explain(jwt: str, market_id: str):
     supabase = get_user_client(jwt)
 
@@ -1,67 +1,60 @@
-from app.db import get_user_client
-from app.schemas.products import ProductBulkUpdateItem
-from typing import List
+from app.db import get_async_user_client, get_user_client
+from app.metrics import instrument_repository
+from app.pg import fetch_json, pg_read_enabled, user_transaction
 from fastapi import HTTPException
 from postgrest import APIError
 
-def list_products(jwt: str):
-    supabase = get_user_client(jwt)
-    res = supabase.table("products").select("*").execute()
-    return res.data
-
 
-def get_product_by_id(jwt: str, product_id: str):
-    supabase = get_user_client(jwt)
-    try:
-        res = (
-            supabase
-            .table("products")
-            .select("*")
-            .eq("id", product_id)
-            .limit(1)
-            .execute()
-        )
-    except APIError:
-        return None
-
-    if not res.data:
-        return None
+VENDOR_PRODUCTS_SELECT = """
+    id,
+    name,
+    price,
+    active,
+    stock_quantity,
+    is_available,
+    vendor_id,
+    created_at,
+    vendor:vendors!inner (
+        id,
+        market_id
+    )
+"""
 
-    return res.data[0]
 
+# -------------------------
+# Query builders
+# -------------------------
 
-def create_product(jwt: str, payload: dict):
-    supabase = get_user_client(jwt)
-    res = supabase.table("products").insert(payload).execute()
-    return res.data[0]
+def _product_query(supabase, product_id: str):
+    return (
+        supabase
+        .table("products")
+        .select("*")
+        .eq("id", product_id)
+        .limit(1)
+    )
 
 
-def update_product(jwt: str, product_id: str, updates: dict):
-    supabase = get_user_client(jwt)
-    res = (
+def _update_product_query(supabase, product_id: str, updates: dict):
+    return (
         supabase
         .table("products")
         .update(updates)
         .eq("id", product_id)
-        .execute()
     )
-    return res.data[0] if res.data else None
 
 
-def delete_product(jwt: str, product_id: str):
-    supabase = get_user_client(jwt)
-    res = (
+def _delete_product_query(supabase, product_id: str):
+    return (
         supabase
         .table("products")
         .delete()
         .eq("id", product_id)
-        .execute()
     )
-    return bool(res.data)
 
 
-def get_products_for_vendor(
-    jwt: str,
+def _vendor_products_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     *,
@@ -70,27 +63,10 @@ def get_products_for_vendor(
     max_price: float | None = None,
     sort: str = "name",
 ):
-    supabase = get_user_client(jwt)
-
     query = (
         supabase
         .table("products")
-        .select(
-            """
-            id,
-            name,
-            price,
-            active,
-            stock_quantity,
-            is_available,
-            vendor_id,
-            created_at,
-            vendor:vendors!inner (
-                id,
-                market_id
-            )
-            """
-        )
+        .select(VENDOR_PRODUCTS_SELECT)
         .eq("vendor_id", vendor_id)
         .eq("vendors.market_id", market_id)
     )
@@ -111,86 +87,67 @@ def get_products_for_vendor(
     else:
         query = query.order("name", desc=False)
 
-    res = query.execute()
-
-    return res.data
+    return query
 
 
-def create_product_for_vendor(
-    jwt: str,
+def _vendor_product_insert_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     payload: dict,
 ):
-    supabase = get_user_client(jwt)
-
     data = {
         **payload,
         "market_id": market_id,
         "vendor_id": vendor_id,
     }
 
-    res = (
+    return (
         supabase
         .table("products")
         .insert(data)
-        .execute()
     )
 
-    return res.data[0] if res.data else None
-
 
-def update_product_for_vendor(
-    jwt: str,
+def _vendor_product_update_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     product_id: str,
     updates: dict,
 ):
-    supabase = get_user_client(jwt)
-
-    res = (
+    return (
         supabase
         .table("products")
         .update(updates)
         .eq("id", product_id)
         .eq("vendor_id", vendor_id)
         .eq("market_id", market_id)
-        .execute()
     )
 
-    return res.data[0] if res.data else None
-
 
-def delete_product_for_vendor(
-    jwt: str,
+def _vendor_product_delete_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     product_id: str,
 ):
-    supabase = get_user_client(jwt)
-
-    res = (
+    return (
         supabase
         .table("products")
         .delete()
         .eq("id", product_id)
         .eq("vendor_id", vendor_id)
         .eq("market_id", market_id)
-        .execute()
     )
 
-    return bool(res.data)
-
 
-def create_products_for_vendor_bulk(
-    jwt: str,
+def _vendor_products_bulk_insert_query(
+    supabase,
     market_id: str,
     vendor_id: str,
     products: list[dict],
 ):
-    supabase = get_user_client(jwt)
-
     payload = [
         {
             **product,
@@ -200,67 +157,293 @@ def create_products_for_vendor_bulk(
         for product in products
     ]
 
-    res = (
+    return (
         supabase
         .table("products")
         .insert(payload)
-        .execute()
     )
 
+
+def _bulk_update_items(products: list[dict]) -> list[dict]:
+    # Items without an id or without fields to change are skipped, not rejected.
+    items = []
+    for item in products:
+        fields = {key: value for key, value in item.items() if key != "id"}
+        if item.get("id") and fields:
+            items.append({"id": str(item["id"]), **fields})
+    return items
+
+
+def _bulk_update_rpc(supabase, vendor_id: str, items: list[dict]):
+    return supabase.rpc(
+        "bulk_update_products",
+        {
+            "p_vendor_id": vendor_id,  # 🔐 ownership guard
+            "p_items": items,
+        },
+    )
+
+
+def _bulk_update_result(res) -> dict:
+    return res.data or {"updated": [], "rejected": []}
+
+
+_VENDOR_PRODUCTS_SORT_SQL = {
+    "price_asc": "p.price asc, p.name asc",
+    "price_desc": "p.price desc, p.name asc",
+}
+
+
+def _vendor_products_sql(
+    market_id: str,
+    vendor_id: str,
+    *,
+    search: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    sort: str = "name",
+):
+    """
+    Direct-Postgres twin of _vendor_products_query (PG_READ_PATHS=products.vendor_list).
+    """
+    args: list = [vendor_id, market_id]
+    where = ["p.vendor_id = $1::uuid", "v.market_id = $2::uuid"]
+
+    if search:
+        args.append(f"%{search}%")
+        where.append(f"p.name ilike ${len(args)}")
+
+    if min_price is not None:
+        args.append(min_price)
+        where.append(f"p.price >= ${len(args)}")
+
+    if max_price is not None:
+        args.append(max_price)
+        where.append(f"p.price <= ${len(args)}")
+
+    order_sql = _VENDOR_PRODUCTS_SORT_SQL.get(sort, "p.name asc")
+
+    sql = f"""
+        select coalesce(json_agg(t), '[]'::json)
+        from (
+            select
+                p.id,
+                p.name,
+                p.price,
+                p.active,
+                p.stock_quantity,
+                p.is_available,
+                p.vendor_id,
+                p.created_at,
+                json_build_object('id', v.id, 'market_id', v.market_id) as vendor
+            from public.products p
+            join public.vendors v on v.id = p.vendor_id
+            where {' and '.join(where)}
+            order by {order_sql}
+        ) t
+    """
+
+    return sql, args
+
+
+_PRODUCTS_SQL = """
+    select coalesce(json_agg(p), '[]'::json)
+    from public.products p
+"""
+
+
+def _first_row(res):
+    return res.data[0] if res.data else None
+
+
+# -------------------------
+# Products
+# -------------------------
+
+@instrument_repository
+async def list_products(jwt: str):
+    if pg_read_enabled("products.list"):
+        async with user_transaction(jwt) as conn:
+            return await fetch_json(conn, _PRODUCTS_SQL)
+
+    supabase = get_async_user_client(jwt)
+    res = await supabase.table("products").select("*").execute()
+    return res.data
+
+
+@instrument_repository
+async def get_product_by_id(jwt: str, product_id: str):
+    supabase = get_async_user_client(jwt)
+    try:
+        res = await _product_query(supabase, product_id).execute()
+    except APIError:
+        return None
+
+    return _first_row(res)
+
+
+@instrument_repository
+async def create_product(jwt: str, payload: dict):
+    supabase = get_async_user_client(jwt)
+    res = await supabase.table("products").insert(payload).execute()
+    return res.data[0]
+
+
+@instrument_repository
+async def update_product(jwt: str, product_id: str, updates: dict):
+    supabase = get_async_user_client(jwt)
+    res = await _update_product_query(supabase, product_id, updates).execute()
+    return _first_row(res)
+
+
+@instrument_repository
+async def delete_product(jwt: str, product_id: str):
+    supabase = get_async_user_client(jwt)
+    res = await _delete_product_query(supabase, product_id).execute()
+    return bool(res.data)
+
+
+# -------------------------
+# Vendor catalog
+# -------------------------
+
+@instrument_repository
+async def get_products_for_vendor(
+    jwt: str,
+    market_id: str,
+    vendor_id: str,
+    *,
+    search: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    sort: str = "name",
+):
+    if pg_read_enabled("products.vendor_list"):
+        sql, args = _vendor_products_sql(
+            market_id,
+            vendor_id,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+        )
+        async with user_transaction(jwt) as conn:
+            return await fetch_json(conn, sql, *args)
+
+    supabase = get_async_user_client(jwt)
+
+    res = await _vendor_products_query(
+        supabase,
+        market_id,
+        vendor_id,
+        search=search,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+    ).execute()
+
     return res.data
 
 
-def bulk_update_products_for_vendor(
+@instrument_repository
+async def create_product_for_vendor(
     jwt: str,
+    market_id: str,
+    vendor_id: str,
+    payload: dict,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _vendor_product_insert_query(
+        supabase, market_id, vendor_id, payload
+    ).execute()
+
+    return _first_row(res)
+
+
+@instrument_repository
+async def update_product_for_vendor(
+    jwt: str,
+    market_id: str,
+    vendor_id: str,
+    product_id: str,
+    updates: dict,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _vendor_product_update_query(
+        supabase, market_id, vendor_id, product_id, updates
+    ).execute()
+
+    return _first_row(res)
+
+
+@instrument_repository
+async def delete_product_for_vendor(
+    jwt: str,
+    market_id: str,
+    vendor_id: str,
+    product_id: str,
+):
+    supabase = get_async_user_client(jwt)
+
+    res = await _vendor_product_delete_query(
+        supabase, market_id, vendor_id, product_id
+    ).execute()
+
+    return bool(res.data)
+
+
+@instrument_repository
+async def create_products_for_vendor_bulk(
+    jwt: str,
+    market_id: str,
     vendor_id: str,
     products: list[dict],
 ):
-    supabase = get_user_client(jwt)
-    updated = []
+    supabase = get_async_user_client(jwt)
 
-    for item in products:
-        product_id = item.pop("id", None)
-
-        if not product_id or not item:
-            continue
-
-        res = (
-            supabase
-            .table("products")
-            .update(item)
-            .eq("id", product_id)
-            .eq("vendor_id", vendor_id)  # 🔐 ownership guard
-            .execute()
-        )
+    res = await _vendor_products_bulk_insert_query(
+        supabase, market_id, vendor_id, products
+    ).execute()
+
+    return res.data
+
+
+@instrument_repository
+async def bulk_update_products_for_vendor(
+    jwt: str,
+    vendor_id: str,
+    products: list[dict],
+):
+    items = _bulk_update_items(products)
+    if not items:
+        return {"updated": [], "rejected": []}
 
-        if res.data:
-            updated.append(res.data[0])
+    supabase = get_async_user_client(jwt)
+    res = await _bulk_update_rpc(supabase, vendor_id, items).execute()
 
-    return updated
+    return _bulk_update_result(res)
 
 
-def update_product_inventory(
+@instrument_repository
+async def update_product_inventory(
     jwt: str,
     market_id: str,
     vendor_id: str,
     product_id: str,
     updates: dict,
 ):
-    supabase = get_user_client(jwt)
+    supabase = get_async_user_client(jwt)
 
-    res = (
-        supabase
-        .table("products")
-        .update(updates)
-        .eq("id", product_id)
-        .eq("vendor_id", vendor_id)
-        .eq("market_id", market_id)
-        .execute()
-    )
+    res = await _vendor_product_update_query(
+        supabase, market_id, vendor_id, product_id, updates
+    ).execute()
 
-    return res.data[0] if res.data else None
+    return _first_row(res)
 
 
+@instrument_repository
 def decrement_inventory(
     jwt: str,
     product_id: str,
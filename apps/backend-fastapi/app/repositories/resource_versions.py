@@ -0,0 +1,36 @@
+# repositories/resource_versions.py
+#
+# Versions for conditional GETs (see app/conditional.py). Rows in
+# public.resource_versions are bumped by triggers whenever a collection
+# changes; keys look like `orders:vendor:<vendor_id>`.
+
+from app.db import get_async_service_client
+from app.metrics import instrument_repository
+
+
+def resource_key(kind: str, scope: str, owner_id: str) -> str:
+    return f"{kind}:{scope}:{owner_id}"
+
+
+def _resource_version_query(supabase, key: str):
+    return (
+        supabase
+        .table("resource_versions")
+        .select("version")
+        .eq("key", key)
+        .limit(1)
+    )
+
+
+def _version_result(data) -> int:
+    # No row yet: nothing has changed since versions were introduced.
+    if not data:
+        return 0
+    return data[0]["version"]
+
+
+@instrument_repository
+async def get_resource_version(key: str) -> int:
+    supabase = get_async_service_client()
+    res = await _resource_version_query(supabase, key).execute()
+    return _version_result(res.data)
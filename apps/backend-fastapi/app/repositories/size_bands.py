@@ -1,8 +1,10 @@
 from app.db import get_user_client
+from app.metrics import instrument_repository
 from fastapi import HTTPException
 from postgrest import APIError
 
 
+@instrument_repository
 def list_size_bands(jwt: str):
     supabase = get_user_client(jwt)
 
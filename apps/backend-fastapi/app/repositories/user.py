@@ -1,6 +1,8 @@
 from app.db import get_service_client
+from app.metrics import instrument_repository
 
 
+@instrument_repository
 def promote_to_admin(user_id: str):
     """
     Promotes a user to admin by writing role to app_metadata.
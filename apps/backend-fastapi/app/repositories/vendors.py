@@ -1,114 +1,134 @@
-from app.db import get_user_client
+from app.db import get_async_user_client
+from app.metrics import instrument_repository
 from uuid import UUID
 from postgrest import APIError
 
 
 # -----------------------------
-# List vendors (RLS controlled)
+# Query builders
 # -----------------------------
-def get_vendors(jwt: str):
-    supabase = get_user_client(jwt)
-
-    res = (
+def _vendors_query(supabase):
+    return (
         supabase
         .table("vendors")
         .select("*")
         .order("created_at", desc=False)
-        .execute()
     )
 
+
+def _vendor_query(supabase, vendor_id: UUID):
+    return (
+        supabase
+        .table("vendors")
+        .select("*")
+        .eq("id", str(vendor_id))
+        .limit(1)
+    )
+
+
+def _update_vendor_query(supabase, vendor_id: UUID, updates: dict):
+    return (
+        supabase
+        .table("vendors")
+        .update(updates)
+        .eq("id", str(vendor_id))
+    )
+
+
+def _delete_vendor_query(supabase, vendor_id: UUID):
+    return (
+        supabase
+        .table("vendors")
+        .delete()
+        .eq("id", str(vendor_id))
+    )
+
+
+def _market_vendors_query(supabase, market_id: UUID, search: str | None = None):
+    query = (
+        supabase
+        .table("vendors")
+        .select("*")
+        .eq("market_id", str(market_id))
+    )
+
+    if search:
+        query = query.ilike("name", f"%{search}%")
+
+    return query.order("created_at", desc=False)
+
+
+def _first_row(res):
+    if not res.data:
+        return None
+
+    return res.data[0]
+
+
+# -----------------------------
+# List vendors (RLS controlled)
+# -----------------------------
+@instrument_repository
+async def get_vendors(jwt: str):
+    supabase = get_async_user_client(jwt)
+
+    res = await _vendors_query(supabase).execute()
+
     return res.data or []
 
 
 # -----------------------------
 # Get single vendor
 # -----------------------------
-def get_vendor(vendor_id: UUID, jwt: str):
-    supabase = get_user_client(jwt)
+@instrument_repository
+async def get_vendor(vendor_id: UUID, jwt: str):
+    supabase = get_async_user_client(jwt)
 
     try:
-        res = (
-            supabase
-            .table("vendors")
-            .select("*")
-            .eq("id", str(vendor_id))
-            .limit(1)
-            .execute()
-        )
+        res = await _vendor_query(supabase, vendor_id).execute()
     except APIError:
         return None
 
-    if not res.data:
-        return None
-
-    return res.data[0]
+    return _first_row(res)
 
 
 # -----------------------------
 # Create vendor
 # -----------------------------
-def create_vendor(jwt: str, payload: dict):
-    """
-    RLS ensures:
-      - Only market admins can insert
-      - Must belong to market
-    """
-    supabase = get_user_client(jwt)
-
-    res = (
+@instrument_repository
+async def create_vendor(jwt: str, payload: dict):
+    supabase = get_async_user_client(jwt)
+
+    res = await (
         supabase
         .table("vendors")
         .insert(payload)
         .execute()
     )
 
-    if not res.data:
-        return None
-
-    return res.data[0]
+    return _first_row(res)
 
 
 # -----------------------------
 # Update vendor
 # -----------------------------
-def update_vendor(jwt: str, vendor_id: UUID, updates: dict):
-    """
-    RLS ensures:
-      - Only market admins can update
-    """
-    supabase = get_user_client(jwt)
-
-    res = (
-        supabase
-        .table("vendors")
-        .update(updates)
-        .eq("id", str(vendor_id))
-        .execute()
-    )
+@instrument_repository
+async def update_vendor(jwt: str, vendor_id: UUID, updates: dict):
+    supabase = get_async_user_client(jwt)
 
-    if not res.data:
-        return None
+    res = await _update_vendor_query(supabase, vendor_id, updates).execute()
 
-    return res.data[0]
+    return _first_row(res)
 
 
 # -----------------------------
 # Delete vendor
 # -----------------------------
-def delete_vendor(jwt: str, vendor_id: UUID):
-    """
-    RLS ensures:
-      - Only market admins can delete
-    """
-    supabase = get_user_client(jwt)
-
-    res = (
-        supabase
-        .table("vendors")
-        .delete()
-        .eq("id", str(vendor_id))
-        .execute()
-    )
+@instrument_repository
+async def delete_vendor(jwt: str, vendor_id: UUID):
+    supabase = get_async_user_client(jwt)
+
+    res = await _delete_vendor_query(supabase, vendor_id).execute()
 
     if not res.data:
         return None
@@ -119,24 +139,15 @@ def delete_vendor(jwt: str, vendor_id: UUID):
 # -----------------------------
 # Vendors by market
 # -----------------------------
-def list_vendors_for_market(
+@instrument_repository
+async def list_vendors_for_market(
     jwt: str,
     market_id: UUID,
     *,
     search: str | None = None,
 ):
-    supabase = get_user_client(jwt)
-
-    query = (
-        supabase
-        .table("vendors")
-        .select("*")
-        .eq("market_id", str(market_id))
-    )
-
-    if search:
-        query = query.ilike("name", f"%{search}%")
+    supabase = get_async_user_client(jwt)
 
-    res = query.order("created_at", desc=False).execute()
+    res = await _market_vendors_query(supabase, market_id, search).execute()
 
     return res.data or []
@@ -7,6 +7,7 @@ from app.repositories.prices import (
     get_price_explain,
     lock_price_agreement,
 )
+from app.responses import trusted_response
 from app.schemas.prices import PriceExplainOut, PriceLockOut, ActivePriceAgreementOut
 
 
@@ -14,13 +15,16 @@ router = APIRouter(prefix="/prices")
 
 
 @router.get("")
-def list_admin_prices(
+async def list_admin_prices(
     status: str | None = Query(None),
     market_id: str | None = Query(None),
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("prices.read")),
 ):
-    return get_admin_price_agreements(jwt, status=status, market_id=market_id)
+    return trusted_response(
+        None,
+        await get_admin_price_agreements(jwt, status=status, market_id=market_id),
+    )
 
 
 @router.get("/explain", response_model=list[PriceExplainOut])
@@ -33,9 +37,9 @@ def explain_admin_prices(
 
 
 @router.post("/{price_id}/lock", response_model=PriceLockOut)
-def lock_price(
+async def lock_price(
     price_id: UUID,
     jwt: str = Depends(get_current_jwt),
     _admin = Depends(require_permissions("prices.lock")),
 ):
-    return lock_price_agreement(price_id, jwt)
+    return await lock_price_agreement(price_id, jwt)
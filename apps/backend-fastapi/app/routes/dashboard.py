@@ -14,7 +14,7 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
     dependencies=[Depends(require_permissions("dashboard.admin"))],
 )
 async def get_admin_overview_route():
-    return get_admin_overview()
+    return await get_admin_overview()
 
 
 @router.get(
@@ -23,4 +23,4 @@ async def get_admin_overview_route():
     dependencies=[Depends(require_permissions("dashboard.admin"))],
 )
 async def get_admin_orders_trend_route():
-    return get_admin_orders_trend()
+    return await get_admin_orders_trend()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 
-from app.core.dependencies import require_permissions
+from app.core.dependencies import get_request_clients, require_permissions
+from app.db import RequestClients
 from app.repositories.market_subscriptions import (
     create_market_subscription,
     delete_market_subscription,
@@ -16,35 +17,41 @@ router = APIRouter(prefix="/me/market-subscriptions", tags=["market-subscription
 
 
 @router.get("", response_model=list[MarketSubscriptionOut])
-def get_my_market_subscriptions(
+async def get_my_market_subscriptions(
     current_user: dict = Depends(require_permissions("markets.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    return list_market_subscriptions(
+    return await list_market_subscriptions(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
+        client=clients.user,
     )
 
 
 @router.post("", response_model=MarketSubscriptionOut)
-def create_my_market_subscription(
+async def create_my_market_subscription(
     payload: MarketSubscriptionCreate,
     current_user: dict = Depends(require_permissions("markets.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    return create_market_subscription(
+    return await create_market_subscription(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
         market_id=str(payload.market_id),
+        client=clients.user,
     )
 
 
 @router.delete("/{market_id}")
-def delete_my_market_subscription(
+async def delete_my_market_subscription(
     market_id: str,
     current_user: dict = Depends(require_permissions("markets.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    delete_market_subscription(
+    await delete_market_subscription(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
         market_id=market_id,
+        client=clients.user,
     )
     return {"ok": True}
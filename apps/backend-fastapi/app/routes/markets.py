@@ -1,10 +1,12 @@
 # routes/markets.py
 # has been audited for permissions and dependencies, and implements the following endpoints:
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from uuid import UUID
 from typing import List
 
+from app.conditional import conditional_get
 from app.core.dependencies import get_current_jwt, require_permissions
+from app.responses import trusted_response
 from app.repositories.markets import list_markets, get_market_by_id
 from app.repositories.vendors import list_vendors_for_market, create_vendor
 from app.repositories.products import (
@@ -17,6 +19,7 @@ from app.repositories.products import (
     update_product_inventory
 )
 from app.repositories.inventory_events import list_inventory_events
+from app.repositories.resource_versions import get_resource_version, resource_key
 from app.schemas.markets import MarketOut
 from app.schemas.vendors import VendorOut, VendorCreate
 from app.schemas.inventory_events import InventoryEventOut
@@ -26,6 +29,7 @@ from app.schemas.products import (
     ProductUpdate,
     ProductBulkCreate,
     ProductBulkUpdate,
+    ProductBulkUpdateResult,
     ProductInventoryUpdate
 )
 
@@ -35,21 +39,21 @@ router = APIRouter(tags=["markets"])
 # MARKETS
 # -----------------------
 @router.get("/markets", response_model=list[MarketOut])
-def get_markets(
+async def get_markets(
     search: str | None = Query(None, min_length=1),
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("markets.read")),
 ):
-    return list_markets(jwt, search=search)
+    return await list_markets(jwt, search=search)
 
 
 @router.get("/markets/{market_id}", response_model=MarketOut)
-def get_market(
+async def get_market(
     market_id: UUID,
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("markets.read")),
 ):
-    market = get_market_by_id(jwt, market_id)
+    market = await get_market_by_id(jwt, market_id)
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
     return market
@@ -59,23 +63,23 @@ def get_market(
 # VENDORS
 # -----------------------
 @router.get("/markets/{market_id}/vendors", response_model=list[VendorOut])
-def get_vendors_for_market(
+async def get_vendors_for_market(
     market_id: UUID,
     search: str | None = Query(None, min_length=1),
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("vendors.read")),
 ):
-    return list_vendors_for_market(jwt, market_id, search=search)
+    return await list_vendors_for_market(jwt, market_id, search=search)
 
 
 @router.post("/markets/{market_id}/vendors", response_model=VendorOut, status_code=201)
-def create_vendor_for_market(
+async def create_vendor_for_market(
     market_id: UUID,
     payload: VendorCreate,
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("vendors.create")),
 ):
-    vendor = create_vendor(
+    vendor = await create_vendor(
         jwt,
         {
             "market_id": str(market_id),
@@ -94,7 +98,8 @@ def create_vendor_for_market(
     "/markets/{market_id}/vendors/{vendor_id}/products",
     response_model=List[ProductOut],
 )
-def get_vendor_products(
+async def get_vendor_products(
+    request: Request,
     market_id: UUID,
     vendor_id: UUID,
     search: str | None = Query(None, min_length=1),
@@ -104,7 +109,13 @@ def get_vendor_products(
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("products.read")),
 ):
-    return get_products_for_vendor(
+    key = resource_key("products", "vendor", str(vendor_id))
+    version = await get_resource_version(key)
+    not_modified = conditional_get(request, key, version)
+    if not_modified is not None:
+        return not_modified
+
+    products = await get_products_for_vendor(
         jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -114,19 +125,21 @@ def get_vendor_products(
         sort=sort,
     )
 
+    return trusted_response(List[ProductOut], products)
+
 
 @router.post(
     "/markets/{market_id}/vendors/{vendor_id}/products",
     response_model=ProductOut,
 )
-def create_market_vendor_product(
+async def create_market_vendor_product(
     market_id: UUID,
     vendor_id: UUID,
     payload: ProductCreate,
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("products.create")),
 ):
-    product = create_product_for_vendor(
+    product = await create_product_for_vendor(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -141,7 +154,7 @@ def create_market_vendor_product(
     "/markets/{market_id}/vendors/{vendor_id}/products/{product_id}",
     response_model=ProductOut,
 )
-def patch_market_vendor_product(
+async def patch_market_vendor_product(
     market_id: UUID,
     vendor_id: UUID,
     product_id: UUID,
@@ -152,7 +165,7 @@ def patch_market_vendor_product(
     updates = payload.model_dump(exclude_unset=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
-    product = update_product_for_vendor(
+    product = await update_product_for_vendor(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -166,9 +179,9 @@ def patch_market_vendor_product(
 
 @router.patch(
     "/markets/{market_id}/vendors/{vendor_id}/products/bulk",
-    response_model=list[ProductOut],
+    response_model=ProductBulkUpdateResult,
 )
-def bulk_update_products(
+async def bulk_update_products(
     market_id: UUID,
     vendor_id: UUID,
     payload: ProductBulkUpdate,
@@ -176,20 +189,20 @@ def bulk_update_products(
     _=Depends(require_permissions("products.bulk_update")),
 ):
     products = [p.model_dump(exclude_unset=True) for p in payload.products]
-    return bulk_update_products_for_vendor(jwt, vendor_id=str(vendor_id), products=products)
+    return await bulk_update_products_for_vendor(jwt, vendor_id=str(vendor_id), products=products)
 
 
 @router.delete(
     "/markets/{market_id}/vendors/{vendor_id}/products/{product_id}",
 )
-def delete_market_vendor_product(
+async def delete_market_vendor_product(
     market_id: UUID,
     vendor_id: UUID,
     product_id: UUID,
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("products.delete")),
 ):
-    deleted = delete_product_for_vendor(
+    deleted = await delete_product_for_vendor(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -204,14 +217,14 @@ def delete_market_vendor_product(
     "/markets/{market_id}/vendors/{vendor_id}/products/bulk",
     response_model=list[ProductOut],
 )
-def bulk_create_products(
+async def bulk_create_products(
     market_id: UUID,
     vendor_id: UUID,
     payload: ProductBulkCreate,
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("products.bulk_create")),
 ):
-    products = create_products_for_vendor_bulk(
+    products = await create_products_for_vendor_bulk(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -224,7 +237,7 @@ def bulk_create_products(
     "/markets/{market_id}/vendors/{vendor_id}/products/{product_id}/inventory",
     response_model=ProductOut,
 )
-def update_inventory(
+async def update_inventory(
     market_id: UUID,
     vendor_id: UUID,
     product_id: UUID,
@@ -235,7 +248,7 @@ def update_inventory(
     updates = payload.model_dump(exclude_unset=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No inventory changes")
-    product = update_product_inventory(
+    product = await update_product_inventory(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
@@ -251,7 +264,7 @@ def update_inventory(
     "/markets/{market_id}/vendors/{vendor_id}/products/{product_id}/inventory-events",
     response_model=list[InventoryEventOut],
 )
-def get_inventory_events(
+async def get_inventory_events(
     market_id: UUID,
     vendor_id: UUID,
     product_id: UUID,
@@ -259,7 +272,7 @@ def get_inventory_events(
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("products.read")),
 ):
-    return list_inventory_events(
+    return await list_inventory_events(
         jwt=jwt,
         market_id=str(market_id),
         vendor_id=str(vendor_id),
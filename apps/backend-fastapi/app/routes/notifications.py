@@ -1,7 +1,7 @@
 # routes/notifications.py
 # has been audited for permissions and dependencies, and implements the following endpoints:
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import List
 
 from app.schemas.notifications import (
@@ -18,7 +18,10 @@ from app.repositories.notifications import (
     mark_all_notifications_read,
     get_unread_count
 )
-from app.core.dependencies import require_permissions
+from app.repositories.resource_versions import get_resource_version, resource_key
+from app.conditional import conditional_get
+from app.core.dependencies import get_request_clients, require_permissions
+from app.db import RequestClients
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -26,40 +29,46 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 # List subscriptions
 # -----------------------------------------
 @router.get("/subscriptions", response_model=List[NotificationSubscriptionOut])
-def list_subscriptions(
-    current_user = Depends(require_permissions("notifications.read"))
+async def list_subscriptions(
+    current_user = Depends(require_permissions("notifications.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    return get_user_subscriptions(
+    return await get_user_subscriptions(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
+        client=clients.user,
     )
 
 # -----------------------------------------
 # Create subscription
 # -----------------------------------------
 @router.post("/subscriptions", response_model=NotificationSubscriptionOut)
-def subscribe(
+async def subscribe(
     payload: NotificationSubscriptionIn,
-    current_user = Depends(require_permissions("notifications.create"))
+    current_user = Depends(require_permissions("notifications.create")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    return create_subscription(
+    return await create_subscription(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
         payload=payload.model_dump(),
+        client=clients.user,
     )
 
 # -----------------------------------------
 # Delete subscription
 # -----------------------------------------
 @router.delete("/subscriptions/{subscription_id}")
-def unsubscribe(
+async def unsubscribe(
     subscription_id: str,
-    current_user = Depends(require_permissions("notifications.delete"))
+    current_user = Depends(require_permissions("notifications.delete")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    delete_subscription(
+    await delete_subscription(
         jwt=current_user["_jwt"],
         subscription_id=subscription_id,
         user_id=current_user["sub"],
+        client=clients.user,
     )
     return {"ok": True}
 
@@ -67,37 +76,50 @@ def unsubscribe(
 # List notifications
 # -----------------------------------------
 @router.get("", response_model=List[NotificationOut])
-def list_notifications(
-    current_user = Depends(require_permissions("notifications.read"))
+async def list_notifications(
+    request: Request,
+    current_user = Depends(require_permissions("notifications.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    return get_user_notifications(
+    key = resource_key("notifications", "user", current_user["sub"])
+    version = await get_resource_version(key)
+    not_modified = conditional_get(request, key, version)
+    if not_modified is not None:
+        return not_modified
+
+    return await get_user_notifications(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
+        client=clients.user,
     )
 
 # -----------------------------------------
 # Mark notification as read
 # -----------------------------------------
 @router.patch("/{notification_id}/read")
-def mark_read(
+async def mark_read(
     notification_id: str,
-    current_user = Depends(require_permissions("notifications.update"))
+    current_user = Depends(require_permissions("notifications.update")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    mark_notification_read(
+    await mark_notification_read(
         jwt=current_user["_jwt"],
         notification_id=notification_id,
         user_id=current_user["sub"],
+        client=clients.user,
     )
     return {"ok": True}
 
 
 @router.patch("/read-all")
-def mark_all_read(
-    current_user = Depends(require_permissions("notifications.update"))
+async def mark_all_read(
+    current_user = Depends(require_permissions("notifications.update")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
-    updated = mark_all_notifications_read(
+    updated = await mark_all_notifications_read(
         jwt=current_user["_jwt"],
         user_id=current_user["sub"],
+        client=clients.user,
     )
     return {"ok": True, "updated": updated}
 
@@ -105,12 +127,14 @@ def mark_all_read(
 # Unread notification count
 # -----------------------------------------
 @router.get("/unread-count")
-def unread_count(
-    current_user = Depends(require_permissions("notifications.read"))
+async def unread_count(
+    current_user = Depends(require_permissions("notifications.read")),
+    clients: RequestClients = Depends(get_request_clients),
 ):
     return {
-        "count": get_unread_count(
+        "count": await get_unread_count(
             jwt=current_user["_jwt"],
             user_id=current_user["sub"],
+            client=clients.user,
         )
     }
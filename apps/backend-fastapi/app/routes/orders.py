@@ -1,30 +1,51 @@
 # routes/orders.py
+from datetime import datetime
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Literal
 
+from app.conditional import conditional_get
 from app.core.dependencies import get_current_jwt, get_current_user, require_permissions
+from app.exports import EXPORT_MEDIA_TYPES, export_chunks
+from app.responses import trusted_response
 from app.schemas.orders import (
+    BulkOrderTransitionOut,
+    BulkOrderTransitionPayload,
     CreateOrderPayload,
     OrderOut,
     OrderConfirmOut,
     RefundPayload,
+    CursorPaginatedOrderEvents,
     CursorPaginatedOrders,
+    CursorPaginatedOrderSummaries,
 )
 from app.repositories.orders import (
     create_order,
     confirm_order,
     cancel_order,
+    cancel_orders_bulk,
+    confirm_orders_bulk,
     get_order_by_id,
+    get_order_timeline,
+    get_order_version,
     get_orders_for_admin_cursor,
     get_orders_for_user_cursor,
     get_orders_for_vendor_cursor,
+    iter_orders_for_export,
     refund_order,
     get_orders_summary,
 )
+from app.repositories.resource_versions import get_resource_version, resource_key
 
 router = APIRouter(tags=["orders"])
 
+# Order creation and refunds accept an optional Idempotency-Key header; a
+# retry with the same key gets the first response back
+# (see 202610170009_idempotency_keys.sql).
+IDEMPOTENCY_KEY_REUSED = "Idempotency key reused with a different request"
+IDEMPOTENCY_KEY_REUSED_DETAIL = "Idempotency-Key was already used with a different request"
+
 # ==========================================================
 # 🛒 CREATE ORDER
 # ==========================================================
@@ -32,32 +53,47 @@ router = APIRouter(tags=["orders"])
     "/markets/{market_id}/vendors/{vendor_id}/orders",
     response_model=OrderOut,
 )
-def create_order_endpoint(
+async def create_order_endpoint(
     market_id: UUID,
     vendor_id: UUID,
     payload: CreateOrderPayload,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.create")),
 ):
-    return create_order(
-        jwt=jwt,
-        market_id=str(market_id),
-        vendor_id=str(vendor_id),
-        customer_id=current_user["sub"],
-        items=[{"product_id": str(i.product_id), "quantity": i.quantity} for i in payload.items],
-    )
+    try:
+        return await create_order(
+            jwt=jwt,
+            market_id=str(market_id),
+            vendor_id=str(vendor_id),
+            customer_id=current_user["sub"],
+            items=[{"product_id": str(i.product_id), "quantity": i.quantity} for i in payload.items],
+            idempotency_key=idempotency_key,
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        if IDEMPOTENCY_KEY_REUSED in str(e):
+            raise HTTPException(status_code=422, detail=IDEMPOTENCY_KEY_REUSED_DETAIL)
+        raise
 
 # ==========================================================
 # 📦 LIST ORDERS (USER / VENDOR)
 # ==========================================================
-@router.get("/orders", response_model=CursorPaginatedOrders)
-def list_orders_endpoint(
+@router.get(
+    "/orders",
+    response_model=CursorPaginatedOrders | CursorPaginatedOrderSummaries,
+)
+async def list_orders_endpoint(
     scope: str = Query("user", enum=["user", "vendor", "admin"]),
     status: str | None = Query(None),
     sort: str = Query("newest", enum=["newest", "oldest", "highest"]),
     search: str | None = Query(None),
     cursor: str | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
+    view: str = Query("full", enum=["summary", "full"]),
     jwt: str = Depends(get_current_jwt),
     current_user=Depends(require_permissions(["orders.read"])),
 ):
@@ -68,12 +104,13 @@ def list_orders_endpoint(
             if current_user.get("app_role") != "admin":
                 raise HTTPException(status_code=403, detail="Admin access required")
 
-            result = get_orders_for_admin_cursor(
+            result = await get_orders_for_admin_cursor(
                 status=status,
                 sort=sort,
                 search=search,
                 cursor=cursor,
                 limit=limit,
+                view=view,
             )
         elif scope == "vendor":
             vendor_id = current_user["vendor_id"]
@@ -85,7 +122,7 @@ def list_orders_endpoint(
                     "next_cursor": None,
                 }
 
-            result = get_orders_for_vendor_cursor(
+            result = await get_orders_for_vendor_cursor(
                 jwt=jwt,
                 vendor_id=vendor_id,
                 status=status,
@@ -93,18 +130,21 @@ def list_orders_endpoint(
                 search=search,
                 cursor=cursor,
                 limit=limit,
+                view=view,
             )
         else:
-            result = get_orders_for_user_cursor(
+            result = await get_orders_for_user_cursor(
                 jwt=jwt,
                 user_id=user_id,
                 status=status,
                 sort=sort,
                 cursor=cursor,
                 limit=limit,
+                view=view,
             )
 
-        return result
+        model = CursorPaginatedOrderSummaries if view == "summary" else CursorPaginatedOrders
+        return trusted_response(model, result)
 
     except HTTPException:
         raise
@@ -116,34 +156,215 @@ def list_orders_endpoint(
 # 🔍 GET MY ORDERS
 # ==========================================================
 @router.get("/orders/me")
-def get_my_orders(
+async def get_my_orders(
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.read")),
 ):
-    return get_orders_for_user_cursor(jwt=jwt, user_id=current_user["sub"])
+    return await get_orders_for_user_cursor(jwt=jwt, user_id=current_user["sub"])
+
+# ==========================================================
+# 📊 ORDERS SUMMARY
+# (declared before /orders/{order_id} so "summary" isn't taken as an id)
+# ==========================================================
+@router.get("/orders/summary")
+async def orders_summary(
+    request: Request,
+    scope: Literal["user", "vendor"] = Query("user", enum=["user", "vendor"]),
+    current_user: dict = Depends(require_permissions("orders.read")),
+):
+    try:
+        user_id = current_user["sub"]
+        jwt = current_user["_jwt"]
+
+        if scope == "vendor":
+            vendor_id = current_user.get("vendor_id")
+
+            if not vendor_id:
+                return {
+                    "total_orders": 0,
+                    "pending": 0,
+                    "confirmed": 0,
+                    "canceled": 0,
+                    "total_revenue": 0,
+                }
+
+            key = resource_key("orders", "vendor", vendor_id)
+        else:
+            key = resource_key("orders", "user", user_id)
+
+        version = await get_resource_version(key)
+        not_modified = conditional_get(request, key, version)
+        if not_modified is not None:
+            return not_modified
+
+        if scope == "vendor":
+            return await get_orders_summary(
+                jwt=jwt,
+                vendor_id=vendor_id,
+            )
+
+        return await get_orders_summary(
+            jwt=jwt,
+            user_id=user_id,
+        )
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to load summary")
+
+# ==========================================================
+# 📤 EXPORT ORDERS (VENDOR / ADMIN)
+# (declared before /orders/{order_id} so "export" isn't taken as an id)
+# ==========================================================
+@router.get("/orders/export")
+async def export_orders_endpoint(
+    scope: str = Query("vendor", enum=["vendor", "admin"]),
+    format: str = Query("csv", enum=["csv", "ndjson"]),
+    status: str | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
+    jwt: str = Depends(get_current_jwt),
+    current_user=Depends(require_permissions(["orders.vendor_read"])),
+):
+    """
+    Streams every matching order (items and refunds included), oldest
+    first. `created_from` is inclusive, `created_to` exclusive.
+    """
+    filters = {
+        "status": status,
+        "created_from": created_from.isoformat() if created_from else None,
+        "created_to": created_to.isoformat() if created_to else None,
+    }
+
+    if scope == "admin":
+        if current_user.get("app_role") != "admin":
+            raise HTTPException(status_code=403, detail="Admin access required")
+
+        batches = iter_orders_for_export(None, **filters)
+    else:
+        vendor_id = current_user.get("vendor_id")
+
+        if not vendor_id:
+            raise HTTPException(403, "Vendor account required")
+
+        batches = iter_orders_for_export(jwt, vendor_id=vendor_id, **filters)
+
+    return StreamingResponse(
+        export_chunks(format, batches),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
+    )
 
 # ==========================================================
 # 🔍 GET ORDER DETAILS
 # ==========================================================
 @router.get("/orders/{order_id}", response_model=OrderOut)
-def get_order(
+async def get_order(
+    request: Request,
     order_id: UUID,
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.read")),
 ):
-    return get_order_by_id(
+    lookup = {
+        "jwt": jwt,
+        "order_id": str(order_id),
+        "user_id": current_user["sub"],
+        "vendor_id": current_user.get("vendor_id"),
+        "is_admin": current_user.get("app_role") == "admin",
+    }
+
+    # The body depends on the caller's permissions, so the ETag does too.
+    viewer = f"{current_user['sub']}:{current_user.get('app_role')}"
+
+    version = await get_order_version(**lookup)
+    not_modified = conditional_get(request, f"order:{order_id}", version, viewer)
+    if not_modified is not None:
+        return not_modified
+
+    return await get_order_by_id(**lookup)
+
+# ==========================================================
+# 🕒 ORDER TIMELINE (older events, newest first)
+# ==========================================================
+@router.get("/orders/{order_id}/events", response_model=CursorPaginatedOrderEvents)
+async def order_timeline(
+    order_id: UUID,
+    cursor: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    jwt: str = Depends(get_current_jwt),
+    current_user = Depends(require_permissions("orders.read")),
+):
+    return await get_order_timeline(
         jwt=jwt,
         order_id=str(order_id),
         user_id=current_user["sub"],
         vendor_id=current_user.get("vendor_id"),
         is_admin=current_user.get("app_role") == "admin",
+        cursor=cursor,
+        limit=limit,
     )
 
+# ==========================================================
+# 📦 BULK CONFIRM / CANCEL (VENDOR)
+# (declared before /orders/{order_id}/... so "bulk" isn't taken as an id)
+# ==========================================================
+@router.post("/orders/bulk/confirm", response_model=BulkOrderTransitionOut)
+async def bulk_confirm_orders_endpoint(
+    payload: BulkOrderTransitionPayload,
+    jwt: str = Depends(get_current_jwt),
+    current_user = Depends(require_permissions("orders.confirm")),
+):
+    vendor_id = current_user.get("vendor_id")
+
+    if not vendor_id:
+        raise HTTPException(403, "Vendor account required")
+
+    try:
+        results = await confirm_orders_bulk(
+            jwt=jwt,
+            order_ids=[str(order_id) for order_id in payload.order_ids],
+            vendor_id=vendor_id,
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to confirm orders")
+
+    return {"results": results}
+
+
+@router.post("/orders/bulk/cancel", response_model=BulkOrderTransitionOut)
+async def bulk_cancel_orders_endpoint(
+    payload: BulkOrderTransitionPayload,
+    jwt: str = Depends(get_current_jwt),
+    current_user = Depends(require_permissions("orders.cancel")),
+):
+    vendor_id = current_user.get("vendor_id")
+
+    if not vendor_id:
+        raise HTTPException(403, "Vendor account required")
+
+    try:
+        results = await cancel_orders_bulk(
+            jwt=jwt,
+            order_ids=[str(order_id) for order_id in payload.order_ids],
+            vendor_id=vendor_id,
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to cancel orders")
+
+    return {"results": results}
+
 # ==========================================================
 # ✅ CONFIRM ORDER (VENDOR)
 # ==========================================================
 @router.post("/orders/{order_id}/confirm", response_model=OrderConfirmOut)
-def confirm_order_endpoint(
+async def confirm_order_endpoint(
     order_id: str,
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.confirm")),
@@ -155,7 +376,7 @@ def confirm_order_endpoint(
 
 
     try:
-        return confirm_order(jwt=jwt, order_id=order_id, vendor_id=vendor_id)
+        return await confirm_order(jwt=jwt, order_id=order_id, vendor_id=vendor_id)
 
     except HTTPException:
         raise
@@ -170,7 +391,7 @@ def confirm_order_endpoint(
 # ❌ CANCEL ORDER
 # ==========================================================
 @router.post("/orders/{order_id}/cancel", response_model=OrderOut)
-def cancel_order_endpoint(
+async def cancel_order_endpoint(
     order_id: str,
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.cancel")),
@@ -181,7 +402,7 @@ def cancel_order_endpoint(
         raise HTTPException(403, "Vendor account required")
 
     try:
-        return cancel_order(jwt=jwt, order_id=order_id, vendor_id=vendor_id)
+        return await cancel_order(jwt=jwt, order_id=order_id, vendor_id=vendor_id)
 
     except HTTPException:
         raise
@@ -196,9 +417,10 @@ def cancel_order_endpoint(
 # 💰 REFUND ORDER
 # ==========================================================
 @router.post("/orders/{order_id}/refund", response_model=OrderOut)
-def refund_order_route(
+async def refund_order_route(
     order_id: UUID,
     payload: RefundPayload,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
     jwt: str = Depends(get_current_jwt),
     current_user = Depends(require_permissions("orders.refund")),
 ):
@@ -208,12 +430,13 @@ def refund_order_route(
         raise HTTPException(403, "Vendor account required")
 
     try:
-        return refund_order(
+        return await refund_order(
             jwt=jwt,
             order_id=str(order_id),
             amount=payload.amount,
             reason=payload.reason,
             vendor_id=vendor_id,
+            idempotency_key=idempotency_key,
         )
 
     except HTTPException:
@@ -221,43 +444,10 @@ def refund_order_route(
 
     except Exception as e:
         msg = str(e)
+        if IDEMPOTENCY_KEY_REUSED in msg:
+            raise HTTPException(status_code=422, detail=IDEMPOTENCY_KEY_REUSED_DETAIL)
         if "Invalid order status transition" in msg:
             raise HTTPException(status_code=409, detail="Order cannot be refunded in its current state")
         if "Refund exceeds order total" in msg:
             raise HTTPException(status_code=409, detail="Refund exceeds remaining refundable amount")
         raise HTTPException(status_code=500, detail="Failed to refund order")
-
-
-@router.get("/orders/summary")
-def orders_summary(
-    scope: Literal["user", "vendor"] = Query("user", enum=["user", "vendor"]),
-    current_user: dict = Depends(require_permissions("orders.read")),
-):
-    try:
-        user_id = current_user["sub"]
-        jwt = current_user["_jwt"]
-
-        if scope == "vendor":
-            vendor_id = current_user.get("vendor_id")
-
-            if not vendor_id:
-                return {
-                    "total_orders": 0,
-                    "pending": 0,
-                    "confirmed": 0,
-                    "canceled": 0,
-                    "total_revenue": 0,
-                }
-
-            return get_orders_summary(
-                jwt=jwt,
-                vendor_id=vendor_id,
-            )
-
-        return get_orders_summary(
-            jwt=jwt,
-            user_id=user_id,
-        )
-
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to load summary")
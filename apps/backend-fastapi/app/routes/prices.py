@@ -20,25 +20,25 @@ router = APIRouter(prefix="/prices", tags=["Prices"])
 # Get active locked price agreements
 # -----------------------------------------
 @router.get("/active", response_model=List[ActivePriceAgreementOut])
-def read_active_prices():
-    return get_active_price_agreements()
+async def read_active_prices():
+    return await get_active_price_agreements()
 
 # -----------------------------------------
 # Admin: list all price agreements
 # -----------------------------------------
 @router.get("/admin", response_model=List[ActivePriceAgreementOut])
-def list_admin_prices(
+async def list_admin_prices(
     jwt: str = Depends(get_current_jwt),
     _=Depends(require_permissions("prices.read")),
 ):
-    return get_admin_price_agreements(jwt)
+    return await get_admin_price_agreements(jwt)
 
 # -----------------------------------------
 # Admin: lock price agreement
 # -----------------------------------------
 @router.post("/{price_id}/lock")
-def lock_price(price_id: str, jwt: str = Depends(get_current_jwt), _=Depends(require_permissions("prices.lock"))):
-    return lock_price_agreement(price_id, jwt)
+async def lock_price(price_id: str, jwt: str = Depends(get_current_jwt), _=Depends(require_permissions("prices.lock"))):
+    return await lock_price_agreement(price_id, jwt)
 
 # -----------------------------------------
 # Vendor: submit price signal
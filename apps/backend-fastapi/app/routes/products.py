@@ -25,21 +25,21 @@ router = APIRouter(prefix="/products", tags=["Products"])
 # List products
 # -----------------------------------------
 @router.get("", response_model=List[ProductOut])
-def get_products(
+async def get_products(
     current_user = Depends(require_permissions("products.read"))
 ):
-    return list_products(current_user["_jwt"])
+    return await list_products(current_user["_jwt"])
 
 
 # -----------------------------------------
 # Get single product
 # -----------------------------------------
 @router.get("/{product_id}", response_model=ProductOut)
-def get_product(
+async def get_product(
     product_id: UUID,
     current_user = Depends(require_permissions("products.read"))
 ):
-    product = get_product_by_id(current_user["_jwt"], str(product_id))
+    product = await get_product_by_id(current_user["_jwt"], str(product_id))
 
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -51,18 +51,18 @@ def get_product(
 # Create product
 # -----------------------------------------
 @router.post("", response_model=ProductOut)
-def create_product_route(
+async def create_product_route(
     payload: ProductCreate,
     current_user = Depends(require_permissions("products.create"))
 ):
-    return create_product(current_user["_jwt"], payload.model_dump())
+    return await create_product(current_user["_jwt"], payload.model_dump())
 
 
 # -----------------------------------------
 # Update product
 # -----------------------------------------
 @router.patch("/{product_id}", response_model=ProductOut)
-def patch_product(
+async def patch_product(
     product_id: UUID,
     payload: ProductUpdate,
     current_user = Depends(require_permissions("products.update"))
@@ -72,7 +72,7 @@ def patch_product(
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    product = update_product(current_user["_jwt"], str(product_id), updates)
+    product = await update_product(current_user["_jwt"], str(product_id), updates)
 
     if not product:
         raise HTTPException(status_code=404, detail="Product not found or not allowed")
@@ -84,11 +84,11 @@ def patch_product(
 # Delete product
 # -----------------------------------------
 @router.delete("/{product_id}", status_code=204)
-def delete_product_route(
+async def delete_product_route(
     product_id: UUID,
     current_user = Depends(require_permissions("products.delete"))
 ):
-    deleted = delete_product(current_user["_jwt"], str(product_id))
+    deleted = await delete_product(current_user["_jwt"], str(product_id))
 
     if not deleted:
         raise HTTPException(status_code=404, detail="Product not found or not allowed")
@@ -22,21 +22,21 @@ router = APIRouter(prefix="/vendors", tags=["Vendors"])
 # List vendors
 # -----------------------------
 @router.get("", response_model=List[VendorOut])
-def list_vendors(
+async def list_vendors(
     current_user=Depends(require_permissions("vendors.read"))
 ):
-    return get_vendors(current_user["_jwt"])
+    return await get_vendors(current_user["_jwt"])
 
 
 # -----------------------------
 # Create vendor
 # -----------------------------
 @router.post("", response_model=VendorOut)
-def create_vendor_route(
+async def create_vendor_route(
     payload: VendorCreate,
     current_user=Depends(require_permissions("vendors.create"))
 ):
-    vendor = create_vendor(current_user["_jwt"], payload.model_dump())
+    vendor = await create_vendor(current_user["_jwt"], payload.model_dump())
 
     if not vendor:
         raise HTTPException(status_code=403, detail="Not allowed to create vendor")
@@ -48,7 +48,7 @@ def create_vendor_route(
 # Update vendor
 # -----------------------------
 @router.patch("/{vendor_id}", response_model=VendorOut)
-def patch_vendor(
+async def patch_vendor(
     vendor_id: UUID,
     payload: VendorUpdate,
     current_user=Depends(require_permissions("vendors.update"))
@@ -57,7 +57,7 @@ def patch_vendor(
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    vendor = update_vendor(current_user["_jwt"], vendor_id, updates)
+    vendor = await update_vendor(current_user["_jwt"], vendor_id, updates)
 
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found or not allowed")
@@ -69,11 +69,11 @@ def patch_vendor(
 # Delete vendor
 # -----------------------------
 @router.delete("/{vendor_id}", status_code=204)
-def delete_vendor_route(
+async def delete_vendor_route(
     vendor_id: UUID,
     current_user=Depends(require_permissions("vendors.delete"))
 ):
-    deleted = delete_vendor(current_user["_jwt"], vendor_id)
+    deleted = await delete_vendor(current_user["_jwt"], vendor_id)
 
     if not deleted:
         raise HTTPException(status_code=404, detail="Vendor not found or not allowed")
@@ -83,7 +83,7 @@ def delete_vendor_route(
 # Get my vendor
 # -----------------------------
 @router.get("/me")
-def get_my_vendor(current_user=Depends(get_current_user)):
+async def get_my_vendor(current_user=Depends(get_current_user)):
     jwt = current_user["_jwt"]
     user_id = current_user["id"]
 
@@ -102,11 +102,11 @@ def get_my_vendor(current_user=Depends(get_current_user)):
 # Get single vendor
 # -----------------------------
 @router.get("/{vendor_id}", response_model=VendorOut)
-def read_vendor(
+async def read_vendor(
     vendor_id: UUID,
     current_user=Depends(require_permissions("vendors.read"))
 ):
-    vendor = get_vendor(vendor_id, current_user["_jwt"])
+    vendor = await get_vendor(vendor_id, current_user["_jwt"])
 
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import List
+from typing import List, Literal
 from datetime import datetime
 
 
@@ -70,6 +70,9 @@ class OrderOut(BaseModel):
     items: List[OrderItemOut]
     refunds: List[RefundOut]
     events: List[OrderEventOut]
+    # Set on GET /orders/{id} when older events exist; pass it to
+    # GET /orders/{id}/events.
+    events_next_cursor: str | None = None
 
     class Config:
         from_attributes = True
@@ -94,6 +97,50 @@ class RefundPayload(BaseModel):
     reason: str | None = None
 
 
+# -------------------------
+# Bulk transitions
+# -------------------------
+
+MAX_BULK_ORDER_IDS = 100
+
+
+class BulkOrderTransitionPayload(BaseModel):
+    order_ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BULK_ORDER_IDS)
+
+
+class BulkOrderTransitionResult(BaseModel):
+    order_id: UUID
+    result: Literal["ok", "invalid_transition", "not_found"]
+
+
+class BulkOrderTransitionOut(BaseModel):
+    results: List[BulkOrderTransitionResult]
+
+
+class CursorPaginatedOrderEvents(BaseModel):
+    data: List[OrderEventOut]
+    next_cursor: str | None
+
+
 class CursorPaginatedOrders(BaseModel):
     data: List[OrderOut]
     next_cursor: str | None
+
+
+class OrderSummaryOut(BaseModel):
+    id: UUID
+    market_id: UUID
+    vendor_id: UUID
+    user_id: UUID
+    status: str
+    created_at: datetime
+
+    total: float
+    refunded_total: float
+    item_count: int
+    first_item_name: str | None
+
+
+class CursorPaginatedOrderSummaries(BaseModel):
+    data: List[OrderSummaryOut]
+    next_cursor: str | None
@@ -78,6 +78,11 @@ class ProductBulkUpdate(BaseModel):
     products: NonEmptyProductUpdateList
 
 
+class ProductBulkUpdateResult(BaseModel):
+    updated: List[ProductOut]
+    rejected: List[UUID]
+
+
 class ProductBulkInventoryItem(BaseModel):
     id: UUID
     stock_quantity: Optional[int] = Field(None, ge=0)
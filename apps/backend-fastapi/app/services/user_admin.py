@@ -1,4 +1,5 @@
 from app.db import get_service_client
+from app.metrics import instrument_repository
 
 SORTABLE_USER_FIELDS = {
     "email",
@@ -84,6 +85,7 @@ def _matches_user_filters(
     return True
 
 
+@instrument_repository
 def list_users(
     search: str | None = None,
     role: str | None = None,
@@ -138,8 +140,9 @@ def list_users(
     }
 
 
-def get_user(user_id: str):
-    supabase = get_service_client()
+@instrument_repository
+def get_user(user_id: str, supabase=None):
+    supabase = supabase or get_service_client()
     response = supabase.auth.admin.get_user_by_id(user_id)
     user = _extract_get_user_response(response)
 
@@ -149,6 +152,7 @@ def get_user(user_id: str):
     return _normalize_user(user)
 
 
+@instrument_repository
 def update_user_role(user_id: str, new_role: str):
     """
     Updates role inside Supabase auth app_metadata.
@@ -156,7 +160,7 @@ def update_user_role(user_id: str, new_role: str):
     """
 
     supabase = get_service_client()
-    existing_user = get_user(user_id)
+    existing_user = get_user(user_id, supabase=supabase)
     if not existing_user:
         return None
 
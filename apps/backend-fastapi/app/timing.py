@@ -0,0 +1,149 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+
+# Keeps the Server-Timing header bounded on chatty requests.
+MAX_SERVER_TIMING_UPSTREAMS = 20
+
+
+@dataclass
+class UpstreamTiming:
+    name: str
+    duration_ms: float
+    rows: int | None = None
+    bytes: int | None = None
+
+
+@dataclass
+class RequestTimings:
+    """
+    Per-request timing breakdown: named phases (auth, normalize,
+    serialize) plus one entry per upstream call.
+    """
+
+    calls: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+    upstream: list[UpstreamTiming] = field(default_factory=list)
+
+    def add_phase(self, name: str, duration_ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings",
+    default=None,
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Called once per request by the request middleware. Work done while
+    handling the request, including in threadpool workers, is recorded
+    on the returned object.
+    """
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def get_request_timings() -> RequestTimings | None:
+    return _request_timings.get()
+
+
+@contextmanager
+def timed(phase: str):
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_phase(phase, (time.perf_counter() - started_at) * 1000)
+
+
+def count_upstream_call() -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.calls += 1
+
+
+def record_upstream(
+    name: str,
+    duration_ms: float,
+    *,
+    rows: int | None = None,
+    size: int | None = None,
+) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.upstream.append(UpstreamTiming(name, duration_ms, rows, size))
+
+
+def upstream_name(path: str) -> str:
+    """
+    /rest/v1/orders -> orders, /rest/v1/rpc/confirm_order -> rpc.confirm_order
+    """
+    if "/rest/v1/rpc/" in path:
+        return "rpc." + path.rsplit("/rest/v1/rpc/", 1)[1].strip("/")
+    if "/rest/v1/" in path:
+        return path.rsplit("/rest/v1/", 1)[1].strip("/") or "rest"
+    if "/auth/v1/" in path:
+        return "auth"
+    return "other"
+
+
+def content_range_rows(value: str | None) -> int | None:
+    """
+    Row count from a PostgREST Content-Range header ("0-19/*", "*/0").
+    """
+    if not value:
+        return None
+
+    span = value.split("/", 1)[0]
+    if span == "*":
+        return 0
+
+    start, _, end = span.partition("-")
+    try:
+        return int(end) - int(start) + 1
+    except ValueError:
+        return None
+
+
+def _upstream_desc(entry: UpstreamTiming) -> str:
+    parts = [entry.name]
+    if entry.rows is not None:
+        parts.append(f"rows={entry.rows}")
+    if entry.bytes is not None:
+        parts.append(f"bytes={entry.bytes}")
+    return " ".join(parts)
+
+
+def server_timing_header(timings: RequestTimings, total_ms: float) -> str:
+    entries = [
+        f"{name};dur={duration:.2f}"
+        for name, duration in timings.phases.items()
+    ]
+
+    for index, entry in enumerate(timings.upstream[:MAX_SERVER_TIMING_UPSTREAMS]):
+        entries.append(
+            f'db{index};dur={entry.duration_ms:.2f};desc="{_upstream_desc(entry)}"'
+        )
+
+    entries.append(f"total;dur={total_ms:.2f}")
+    return ", ".join(entries)
+
+
+def timings_log_value(timings: RequestTimings) -> str:
+    parts = [f"{name}:{duration:.2f}" for name, duration in timings.phases.items()]
+    parts.extend(
+        f"{entry.name}:{entry.duration_ms:.2f}"
+        f"(rows={entry.rows},bytes={entry.bytes})"
+        for entry in timings.upstream
+    )
+    return ",".join(parts) or "-"
@@ -1,11 +1,20 @@
 from contextlib import asynccontextmanager
+import hmac
+import logging
 import time
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.conditional import apply_etag
 from app.config import settings, settings_errors
-from app.logging import configure_logging
+from app.core.jwks import jwks_manager
+from app.db import aclose_http_client, close_http_client
+from app.logging import configure_logging, log_event, should_log_request, shutdown_logging
+from app.metrics import render_metrics, request_duration, requests_in_flight, route_label
+from app.pg import close_pg_pool, open_pg_pool
+from app.responses import TimedJSONResponse
+from app.timing import server_timing_header, start_request_timings, timings_log_value
 from app.routes import ( markets,
                         market_subscriptions,
                         vendors, 
@@ -29,9 +38,20 @@ async def lifespan(_: FastAPI):
             "startup_config_invalid errors=%s",
             settings_errors,
         )
+    await jwks_manager.start()
+    await open_pg_pool()
     yield
-
-app = FastAPI(title="Mojara API", lifespan=lifespan)
+    await jwks_manager.stop()
+    await close_pg_pool()
+    close_http_client()
+    await aclose_http_client()
+    shutdown_logging()
+
+app = FastAPI(
+    title="Mojara API",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -46,33 +66,82 @@ app.add_middleware(
 async def request_context_middleware(request: Request, call_next):
     request_id = request.headers.get("x-request-id") or str(uuid4())
     request.state.request_id = request_id
+    timings = start_request_timings()
+    in_flight = requests_in_flight.labels(request.method)
+    in_flight.inc()
     started_at = time.perf_counter()
 
     try:
         response = await call_next(request)
     except Exception:
-        duration_ms = round((time.perf_counter() - started_at) * 1000, 2)
-        logger.exception(
-            "request_failed method=%s path=%s request_id=%s duration_ms=%s",
-            request.method,
-            request.url.path,
-            request_id,
-            duration_ms,
+        elapsed = time.perf_counter() - started_at
+        in_flight.dec()
+        request_duration.labels(route_label(request.scope), request.method, "500").observe(elapsed)
+        duration_ms = round(elapsed * 1000, 2)
+        log_event(
+            logger,
+            logging.ERROR,
+            "request_failed",
+            exc_info=True,
+            method=request.method,
+            path=request.url.path,
+            request_id=request_id,
+            duration_ms=duration_ms,
+            upstream_calls=timings.calls,
+            timings=timings_log_value(timings),
         )
         raise
 
-    duration_ms = round((time.perf_counter() - started_at) * 1000, 2)
-    response.headers["X-Request-ID"] = request_id
-    logger.info(
-        "request_complete method=%s path=%s status=%s request_id=%s duration_ms=%s",
+    elapsed = time.perf_counter() - started_at
+    in_flight.dec()
+    request_duration.labels(
+        route_label(request.scope),
         request.method,
-        request.url.path,
-        response.status_code,
-        request_id,
-        duration_ms,
-    )
+        str(response.status_code),
+    ).observe(elapsed)
+
+    duration_ms = round(elapsed * 1000, 2)
+    response.headers["X-Request-ID"] = request_id
+    response.headers["X-Upstream-Calls"] = str(timings.calls)
+    response.headers["Server-Timing"] = server_timing_header(timings, elapsed * 1000)
+    apply_etag(request, response)
+    if should_log_request(response.status_code, duration_ms):
+        log_event(
+            logger,
+            logging.INFO,
+            "request_complete",
+            method=request.method,
+            path=request.url.path,
+            status=response.status_code,
+            request_id=request_id,
+            duration_ms=duration_ms,
+            upstream_calls=timings.calls,
+            timings=timings_log_value(timings),
+        )
     return response
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    # Per-route latency and order counters are internal: scrapers send
+    # METRICS_TOKEN as a bearer token, and without one the route is off.
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(),
+        settings.metrics_token.encode(),
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
 @app.get("/health")
 def health():
     return {
@@ -1,4 +1,7 @@
+import json
 import unittest
+from asyncio import run
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from app.routes.admin_prices import explain_admin_prices, list_admin_prices
@@ -9,15 +12,24 @@ class AdminPricesRoutesTest(unittest.TestCase):
     def test_list_admin_prices_passes_filters(self, mock_get_admin_price_agreements):
         mock_get_admin_price_agreements.return_value = []
 
-        result = list_admin_prices(status="draft", market_id="market-1", jwt="jwt-token")
+        result = run(list_admin_prices(status="draft", market_id="market-1", jwt="jwt-token"))
 
-        self.assertEqual(result, [])
+        self.assertEqual(json.loads(result.body), [])
         mock_get_admin_price_agreements.assert_called_once_with(
             "jwt-token",
             status="draft",
             market_id="market-1",
         )
 
+    @patch("app.routes.admin_prices.get_admin_price_agreements")
+    def test_list_admin_prices_respects_fast_json_flag(self, mock_get_admin_price_agreements):
+        mock_get_admin_price_agreements.return_value = [{"id": "price-1"}]
+
+        with patch("app.responses.settings", SimpleNamespace(fast_json_responses=False)):
+            result = run(list_admin_prices(status=None, market_id=None, jwt="jwt-token"))
+
+        self.assertEqual(result, [{"id": "price-1"}])
+
     @patch("app.routes.admin_prices.get_price_explain")
     def test_explain_admin_prices_passes_market_id(self, mock_get_price_explain):
         mock_get_price_explain.return_value = [{"market_id": "market-1", "size_band": "Small"}]
@@ -0,0 +1,124 @@
+import unittest
+from asyncio import run
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import HTTPException
+from postgrest import APIError
+
+from app.repositories.dashboard import get_admin_overview
+from app.repositories.market_subscriptions import create_market_subscription
+from app.repositories.notifications import get_unread_count
+from app.repositories.orders import get_order_by_id, get_orders_for_user_cursor
+
+
+def _chain_query(result):
+    query = Mock()
+    for method in ("select", "eq", "is_", "limit", "order", "or_", "lt", "gt", "ilike"):
+        getattr(query, method).return_value = query
+    query.execute = AsyncMock(return_value=result)
+    return query
+
+
+class AsyncRepositoriesTest(unittest.TestCase):
+    @patch("app.repositories.orders.get_async_user_client")
+    def test_get_order_by_id_async_returns_404_when_missing(self, mock_client):
+        query = _chain_query(Mock(data=[]))
+        client = Mock()
+        client.table.return_value = query
+        mock_client.return_value = client
+
+        with self.assertRaises(HTTPException) as ctx:
+            run(
+                get_order_by_id(
+                    jwt="token",
+                    order_id="missing-order",
+                    user_id="user-1",
+                    vendor_id=None,
+                )
+            )
+
+        self.assertEqual(ctx.exception.status_code, 404)
+        mock_client.assert_called_once_with("token")
+
+    @patch("app.repositories.orders.get_async_user_client")
+    def test_get_orders_for_user_cursor_async_normalizes_page(self, mock_client):
+        rows = [
+            {
+                "id": f"order-{index}",
+                "created_at": f"2026-03-2{index}T00:00:00Z",
+                "order_items": [
+                    {
+                        "product_id": "product-1",
+                        "quantity": 2,
+                        "unit_price": 3.0,
+                        "product_name": "Tilapia",
+                    }
+                ],
+            }
+            for index in range(3)
+        ]
+        query = _chain_query(Mock(data=rows))
+        client = Mock()
+        client.table.return_value = query
+        mock_client.return_value = client
+
+        result = run(get_orders_for_user_cursor("token", "user-1", limit=2))
+
+        self.assertEqual(len(result["data"]), 2)
+        self.assertIsNotNone(result["next_cursor"])
+        self.assertEqual(result["data"][0]["items"][0]["line_total"], 6.0)
+
+    @patch("app.repositories.notifications.get_async_user_client")
+    def test_get_unread_count_async_returns_exact_count(self, mock_client):
+        query = _chain_query(Mock(count=7))
+        client = Mock()
+        client.table.return_value = query
+        mock_client.return_value = client
+
+        self.assertEqual(run(get_unread_count("token", "user-1")), 7)
+
+    @patch("app.repositories.market_subscriptions.get_async_user_client")
+    def test_create_market_subscription_async_returns_existing_row(self, mock_client):
+        insert_query = Mock()
+        insert_query.execute = AsyncMock(
+            side_effect=APIError({"message": "duplicate key value", "code": "23505"})
+        )
+        existing_query = _chain_query(Mock(data=[{"market_id": "market-1"}]))
+
+        table = Mock()
+        table.insert.return_value = insert_query
+        table.select.return_value = existing_query
+
+        client = Mock()
+        client.table.return_value = table
+        mock_client.return_value = client
+
+        result = run(create_market_subscription("token", "user-1", "market-1"))
+
+        self.assertEqual(result["market_id"], "market-1")
+
+    @patch("app.repositories.dashboard.get_async_service_client")
+    def test_admin_overview_async_runs_every_count(self, mock_client):
+        query = _chain_query(Mock(count=3))
+        query.gte.return_value = query
+        client = Mock()
+        client.table.return_value = query
+        mock_client.return_value = client
+
+        result = run(get_admin_overview())
+
+        self.assertEqual(
+            result,
+            {
+                "total_orders_7d": 3,
+                "orders_today": 3,
+                "active_vendors": 3,
+                "active_price_agreements": 3,
+                "pending_orders": 3,
+            },
+        )
+        self.assertEqual(query.execute.await_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
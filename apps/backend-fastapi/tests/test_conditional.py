@@ -0,0 +1,114 @@
+import unittest
+from asyncio import run
+from unittest.mock import AsyncMock, patch
+
+from fastapi import Request, Response
+
+from app.conditional import apply_etag, conditional_get, etag_matches, make_etag
+from app.routes.notifications import list_notifications
+
+
+def build_request(path: str = "/orders/summary", query: bytes = b"", etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request(
+        {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query,
+            "headers": headers,
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+            "root_path": "",
+        }
+    )
+
+
+class ConditionalTest(unittest.TestCase):
+    def test_etag_changes_with_version_and_query(self):
+        first = make_etag("orders:vendor:v1", 1, "/orders/summary?scope=vendor")
+
+        self.assertEqual(first, make_etag("orders:vendor:v1", 1, "/orders/summary?scope=vendor"))
+        self.assertNotEqual(first, make_etag("orders:vendor:v1", 2, "/orders/summary?scope=vendor"))
+        self.assertNotEqual(first, make_etag("orders:vendor:v1", 1, "/orders/summary?scope=user"))
+        self.assertTrue(first.startswith('W/"'))
+
+    def test_if_none_match_uses_weak_comparison(self):
+        etag = 'W/"abc"'
+
+        self.assertTrue(etag_matches('"abc"', etag))
+        self.assertTrue(etag_matches('W/"zzz", W/"abc"', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('W/"zzz"', etag))
+        self.assertFalse(etag_matches(None, etag))
+
+    def test_returns_304_when_client_copy_is_current(self):
+        etag = make_etag("orders:user:u1", 4, "/orders/summary?")
+
+        response = conditional_get(build_request(etag=etag), "orders:user:u1", 4)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.body, b"")
+
+    def test_stale_copy_continues_and_etag_is_added_to_200(self):
+        stale = make_etag("orders:user:u1", 3, "/orders/summary?")
+        request = build_request(etag=stale)
+
+        self.assertIsNone(conditional_get(request, "orders:user:u1", 4))
+
+        response = Response(status_code=200)
+        apply_etag(request, response)
+        self.assertEqual(response.headers["ETag"], make_etag("orders:user:u1", 4, "/orders/summary?"))
+        self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
+        self.assertEqual(response.headers["Vary"], "Authorization")
+
+    def test_vary_keeps_existing_values(self):
+        request = build_request()
+        conditional_get(request, "orders:user:u1", 4)
+
+        response = Response(status_code=200, headers={"Vary": "Origin"})
+        apply_etag(request, response)
+
+        self.assertEqual(response.headers["Vary"], "Origin, Authorization")
+
+    def test_viewer_is_part_of_the_etag(self):
+        first = build_request(path="/orders/o1")
+        second = build_request(path="/orders/o1")
+
+        conditional_get(first, "order:o1", 4, "user-1:user")
+        conditional_get(second, "order:o1", 4, "vendor-1:vendor")
+
+        self.assertNotEqual(first.state.etag, second.state.etag)
+
+    def test_missing_version_skips_check(self):
+        request = build_request(etag="*")
+
+        self.assertIsNone(conditional_get(request, "order:o1", None))
+
+        response = Response(status_code=200)
+        apply_etag(request, response)
+        self.assertNotIn("ETag", response.headers)
+
+    @patch("app.routes.notifications.get_user_notifications")
+    @patch("app.routes.notifications.get_resource_version", new_callable=AsyncMock)
+    def test_route_answers_304_without_loading_notifications(self, mock_version, mock_list):
+        mock_version.return_value = 7
+        etag = make_etag("notifications:user:user-1", 7, "/notifications?")
+
+        response = run(list_notifications(
+            request=build_request(path="/notifications", etag=etag),
+            current_user={"sub": "user-1", "_jwt": "token"},
+            clients=None,
+        ))
+
+        self.assertEqual(response.status_code, 304)
+        mock_version.assert_awaited_once_with("notifications:user:user-1")
+        mock_list.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
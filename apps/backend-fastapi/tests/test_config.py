@@ -37,6 +37,21 @@ class ConfigTest(unittest.TestCase):
         self.assertEqual(settings.supabase_jwt_audience, "authenticated")
         self.assertEqual(settings.log_level, "INFO")
 
+    def test_load_settings_parses_http_pool_tuning(self):
+        env = {
+            "SUPABASE_HTTP_MAX_CONNECTIONS": "250",
+            "SUPABASE_HTTP_KEEPALIVE_EXPIRY": "45.5",
+            "SUPABASE_HTTP2": "true",
+        }
+
+        with patch.dict("os.environ", env, clear=True):
+            settings = load_settings()
+
+        self.assertEqual(settings.supabase_http_max_connections, 250)
+        self.assertEqual(settings.supabase_http_max_keepalive_connections, 20)
+        self.assertEqual(settings.supabase_http_keepalive_expiry, 45.5)
+        self.assertTrue(settings.supabase_http2)
+
     def test_validate_settings_reports_missing_required_backend_values(self):
         with patch.dict("os.environ", {}, clear=True):
             settings = load_settings()
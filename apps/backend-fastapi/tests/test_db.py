@@ -0,0 +1,114 @@
+import unittest
+from asyncio import run
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+
+import app.db as db
+from app.timing import start_request_timings
+
+
+def _fake_settings(**overrides):
+    values = {
+        "supabase_url": "https://example.supabase.co",
+        "supabase_anon_key": "anon",
+        "supabase_service_role_key": "service",
+        "supabase_http_max_connections": 50,
+        "supabase_http_max_keepalive_connections": 10,
+        "supabase_http_keepalive_expiry": 15.0,
+        "supabase_http_timeout": 8.0,
+        "supabase_http_connect_timeout": 2.0,
+        "supabase_http2": False,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class DbClientPoolTest(unittest.TestCase):
+    def setUp(self):
+        db.close_http_client()
+        self.settings_patch = patch("app.db.settings", _fake_settings())
+        self.settings_patch.start()
+
+    def tearDown(self):
+        db.close_http_client()
+        self.settings_patch.stop()
+
+    def test_http_client_is_shared_and_configured_from_settings(self):
+        pool = db.get_http_client()
+
+        self.assertIs(db.get_http_client(), pool)
+        self.assertEqual(pool.timeout.read, 8.0)
+        self.assertEqual(pool.timeout.connect, 2.0)
+
+    def test_user_clients_share_pool_but_keep_their_own_jwt(self):
+        first = db.get_user_client("token-a")
+        second = db.get_user_client("token-b")
+
+        self.assertIs(first.options.httpx_client, db.get_http_client())
+        self.assertIs(second.options.httpx_client, db.get_http_client())
+        self.assertEqual(first.options.headers["Authorization"], "Bearer token-a")
+        self.assertEqual(second.options.headers["Authorization"], "Bearer token-b")
+        self.assertNotIn("Authorization", db.get_http_client().headers)
+
+    def test_service_client_is_reused(self):
+        client = db.get_service_client()
+
+        self.assertIs(db.get_service_client(), client)
+        self.assertIs(client.options.httpx_client, db.get_http_client())
+
+    def test_close_http_client_resets_pool(self):
+        pool = db.get_http_client()
+        db.close_http_client()
+
+        self.assertTrue(pool.is_closed)
+        self.assertIsNot(db.get_http_client(), pool)
+
+    def test_async_user_clients_share_async_pool(self):
+        async def build():
+            first = db.get_async_user_client("token-a")
+            second = db.get_async_user_client("token-b")
+            pool = db.get_async_http_client()
+            await db.aclose_http_client()
+            return first, second, pool
+
+        first, second, pool = run(build())
+
+        self.assertIs(first.options.httpx_client, pool)
+        self.assertIs(second.options.httpx_client, pool)
+        self.assertEqual(second.options.headers["Authorization"], "Bearer token-b")
+        self.assertTrue(pool.is_closed)
+
+    def test_request_clients_build_user_client_once(self):
+        with patch("app.db.get_async_user_client") as mock_user_client:
+            clients = db.RequestClients("token-a")
+            first = clients.user
+            second = clients.user
+
+        self.assertIs(first, second)
+        mock_user_client.assert_called_once_with("token-a")
+
+    def test_upstream_calls_are_counted_per_request(self):
+        def handler(_request):
+            return httpx.Response(200, json=[])
+
+        http_client = httpx.Client(
+            transport=httpx.MockTransport(handler),
+            event_hooks={
+                "request": [db._on_upstream_request],
+                "response": [db._on_upstream_response],
+            },
+        )
+
+        timings = start_request_timings()
+        http_client.get("https://example.supabase.co/rest/v1/orders")
+        http_client.get("https://example.supabase.co/rest/v1/orders")
+        http_client.close()
+
+        self.assertEqual(timings.calls, 2)
+        self.assertEqual([entry.name for entry in timings.upstream], ["orders", "orders"])
+
+
+if __name__ == "__main__":
+    unittest.main()
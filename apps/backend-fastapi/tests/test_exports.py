@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import unittest
+from asyncio import run
+
+from app.exports import CSV_COLUMNS, csv_chunks, ndjson_chunks
+
+
+ORDER = {
+    "id": "order-1",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "status": "confirmed",
+    "market_id": "market-1",
+    "vendor_id": "vendor-1",
+    "user_id": "user-1",
+    "total": 16.0,
+    "refunded_total": 4.0,
+    "refunds": [{"id": "refund-1", "amount": 4.0, "reason": None, "created_at": "2026-01-02"}],
+    "items": [
+        {"product_id": "product-1", "name": "Tilapia", "quantity": 2, "unit_price": 5.0, "line_total": 10.0},
+        {"product_id": "product-2", "name": "=HYPERLINK()", "quantity": 2, "unit_price": 3.0, "line_total": 6.0},
+    ],
+}
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class ExportsTest(unittest.TestCase):
+    def test_csv_writes_header_then_one_chunk_per_batch(self):
+        empty = {**ORDER, "id": "order-2", "items": [], "refunds": [], "refunded_total": 0}
+
+        chunks = run(_collect(csv_chunks(_batches([ORDER], [empty]))))
+
+        self.assertEqual(len(chunks), 3)
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(rows[0], CSV_COLUMNS)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][:2], ["order-1", "2026-01-01T00:00:00+00:00"])
+        self.assertEqual(rows[1][7:], ["4.0", "1", "product-1", "Tilapia", "2", "5.0", "10.0"])
+        self.assertEqual(rows[3][0], "order-2")
+        self.assertEqual(rows[3][9:], ["", "", "", "", ""])
+
+    def test_csv_neutralizes_formula_cells(self):
+        chunks = run(_collect(csv_chunks(_batches([ORDER]))))
+
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(rows[2][10], "'=HYPERLINK()")
+
+    def test_ndjson_writes_one_line_per_order(self):
+        chunks = run(_collect(ndjson_chunks(_batches([ORDER, ORDER], [ORDER]))))
+
+        self.assertEqual(len(chunks), 2)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["items"][0]["name"], "Tilapia")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from asyncio import run
 from unittest.mock import patch
 from uuid import UUID
 
@@ -24,13 +25,13 @@ class InventoryEventRoutesTest(unittest.TestCase):
             }
         ]
 
-        result = get_inventory_events(
+        result = run(get_inventory_events(
             market_id=UUID("00000000-0000-0000-0000-000000000001"),
             vendor_id=UUID("00000000-0000-0000-0000-000000000002"),
             product_id=UUID("00000000-0000-0000-0000-000000000003"),
             limit=5,
             jwt="token",
-        )
+        ))
 
         self.assertEqual(result[0]["event_type"], "manual_adjustment")
         mock_list_inventory_events.assert_called_once_with(
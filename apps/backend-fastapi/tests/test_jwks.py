@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from asyncio import run
+from unittest.mock import AsyncMock, patch
+
+from app.core.jwks import JWKSKeyManager
+
+
+class JWKSKeyManagerTest(unittest.TestCase):
+    def _manager(self, min_refresh_interval=30.0):
+        return JWKSKeyManager(ttl_seconds=600.0, min_refresh_interval=min_refresh_interval)
+
+    def test_unknown_kid_triggers_one_coalesced_refresh(self):
+        manager = self._manager()
+
+        async def slow_fetch():
+            await asyncio.sleep(0.01)
+            return {"kid-1": {"kid": "kid-1"}}
+
+        async def lookup_many():
+            return await asyncio.gather(*(manager.get_key("kid-1") for _ in range(10)))
+
+        with patch.object(manager, "_fetch", AsyncMock(side_effect=slow_fetch)) as fetch:
+            keys = run(lookup_many())
+
+        self.assertEqual(fetch.await_count, 1)
+        self.assertTrue(all(key == {"kid": "kid-1"} for key in keys))
+
+    def test_known_kid_is_served_without_refresh(self):
+        manager = self._manager()
+
+        with patch.object(
+            manager,
+            "_fetch",
+            AsyncMock(return_value={"kid-1": {"kid": "kid-1"}}),
+        ) as fetch:
+            run(manager.refresh())
+            run(manager.get_key("kid-1"))
+            run(manager.get_key("kid-1"))
+
+        self.assertEqual(fetch.await_count, 1)
+
+    def test_failed_refresh_keeps_serving_stale_keys(self):
+        manager = self._manager(min_refresh_interval=0.0)
+
+        with patch.object(
+            manager,
+            "_fetch",
+            AsyncMock(
+                side_effect=[
+                    {"kid-1": {"kid": "kid-1"}},
+                    RuntimeError("jwks down"),
+                ]
+            ),
+        ):
+            run(manager.refresh())
+            missing = run(manager.get_key("kid-2"))
+
+        self.assertIsNone(missing)
+        self.assertEqual(manager.keys, {"kid-1": {"kid": "kid-1"}})
+
+    def test_unknown_kid_refresh_is_rate_limited(self):
+        manager = self._manager(min_refresh_interval=60.0)
+
+        with patch.object(
+            manager,
+            "_fetch",
+            AsyncMock(return_value={"kid-1": {"kid": "kid-1"}}),
+        ) as fetch:
+            run(manager.refresh())
+            self.assertIsNone(run(manager.get_key("forged-kid")))
+            self.assertIsNone(run(manager.get_key("forged-kid")))
+
+        self.assertEqual(fetch.await_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,28 @@
+import json
 import logging
+import queue
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from app.logging import configure_logging
+import app.logging as app_logging
+from app.logging import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    KeyValueFormatter,
+    configure_logging,
+    should_log_request,
+    shutdown_logging,
+)
 
 
 class LoggingConfigTest(unittest.TestCase):
     def test_configure_logging_sets_app_logger_level_from_settings(self):
-        fake_settings = SimpleNamespace(log_level="WARNING")
+        fake_settings = SimpleNamespace(
+            log_level="WARNING",
+            log_format="text",
+            log_queue=False,
+        )
 
         with patch("app.logging.settings", fake_settings):
             logger = configure_logging()
@@ -16,6 +30,101 @@ class LoggingConfigTest(unittest.TestCase):
         self.assertEqual(logger.name, "mojara.api")
         self.assertEqual(logger.level, logging.WARNING)
 
+    def test_json_formatter_includes_event_fields(self):
+        record = logging.LogRecord("mojara.api", logging.INFO, __file__, 1, "request_complete", None, None)
+        record.fields = {"method": "GET", "status": 200, "request_id": "req-1"}
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(entry["message"], "request_complete")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["status"], 200)
+        self.assertEqual(entry["request_id"], "req-1")
+
+    def test_key_value_formatter_keeps_text_layout(self):
+        record = logging.LogRecord("mojara.api", logging.INFO, __file__, 1, "request_complete", None, None)
+        record.fields = {"method": "GET", "duration_ms": 1.5}
+
+        line = KeyValueFormatter().format(record)
+
+        self.assertEqual(line, "INFO:mojara.api:request_complete method=GET duration_ms=1.5")
+
+    def test_dropping_queue_handler_never_blocks(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        logger = logging.getLogger("mojara.api.test_queue")
+        logger.propagate = False
+        logger.addHandler(handler)
+
+        logger.warning("first")
+        logger.warning("second")
+
+        logger.removeHandler(handler)
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 1)
+
+    def test_should_log_request_keeps_errors_and_slow_requests(self):
+        fake_settings = SimpleNamespace(log_sample_rate=0.0, log_slow_request_ms=500.0)
+
+        with patch("app.logging.settings", fake_settings):
+            self.assertFalse(should_log_request(200, 12.0))
+            self.assertTrue(should_log_request(500, 12.0))
+            self.assertTrue(should_log_request(404, 12.0))
+            self.assertTrue(should_log_request(200, 750.0))
+
+
+class QueueLifecycleTest(unittest.TestCase):
+    # main.py configures logging on import, so start from a clean slate.
+    def setUp(self):
+        shutdown_logging()
+        self.root_logger = logging.getLogger()
+        self.saved_handlers = self.root_logger.handlers[:]
+        self._reset_module_state()
+        self.root_logger.handlers = []
+
+    def tearDown(self):
+        shutdown_logging()
+        self._reset_module_state()
+        self.root_logger.handlers = self.saved_handlers
+
+    @staticmethod
+    def _reset_module_state():
+        app_logging._listener = None
+        app_logging._queue_handler = None
+        app_logging._stream_handler = None
+
+    def queue_handlers(self):
+        return [h for h in self.root_logger.handlers if isinstance(h, DroppingQueueHandler)]
+
+    def test_queue_handler_is_removed_on_shutdown_and_reinstalled(self):
+        fake_settings = SimpleNamespace(log_level="INFO", log_format="text", log_queue=True)
+
+        with patch("app.logging.settings", fake_settings):
+            configure_logging()
+            self.assertEqual(len(self.queue_handlers()), 1)
+            self.assertEqual(len(self.root_logger.handlers), 1)
+
+            shutdown_logging()
+            self.assertEqual(self.queue_handlers(), [])
+            self.assertEqual(self.root_logger.handlers, [app_logging._stream_handler])
+
+            configure_logging()
+            self.assertEqual(len(self.queue_handlers()), 1)
+            self.assertEqual(len(self.root_logger.handlers), 1)
+            self.assertIsNotNone(app_logging._listener)
+
+    def test_queue_handler_is_reinstalled_when_root_handlers_are_reset(self):
+        fake_settings = SimpleNamespace(log_level="INFO", log_format="text", log_queue=True)
+
+        with patch("app.logging.settings", fake_settings):
+            configure_logging()
+            first_listener = app_logging._listener
+            self.root_logger.handlers = []
+
+            configure_logging()
+
+        self.assertEqual(len(self.queue_handlers()), 1)
+        self.assertIsNot(app_logging._listener, first_listener)
+
 
 if __name__ == "__main__":
     unittest.main()
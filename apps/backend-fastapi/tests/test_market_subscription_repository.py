@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import Mock, patch
+from asyncio import run
+from unittest.mock import AsyncMock, Mock, patch
 
 from fastapi import HTTPException
 from postgrest import APIError
@@ -11,29 +12,33 @@ from app.repositories.market_subscriptions import (
 
 
 class MarketSubscriptionRepositoryTest(unittest.TestCase):
-    @patch("app.repositories.market_subscriptions.get_user_client")
+    @patch("app.repositories.market_subscriptions.get_async_user_client")
     def test_create_market_subscription_returns_existing_row_for_unique_violation(
         self,
-        mock_get_user_client,
+        mock_get_async_user_client,
     ):
         insert_query = Mock()
-        insert_query.execute.side_effect = APIError(
-            {
-                "message": "duplicate key value violates unique constraint",
-                "code": "23505",
-            }
+        insert_query.execute = AsyncMock(
+            side_effect=APIError(
+                {
+                    "message": "duplicate key value violates unique constraint",
+                    "code": "23505",
+                }
+            ),
         )
 
         existing_query = Mock()
         existing_query.eq.return_value = existing_query
         existing_query.limit.return_value = existing_query
-        existing_query.execute.return_value = Mock(
-            data=[
-                {
-                    "market_id": "market-1",
-                    "created_at": "2026-04-08T00:00:00Z",
-                }
-            ]
+        existing_query.execute = AsyncMock(
+            return_value=Mock(
+                data=[
+                    {
+                        "market_id": "market-1",
+                        "created_at": "2026-04-08T00:00:00Z",
+                    }
+                ]
+            ),
         )
 
         table_mock = Mock()
@@ -42,35 +47,39 @@ class MarketSubscriptionRepositoryTest(unittest.TestCase):
 
         client = Mock()
         client.table.return_value = table_mock
-        mock_get_user_client.return_value = client
+        mock_get_async_user_client.return_value = client
 
-        result = create_market_subscription(
-            jwt="token",
-            user_id="user-1",
-            market_id="market-1",
+        result = run(
+            create_market_subscription(
+                jwt="token",
+                user_id="user-1",
+                market_id="market-1",
+            )
         )
 
         self.assertEqual(result["market_id"], "market-1")
 
-    @patch("app.repositories.market_subscriptions.get_user_client")
-    def test_delete_market_subscription_returns_404_when_missing(self, mock_get_user_client):
+    @patch("app.repositories.market_subscriptions.get_async_user_client")
+    def test_delete_market_subscription_returns_404_when_missing(self, mock_get_async_user_client):
         existing_query = Mock()
         existing_query.eq.return_value = existing_query
         existing_query.limit.return_value = existing_query
-        existing_query.execute.return_value = Mock(data=[])
+        existing_query.execute = AsyncMock(return_value=Mock(data=[]))
 
         table_mock = Mock()
         table_mock.select.return_value = existing_query
 
         client = Mock()
         client.table.return_value = table_mock
-        mock_get_user_client.return_value = client
+        mock_get_async_user_client.return_value = client
 
         with self.assertRaises(HTTPException) as ctx:
-            delete_market_subscription(
-                jwt="token",
-                user_id="user-1",
-                market_id="missing-market",
+            run(
+                delete_market_subscription(
+                    jwt="token",
+                    user_id="user-1",
+                    market_id="missing-market",
+                )
             )
 
         self.assertEqual(ctx.exception.status_code, 404)
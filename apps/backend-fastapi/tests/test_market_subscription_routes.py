@@ -1,4 +1,6 @@
 import unittest
+from asyncio import run
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from app.routes.market_subscriptions import (
@@ -9,6 +11,9 @@ from app.routes.market_subscriptions import (
 from app.schemas.market_subscriptions import MarketSubscriptionCreate
 
 
+CLIENTS = SimpleNamespace(user=object())
+
+
 class MarketSubscriptionRoutesTest(unittest.TestCase):
     @patch("app.routes.market_subscriptions.list_market_subscriptions")
     def test_list_market_subscriptions_uses_current_user(self, mock_list_market_subscriptions):
@@ -19,14 +24,16 @@ class MarketSubscriptionRoutesTest(unittest.TestCase):
             }
         ]
 
-        result = get_my_market_subscriptions(
-            current_user={"sub": "user-1", "_jwt": "token"}
-        )
+        result = run(get_my_market_subscriptions(
+            current_user={"sub": "user-1", "_jwt": "token"},
+            clients=CLIENTS,
+        ))
 
         self.assertEqual(len(result), 1)
         mock_list_market_subscriptions.assert_called_once_with(
             jwt="token",
             user_id="user-1",
+            client=CLIENTS.user,
         )
 
     @patch("app.routes.market_subscriptions.create_market_subscription")
@@ -40,10 +47,11 @@ class MarketSubscriptionRoutesTest(unittest.TestCase):
             market_id="00000000-0000-0000-0000-000000000001"
         )
 
-        result = create_my_market_subscription(
+        result = run(create_my_market_subscription(
             payload=payload,
             current_user={"sub": "user-1", "_jwt": "token"},
-        )
+            clients=CLIENTS,
+        ))
 
         self.assertEqual(
             result["market_id"], "00000000-0000-0000-0000-000000000001"
@@ -52,20 +60,23 @@ class MarketSubscriptionRoutesTest(unittest.TestCase):
             jwt="token",
             user_id="user-1",
             market_id="00000000-0000-0000-0000-000000000001",
+            client=CLIENTS.user,
         )
 
     @patch("app.routes.market_subscriptions.delete_market_subscription")
     def test_delete_market_subscription_uses_current_user(self, mock_delete_market_subscription):
-        result = delete_my_market_subscription(
+        result = run(delete_my_market_subscription(
             market_id="market-1",
             current_user={"sub": "user-1", "_jwt": "token"},
-        )
+            clients=CLIENTS,
+        ))
 
         self.assertEqual(result, {"ok": True})
         mock_delete_market_subscription.assert_called_once_with(
             jwt="token",
             user_id="user-1",
             market_id="market-1",
+            client=CLIENTS.user,
         )
 
 
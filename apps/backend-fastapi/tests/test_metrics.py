@@ -0,0 +1,86 @@
+import unittest
+from asyncio import run
+from dataclasses import replace
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+import app.db as db
+from app.metrics import instrument_repository, upstream_calls, upstream_kind
+from main import app, settings
+
+
+class MetricsTest(unittest.TestCase):
+    def test_metrics_endpoint_labels_requests_by_route_template(self):
+        client = TestClient(app)
+
+        client.get("/health")
+        with patch("main.settings", replace(settings, metrics_token="scrape-secret")):
+            response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'api_request_duration_seconds_count{method="GET",route="/health",status="200"}',
+            response.text,
+        )
+        self.assertIn("api_requests_in_flight", response.text)
+        self.assertIn("api_threadpool_capacity", response.text)
+
+    def test_metrics_endpoint_requires_the_metrics_token(self):
+        client = TestClient(app)
+
+        with patch("main.settings", replace(settings, metrics_token="scrape-secret")):
+            missing = client.get("/metrics")
+            wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+
+        self.assertEqual(missing.status_code, 401)
+        self.assertEqual(wrong.status_code, 401)
+        self.assertNotIn("api_request_duration_seconds", wrong.text)
+
+    def test_metrics_endpoint_is_off_without_a_token(self):
+        client = TestClient(app)
+
+        with patch("main.settings", replace(settings, metrics_token=None)):
+            response = client.get("/metrics", headers={"Authorization": "Bearer anything"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_upstream_calls_are_labeled_by_repository_function(self):
+        def handler(_request):
+            return httpx.Response(200, json=[])
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            event_hooks={
+                "request": [db._on_upstream_request_async],
+                "response": [db._on_upstream_response_async],
+            },
+        )
+
+        @instrument_repository
+        async def load_orders():
+            await http_client.get("https://example.supabase.co/rest/v1/orders")
+            await http_client.post("https://example.supabase.co/rest/v1/rpc/confirm_order")
+
+        run(load_orders())
+        run(http_client.aclose())
+
+        function = "test_metrics.load_orders"
+        self.assertEqual(
+            upstream_calls.labels(function, "rest", "ok")._value.get(),
+            1,
+        )
+        self.assertEqual(
+            upstream_calls.labels(function, "rpc", "ok")._value.get(),
+            1,
+        )
+
+    def test_upstream_kind(self):
+        self.assertEqual(upstream_kind("/rest/v1/rpc/create_order_atomic"), "rpc")
+        self.assertEqual(upstream_kind("/rest/v1/orders"), "rest")
+        self.assertEqual(upstream_kind("/auth/v1/admin/users"), "auth")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,15 @@
 import unittest
+from asyncio import run
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from app.routes.notifications import mark_all_read, subscribe
 from app.schemas.notifications import NotificationSubscriptionIn
 
 
+CLIENTS = SimpleNamespace(user=object())
+
+
 class NotificationsRoutesTest(unittest.TestCase):
     @patch("app.routes.notifications.create_subscription")
     def test_subscribe_uses_current_user(self, mock_create_subscription):
@@ -26,10 +31,11 @@ class NotificationsRoutesTest(unittest.TestCase):
             channel="push",
         )
 
-        result = subscribe(
+        result = run(subscribe(
             payload=payload,
             current_user={"sub": "user-1", "_jwt": "token"},
-        )
+            clients=CLIENTS,
+        ))
 
         self.assertEqual(result["user_id"], "user-1")
         mock_create_subscription.assert_called_once_with(
@@ -41,20 +47,23 @@ class NotificationsRoutesTest(unittest.TestCase):
                 "min_severity": 2,
                 "channel": "push",
             },
+            client=CLIENTS.user,
         )
 
     @patch("app.routes.notifications.mark_all_notifications_read")
     def test_mark_all_read_uses_current_user(self, mock_mark_all_notifications_read):
         mock_mark_all_notifications_read.return_value = 4
 
-        result = mark_all_read(
+        result = run(mark_all_read(
             current_user={"sub": "user-1", "_jwt": "token"},
-        )
+            clients=CLIENTS,
+        ))
 
         self.assertEqual(result, {"ok": True, "updated": 4})
         mock_mark_all_notifications_read.assert_called_once_with(
             jwt="token",
             user_id="user-1",
+            client=CLIENTS.user,
         )
 
 
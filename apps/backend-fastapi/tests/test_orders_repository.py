@@ -1,13 +1,27 @@
+import base64
 import unittest
-from unittest.mock import Mock, patch
+from asyncio import run
+from unittest.mock import AsyncMock, Mock, patch
 
 from fastapi import HTTPException
+from postgrest import SyncPostgrestClient
 
 from app.repositories.orders import (
+    _cursor_page,
+    _order_search_terms,
+    _order_detail_query,
+    _order_detail_result,
+    _order_timeline_query,
+    _orders_cursor_query,
+    _orders_export_query,
     assert_user_can_view_order,
+    check_order_summary_counters,
+    create_order,
     decode_cursor,
     encode_cursor,
-    get_order_by_id,
+    get_order_timeline,
+    iter_orders_for_export,
+    rebuild_order_summary_counters,
     refund_order,
 )
 
@@ -51,45 +65,291 @@ class OrdersRepositoryTest(unittest.TestCase):
         self.assertEqual(created_at, "2026-03-23T10:00:00Z")
         self.assertEqual(order_id, "order-1")
 
-    @patch("app.repositories.orders.get_user_client")
-    def test_get_order_by_id_returns_404_when_missing(self, mock_get_user_client):
-        query = Mock()
-        query.eq.return_value = query
-        query.limit.return_value = query
-        query.execute.return_value = Mock(data=[])
+    def test_highest_cursor_carries_total(self):
+        rows = [
+            {"id": f"order-{index}", "total": 30 - index, "created_at": "2026-03-23T10:00:00Z"}
+            for index in range(3)
+        ]
 
-        table = Mock()
-        table.select.return_value = query
+        page = _cursor_page(rows, limit=2, sort="highest")
 
+        self.assertEqual(decode_cursor(page["next_cursor"], "highest"), ("29", "order-1"))
+
+    def test_cursor_rejects_other_sort(self):
+        cursor = encode_cursor(29, "order-1", "highest")
+
+        with self.assertRaises(HTTPException) as ctx:
+            decode_cursor(cursor, "newest")
+
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_legacy_cursor_only_continues_date_sorts(self):
+        legacy = base64.urlsafe_b64encode(b"2026-03-23T10:00:00Z|order-1").decode()
+
+        self.assertEqual(
+            decode_cursor(legacy, "oldest"),
+            ("2026-03-23T10:00:00Z", "order-1"),
+        )
+        with self.assertRaises(HTTPException):
+            decode_cursor(legacy, "highest")
+
+    def test_invalid_cursor_is_bad_request(self):
+        with self.assertRaises(HTTPException) as ctx:
+            decode_cursor("not-a-cursor")
+
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_cursor_query_seeks_on_sort_key_and_id(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+        cursor = encode_cursor(29.5, "order-1", "highest")
+
+        query = _orders_cursor_query(
+            client,
+            vendor_id="vendor-1",
+            sort="highest",
+            cursor=cursor,
+            limit=20,
+        )
+        params = query.request.params
+
+        self.assertEqual(params["order"], "total.desc,id.desc")
+        self.assertEqual(params["total"], "lte.29.5")
+        self.assertEqual(
+            params["or"],
+            '(total.lt."29.5",and(total.eq."29.5",id.lt.order-1))',
+        )
+
+    def test_oldest_cursor_query_walks_forward(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+        cursor = encode_cursor("2026-03-23T10:00:00+00:00", "order-1", "oldest")
+
+        params = _orders_cursor_query(client, sort="oldest", cursor=cursor).request.params
+
+        self.assertEqual(params["order"], "created_at.asc,id.asc")
+        self.assertEqual(params["created_at"], "gte.2026-03-23T10:00:00+00:00")
+        self.assertIn("id.gt.order-1", params["or"])
+
+    def test_export_query_filters_date_range_and_seeks_forward(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        params = _orders_export_query(
+            client,
+            vendor_id="vendor-1",
+            created_from="2026-01-01T00:00:00+00:00",
+            created_to="2026-02-01T00:00:00+00:00",
+            after=("2026-01-15T08:00:00+00:00", "order-1"),
+            limit=500,
+        ).request.params
+
+        self.assertEqual(params["vendor_id"], "eq.vendor-1")
+        self.assertEqual(params["order"], "created_at.asc,id.asc")
+        self.assertEqual(params["order_items.order"], "line_number.asc")
+        self.assertEqual(params["limit"], "500")
+        self.assertEqual(
+            params.get_list("created_at"),
+            [
+                "gte.2026-01-01T00:00:00+00:00",
+                "lt.2026-02-01T00:00:00+00:00",
+                "gte.2026-01-15T08:00:00+00:00",
+            ],
+        )
+        self.assertIn("id.gt.order-1", params["or"])
+
+    @patch("app.repositories.orders.get_orders_export_batch", new_callable=AsyncMock)
+    def test_export_iterates_keyset_batches_until_short_batch(self, mock_batch):
+        first = [
+            {"id": "order-1", "created_at": "2026-01-01T00:00:00+00:00"},
+            {"id": "order-2", "created_at": "2026-01-02T00:00:00+00:00"},
+        ]
+        second = [{"id": "order-3", "created_at": "2026-01-03T00:00:00+00:00"}]
+        mock_batch.side_effect = [first, second]
+
+        async def collect():
+            return [
+                batch
+                async for batch in iter_orders_for_export(
+                    "token",
+                    vendor_id="vendor-1",
+                    batch_size=2,
+                )
+            ]
+
+        self.assertEqual(run(collect()), [first, second])
+        self.assertIsNone(mock_batch.call_args_list[0].kwargs["after"])
+        self.assertEqual(
+            mock_batch.call_args_list[1].kwargs["after"],
+            ("2026-01-02T00:00:00+00:00", "order-2"),
+        )
+
+    def test_search_terms_split_id_prefix_and_text(self):
+        id_range, text = _order_search_terms(" #3F2A-9c ")
+
+        self.assertEqual(
+            id_range,
+            (
+                "3f2a9c00-0000-0000-0000-000000000000",
+                "3f2a9cff-ffff-ffff-ffff-ffffffffffff",
+            ),
+        )
+        self.assertEqual(text, "#3f2a-9c")
+
+    def test_search_terms_email_is_text_only(self):
+        id_range, text = _order_search_terms("Ama@Example.com")
+
+        self.assertIsNone(id_range)
+        self.assertEqual(text, "ama@example.com")
+
+    def test_short_non_hex_search_matches_nothing(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        self.assertEqual(_order_search_terms("zz"), (None, None))
+        params = _orders_cursor_query(client, search="zz").request.params
+        self.assertEqual(params["id"], "in.()")
+
+    def test_text_search_goes_through_search_orders_rpc(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        request = _orders_cursor_query(client, vendor_id="vendor-1", search="abc").request
+
+        self.assertTrue(str(request.path).endswith("/rpc/search_orders"))
+        self.assertEqual(
+            request.json,
+            {
+                "p_text": "abc",
+                "p_vendor_id": "vendor-1",
+                "p_id_from": "abc00000-0000-0000-0000-000000000000",
+                "p_id_to": "abcfffff-ffff-ffff-ffff-ffffffffffff",
+            },
+        )
+        self.assertEqual(request.params["vendor_id"], "eq.vendor-1")
+        self.assertNotIn("search_text", str(request.params))
+
+    def test_full_list_embeds_items_in_cart_order(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        full = _orders_cursor_query(client, user_id="user-1").request.params
+        summary = _orders_cursor_query(client, user_id="user-1", view="summary").request.params
+
+        self.assertEqual(full["order_items.order"], "line_number.asc")
+        self.assertNotIn("order_items.order", summary)
+
+    def test_id_prefix_search_reads_orders_by_id_range(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        request = _orders_cursor_query(client, search="3f").request
+
+        self.assertTrue(str(request.path).endswith("/orders"))
+        self.assertEqual(
+            request.params.get_list("id"),
+            [
+                "gte.3f000000-0000-0000-0000-000000000000",
+                "lte.3fffffff-ffff-ffff-ffff-ffffffffffff",
+            ],
+        )
+
+    def test_detail_query_limits_events_but_not_refunds(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+
+        params = _order_detail_query(client, "order-1").request.params
+
+        self.assertEqual(params["order_items.order"], "line_number.asc")
+        self.assertEqual(params["order_events.order"], "created_at.desc,id.desc")
+        self.assertEqual(params["order_events.limit"], "21")
+        self.assertEqual(params["refunds.order"], "created_at.desc")
+        self.assertNotIn("refunds.limit", params)
+
+    def test_detail_result_returns_latest_events_with_cursor(self):
+        events = [
+            {
+                "id": f"event-{index}",
+                "event": "refunded_partial",
+                "amount": 1,
+                "reason": None,
+                "created_at": f"2026-03-23T10:{59 - index:02d}:00+00:00",
+            }
+            for index in range(21)
+        ]
+        res = Mock(data=[{
+            "id": "order-1",
+            "user_id": "user-1",
+            "vendor_id": "vendor-1",
+            "order_items": [],
+            "refunds": [],
+            "order_events": events,
+        }])
+
+        order = _order_detail_result(res, "user-1", None, False)
+
+        self.assertEqual(len(order["events"]), 20)
+        self.assertEqual(order["events"][0]["id"], "event-19")
+        self.assertEqual(order["events"][-1]["id"], "event-0")
+        self.assertEqual(
+            decode_cursor(order["events_next_cursor"], "timeline"),
+            ("2026-03-23T10:40:00+00:00", "event-19"),
+        )
+
+    def test_timeline_query_seeks_older_events(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+        cursor = encode_cursor("2026-03-23T10:40:00+00:00", "event-19", "timeline")
+
+        params = _order_timeline_query(client, "order-1", cursor, limit=50).request.params
+
+        self.assertEqual(params["id"], "eq.order-1")
+        self.assertEqual(params["order_events.limit"], "51")
+        self.assertEqual(params["order_events.created_at"], "lte.2026-03-23T10:40:00+00:00")
+        self.assertIn("id.lt.event-19", params["order_events.or"])
+
+    def test_timeline_rejects_list_cursor(self):
+        client = SyncPostgrestClient("http://localhost/rest/v1")
+        cursor = encode_cursor("2026-03-23T10:40:00+00:00", "order-1")
+
+        with self.assertRaises(HTTPException) as ctx:
+            _order_timeline_query(client, "order-1", cursor)
+
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    @patch("app.repositories.orders.get_async_user_client")
+    def test_timeline_hides_other_users_orders(self, mock_get_async_user_client):
         client = Mock()
-        client.table.return_value = table
-        mock_get_user_client.return_value = client
+        query = client.table.return_value.select.return_value
+        for name in ("eq", "limit", "order"):
+            getattr(query, name).return_value = query
+        query.execute = AsyncMock(
+            return_value=Mock(data=[
+                {"id": "order-1", "user_id": "someone-else", "vendor_id": "vendor-1", "order_events": []}
+            ]),
+        )
+        mock_get_async_user_client.return_value = client
 
         with self.assertRaises(HTTPException) as ctx:
-            get_order_by_id(
-                jwt="token",
-                order_id="missing-order",
-                user_id="user-1",
-                vendor_id=None,
+            run(
+                get_order_timeline(
+                    jwt="token",
+                    order_id="order-1",
+                    user_id="user-1",
+                    vendor_id=None,
+                )
             )
 
-        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual(ctx.exception.status_code, 403)
 
-    @patch("app.repositories.orders.get_user_client")
-    def test_refund_order_passes_vendor_id_to_rpc(self, mock_get_user_client):
+    @patch("app.repositories.orders.get_async_user_client")
+    def test_refund_order_passes_vendor_id_to_rpc(self, mock_get_async_user_client):
         rpc_execute = Mock()
-        rpc_execute.execute.return_value = Mock(data={"id": "order-1"})
+        rpc_execute.execute = AsyncMock(return_value=Mock(data={"id": "order-1"}))
 
         client = Mock()
         client.rpc.return_value = rpc_execute
-        mock_get_user_client.return_value = client
+        mock_get_async_user_client.return_value = client
 
-        refund_order(
-            jwt="token",
-            order_id="order-1",
-            amount=10,
-            reason="test",
-            vendor_id="vendor-1",
+        run(
+            refund_order(
+                jwt="token",
+                order_id="order-1",
+                amount=10,
+                reason="test",
+                vendor_id="vendor-1",
+            )
         )
 
         client.rpc.assert_called_once_with(
@@ -102,6 +362,56 @@ class OrdersRepositoryTest(unittest.TestCase):
             },
         )
 
+    @patch("app.repositories.orders.settings")
+    @patch("app.repositories.orders.get_async_user_client")
+    def test_create_order_with_idempotency_key_uses_idempotent_rpc(
+        self,
+        mock_get_async_user_client,
+        mock_settings,
+    ):
+        mock_settings.idempotency_key_ttl_seconds = 600
+        client = Mock()
+        client.rpc.return_value.execute = AsyncMock(return_value=Mock(data={"id": "order-1"}))
+        mock_get_async_user_client.return_value = client
+        items = [{"product_id": "product-1", "quantity": 1}]
+
+        run(
+            create_order(
+                jwt="token",
+                market_id="market-1",
+                vendor_id="vendor-1",
+                customer_id="user-1",
+                items=items,
+                idempotency_key="checkout-1",
+            )
+        )
+
+        client.rpc.assert_called_once_with(
+            "create_order_idempotent",
+            {
+                "p_idempotency_key": "checkout-1",
+                "p_ttl_seconds": 600,
+                "p_market_id": "market-1",
+                "p_vendor_id": "vendor-1",
+                "p_customer_id": "user-1",
+                "p_items": items,
+            },
+        )
+
+    @patch("app.repositories.orders.get_service_client")
+    def test_summary_counter_maintenance_uses_service_rpcs(self, mock_get_service_client):
+        drift = [{"scope": "vendor", "scope_id": "vendor-1", "status": "pending"}]
+        client = Mock()
+        client.rpc.return_value.execute.side_effect = [Mock(data=12), Mock(data=drift)]
+        mock_get_service_client.return_value = client
+
+        self.assertEqual(rebuild_order_summary_counters(), 12)
+        self.assertEqual(check_order_summary_counters(), drift)
+        self.assertEqual(
+            [call.args[0] for call in client.rpc.call_args_list],
+            ["rebuild_order_summary_counters", "check_order_summary_counters"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,20 @@
+import json
 import unittest
-from unittest.mock import patch
+from asyncio import run
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from uuid import UUID
 
-from app.schemas.orders import CreateOrderPayload, RefundPayload
+from app.conditional import make_etag
+from app.schemas.orders import BulkOrderTransitionPayload, CreateOrderPayload, OrderOut, OrderSummaryOut, RefundPayload
 from app.routes.orders import (
+    bulk_cancel_orders_endpoint,
+    bulk_confirm_orders_endpoint,
     cancel_order_endpoint,
     create_order_endpoint,
+    export_orders_endpoint,
     get_order,
     list_orders_endpoint,
     orders_summary,
@@ -15,12 +22,25 @@ from app.routes.orders import (
 )
 
 
+def build_request(path: str = "/orders/summary", etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": headers,
+        }
+    )
+
+
 class OrdersRoutesTest(unittest.TestCase):
     @patch("app.routes.orders.create_order")
     def test_create_order_uses_authenticated_user_instead_of_payload_user(self, mock_create_order):
         mock_create_order.return_value = {"id": "order-1"}
 
-        result = create_order_endpoint(
+        result = run(create_order_endpoint(
             market_id=UUID("00000000-0000-0000-0000-000000000010"),
             vendor_id=UUID("00000000-0000-0000-0000-000000000020"),
             payload=CreateOrderPayload(
@@ -32,13 +52,14 @@ class OrdersRoutesTest(unittest.TestCase):
                     }
                 ],
             ),
+            idempotency_key="checkout-1",
             jwt="token",
             current_user={
                 "sub": "authenticated-user",
                 "app_role": "user",
                 "_jwt": "token",
             },
-        )
+        ))
 
         self.assertEqual(result["id"], "order-1")
         mock_create_order.assert_called_once_with(
@@ -52,6 +73,7 @@ class OrdersRoutesTest(unittest.TestCase):
                     "quantity": 2,
                 }
             ],
+            idempotency_key="checkout-1",
         )
 
     @patch("app.routes.orders.get_orders_for_admin_cursor")
@@ -61,34 +83,67 @@ class OrdersRoutesTest(unittest.TestCase):
             "next_cursor": None,
         }
 
-        result = list_orders_endpoint(
+        result = run(list_orders_endpoint(
             scope="admin",
             status="pending",
             sort="newest",
             search="order",
             cursor=None,
             limit=20,
+            view="full",
             jwt="token",
             current_user={
                 "sub": "user-1",
                 "app_role": "admin",
                 "_jwt": "token",
             },
-        )
+        ))
 
-        self.assertEqual(result["data"][0]["id"], "order-1")
+        body = json.loads(result.body)
+        self.assertEqual(body["data"][0]["id"], "order-1")
+        self.assertEqual(set(body["data"][0]), set(OrderOut.model_fields))
         mock_get_orders_for_admin_cursor.assert_called_once_with(
             status="pending",
             sort="newest",
             search="order",
             cursor=None,
             limit=20,
+            view="full",
         )
 
+    @patch("app.routes.orders.get_orders_for_vendor_cursor")
+    def test_summary_view_returns_summary_rows(self, mock_get_orders_for_vendor_cursor):
+        mock_get_orders_for_vendor_cursor.return_value = {
+            "data": [{"id": "order-1", "item_count": 3, "first_item_name": "Tilapia"}],
+            "next_cursor": None,
+        }
+
+        result = run(list_orders_endpoint(
+            scope="vendor",
+            status=None,
+            sort="newest",
+            search=None,
+            cursor=None,
+            limit=20,
+            view="summary",
+            jwt="token",
+            current_user={
+                "sub": "user-1",
+                "app_role": "vendor",
+                "vendor_id": "vendor-1",
+                "_jwt": "token",
+            },
+        ))
+
+        body = json.loads(result.body)
+        self.assertEqual(set(body["data"][0]), set(OrderSummaryOut.model_fields))
+        self.assertEqual(body["data"][0]["item_count"], 3)
+        self.assertEqual(mock_get_orders_for_vendor_cursor.call_args.kwargs["view"], "summary")
+
     @patch("app.routes.orders.get_orders_for_admin_cursor")
     def test_admin_scope_rejects_non_admin(self, mock_get_orders_for_admin_cursor):
         with self.assertRaises(HTTPException) as ctx:
-            list_orders_endpoint(
+            run(list_orders_endpoint(
                 scope="admin",
                 status=None,
                 sort="newest",
@@ -101,16 +156,18 @@ class OrdersRoutesTest(unittest.TestCase):
                     "app_role": "user",
                     "_jwt": "token",
                 },
-            )
+            ))
 
         self.assertEqual(ctx.exception.status_code, 403)
         mock_get_orders_for_admin_cursor.assert_not_called()
 
+    @patch("app.routes.orders.get_order_version", new_callable=AsyncMock, return_value=3)
     @patch("app.routes.orders.get_order_by_id")
-    def test_get_order_passes_admin_flag_for_admins(self, mock_get_order_by_id):
+    def test_get_order_passes_admin_flag_for_admins(self, mock_get_order_by_id, mock_version):
         mock_get_order_by_id.return_value = {"id": "order-1"}
 
-        result = get_order(
+        result = run(get_order(
+            request=build_request(path="/orders/00000000-0000-0000-0000-000000000001"),
             order_id="00000000-0000-0000-0000-000000000001",
             jwt="token",
             current_user={
@@ -119,15 +176,63 @@ class OrdersRoutesTest(unittest.TestCase):
                 "vendor_id": None,
                 "_jwt": "token",
             },
-        )
+        ))
 
         self.assertEqual(result["id"], "order-1")
         _, kwargs = mock_get_order_by_id.call_args
         self.assertTrue(kwargs["is_admin"])
 
+    @patch("app.routes.orders.get_order_version", new_callable=AsyncMock, return_value=3)
+    @patch("app.routes.orders.get_order_by_id")
+    def test_get_order_not_modified_skips_detail_query(self, mock_get_order_by_id, mock_version):
+        order_id = "00000000-0000-0000-0000-000000000001"
+        path = f"/orders/{order_id}"
+        etag = make_etag(f"order:{order_id}", 3, f"{path}?|user-1:user")
+
+        result = run(get_order(
+            request=build_request(path=path, etag=etag),
+            order_id=UUID(order_id),
+            jwt="token",
+            current_user={
+                "sub": "user-1",
+                "app_role": "user",
+                "vendor_id": None,
+                "_jwt": "token",
+            },
+        ))
+
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(result.headers["Vary"], "Authorization")
+        mock_get_order_by_id.assert_not_called()
+        self.assertEqual(mock_version.call_args.kwargs["user_id"], "user-1")
+
+    @patch("app.routes.orders.get_order_version", new_callable=AsyncMock, return_value=3)
+    @patch("app.routes.orders.get_order_by_id", new_callable=AsyncMock)
+    def test_get_order_etag_is_not_shared_between_callers(self, mock_get_order_by_id, _version):
+        order_id = "00000000-0000-0000-0000-000000000001"
+        path = f"/orders/{order_id}"
+        customer_etag = make_etag(f"order:{order_id}", 3, f"{path}?|user-1:user")
+        mock_get_order_by_id.return_value = {"id": order_id}
+
+        result = run(get_order(
+            request=build_request(path=path, etag=customer_etag),
+            order_id=UUID(order_id),
+            jwt="token",
+            current_user={
+                "sub": "vendor-user",
+                "app_role": "vendor",
+                "vendor_id": "vendor-1",
+                "_jwt": "token",
+            },
+        ))
+
+        self.assertEqual(result, {"id": order_id})
+        mock_get_order_by_id.assert_awaited_once()
+
     @patch("app.routes.orders.get_orders_summary")
     def test_orders_summary_vendor_scope_returns_zero_for_non_vendor(self, mock_get_orders_summary):
-        result = orders_summary(
+        result = run(orders_summary(
+            request=build_request(),
             scope="vendor",
             current_user={
                 "sub": "user-1",
@@ -135,13 +240,14 @@ class OrdersRoutesTest(unittest.TestCase):
                 "app_role": "user",
                 "_jwt": "token",
             },
-        )
+        ))
 
         self.assertEqual(result["total_orders"], 0)
         mock_get_orders_summary.assert_not_called()
 
+    @patch("app.routes.orders.get_resource_version", new_callable=AsyncMock, return_value=0)
     @patch("app.routes.orders.get_orders_summary")
-    def test_orders_summary_vendor_scope_calls_summary_for_vendor(self, mock_get_orders_summary):
+    def test_orders_summary_vendor_scope_calls_summary_for_vendor(self, mock_get_orders_summary, mock_version):
         mock_get_orders_summary.return_value = {
             "total_orders": 5,
             "pending": 1,
@@ -150,7 +256,8 @@ class OrdersRoutesTest(unittest.TestCase):
             "total_revenue": 120.0,
         }
 
-        result = orders_summary(
+        result = run(orders_summary(
+            request=build_request(),
             scope="vendor",
             current_user={
                 "sub": "vendor-user",
@@ -158,7 +265,7 @@ class OrdersRoutesTest(unittest.TestCase):
                 "app_role": "vendor",
                 "_jwt": "token",
             },
-        )
+        ))
 
         self.assertEqual(result["total_orders"], 5)
         mock_get_orders_summary.assert_called_once_with(
@@ -166,8 +273,9 @@ class OrdersRoutesTest(unittest.TestCase):
             vendor_id="vendor-1",
         )
 
+    @patch("app.routes.orders.get_resource_version", new_callable=AsyncMock, return_value=0)
     @patch("app.routes.orders.get_orders_summary")
-    def test_orders_summary_user_scope_calls_summary(self, mock_get_orders_summary):
+    def test_orders_summary_user_scope_calls_summary(self, mock_get_orders_summary, mock_version):
         mock_get_orders_summary.return_value = {
             "total_orders": 3,
             "pending": 0,
@@ -176,14 +284,15 @@ class OrdersRoutesTest(unittest.TestCase):
             "total_revenue": 90.0,
         }
 
-        result = orders_summary(
+        result = run(orders_summary(
+            request=build_request(),
             current_user={
                 "sub": "user-1",
                 "vendor_id": None,
                 "app_role": "user",
                 "_jwt": "token",
             },
-        )
+        ))
 
         self.assertEqual(result["total_orders"], 3)
         mock_get_orders_summary.assert_called_once_with(
@@ -191,9 +300,60 @@ class OrdersRoutesTest(unittest.TestCase):
             user_id="user-1",
         )
 
+    @patch("app.routes.orders.confirm_orders_bulk")
+    def test_bulk_confirm_returns_per_order_results(self, mock_confirm_orders_bulk):
+        order_ids = [
+            UUID("00000000-0000-0000-0000-000000000001"),
+            UUID("00000000-0000-0000-0000-000000000002"),
+        ]
+        mock_confirm_orders_bulk.return_value = [
+            {"order_id": str(order_ids[0]), "result": "ok"},
+            {"order_id": str(order_ids[1]), "result": "invalid_transition"},
+        ]
+
+        result = run(bulk_confirm_orders_endpoint(
+            payload=BulkOrderTransitionPayload(order_ids=order_ids),
+            jwt="token",
+            current_user={
+                "sub": "vendor-user",
+                "vendor_id": "vendor-1",
+                "app_role": "vendor",
+                "_jwt": "token",
+            },
+        ))
+
+        self.assertEqual(
+            [row["result"] for row in result["results"]],
+            ["ok", "invalid_transition"],
+        )
+        mock_confirm_orders_bulk.assert_called_once_with(
+            jwt="token",
+            order_ids=[str(order_id) for order_id in order_ids],
+            vendor_id="vendor-1",
+        )
+
+    @patch("app.routes.orders.cancel_orders_bulk")
+    def test_bulk_cancel_requires_vendor_account(self, mock_cancel_orders_bulk):
+        with self.assertRaises(HTTPException) as ctx:
+            run(bulk_cancel_orders_endpoint(
+                payload=BulkOrderTransitionPayload(
+                    order_ids=[UUID("00000000-0000-0000-0000-000000000001")],
+                ),
+                jwt="token",
+                current_user={
+                    "sub": "user-1",
+                    "vendor_id": None,
+                    "app_role": "user",
+                    "_jwt": "token",
+                },
+            ))
+
+        self.assertEqual(ctx.exception.status_code, 403)
+        mock_cancel_orders_bulk.assert_not_called()
+
     def test_cancel_requires_vendor_account(self):
         with self.assertRaises(HTTPException) as ctx:
-            cancel_order_endpoint(
+            run(cancel_order_endpoint(
                 order_id="order-1",
                 jwt="token",
                 current_user={
@@ -202,15 +362,68 @@ class OrdersRoutesTest(unittest.TestCase):
                     "app_role": "user",
                     "_jwt": "token",
                 },
-            )
+            ))
 
         self.assertEqual(ctx.exception.status_code, 403)
 
+    def test_export_requires_vendor_account(self):
+        with self.assertRaises(HTTPException) as ctx:
+            run(export_orders_endpoint(
+                scope="vendor",
+                format="csv",
+                status=None,
+                created_from=None,
+                created_to=None,
+                jwt="token",
+                current_user={"sub": "user-1", "app_role": "user", "_jwt": "token"},
+            ))
+
+        self.assertEqual(ctx.exception.status_code, 403)
+
+    @patch("app.routes.orders.iter_orders_for_export")
+    def test_export_streams_vendor_orders_as_ndjson(self, mock_iter_orders):
+        async def batches():
+            yield [{"id": "order-1"}]
+            yield [{"id": "order-2"}]
+
+        mock_iter_orders.return_value = batches()
+
+        async def export():
+            response = await export_orders_endpoint(
+                scope="vendor",
+                format="ndjson",
+                status="confirmed",
+                created_from=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                created_to=None,
+                jwt="token",
+                current_user={
+                    "sub": "vendor-user",
+                    "vendor_id": "vendor-1",
+                    "app_role": "vendor",
+                    "_jwt": "token",
+                },
+            )
+            return response, [chunk async for chunk in response.body_iterator]
+
+        response, chunks = run(export())
+
+        self.assertEqual(response.media_type, "application/x-ndjson")
+        self.assertIn("orders.ndjson", response.headers["content-disposition"])
+        self.assertEqual(b"".join(chunks), b'{"id":"order-1"}\n{"id":"order-2"}\n')
+        mock_iter_orders.assert_called_once_with(
+            "token",
+            vendor_id="vendor-1",
+            status="confirmed",
+            created_from="2026-01-01T00:00:00+00:00",
+            created_to=None,
+        )
+
     def test_refund_requires_vendor_account(self):
         with self.assertRaises(HTTPException) as ctx:
-            refund_order_route(
+            run(refund_order_route(
                 order_id=UUID("00000000-0000-0000-0000-000000000001"),
                 payload=RefundPayload(amount=5, reason="test"),
+                idempotency_key=None,
                 jwt="token",
                 current_user={
                     "sub": "user-1",
@@ -218,7 +431,7 @@ class OrdersRoutesTest(unittest.TestCase):
                     "app_role": "user",
                     "_jwt": "token",
                 },
-            )
+            ))
 
         self.assertEqual(ctx.exception.status_code, 403)
 
@@ -227,9 +440,10 @@ class OrdersRoutesTest(unittest.TestCase):
         mock_refund_order.side_effect = Exception("Refund exceeds order total")
 
         with self.assertRaises(HTTPException) as ctx:
-            refund_order_route(
+            run(refund_order_route(
                 order_id=UUID("00000000-0000-0000-0000-000000000001"),
                 payload=RefundPayload(amount=500, reason="test"),
+                idempotency_key=None,
                 jwt="token",
                 current_user={
                     "sub": "vendor-user",
@@ -237,11 +451,32 @@ class OrdersRoutesTest(unittest.TestCase):
                     "app_role": "vendor",
                     "_jwt": "token",
                 },
-            )
+            ))
 
         self.assertEqual(ctx.exception.status_code, 409)
         self.assertIn("remaining refundable amount", ctx.exception.detail)
 
+    @patch("app.routes.orders.refund_order")
+    def test_refund_maps_reused_idempotency_key_to_unprocessable(self, mock_refund_order):
+        mock_refund_order.side_effect = Exception("Idempotency key reused with a different request")
+
+        with self.assertRaises(HTTPException) as ctx:
+            run(refund_order_route(
+                order_id=UUID("00000000-0000-0000-0000-000000000001"),
+                payload=RefundPayload(amount=7, reason="test"),
+                idempotency_key="refund-1",
+                jwt="token",
+                current_user={
+                    "sub": "vendor-user",
+                    "vendor_id": "vendor-1",
+                    "app_role": "vendor",
+                    "_jwt": "token",
+                },
+            ))
+
+        self.assertEqual(ctx.exception.status_code, 422)
+        self.assertEqual(mock_refund_order.call_args.kwargs["idempotency_key"], "refund-1")
+
 
 if __name__ == "__main__":
     unittest.main()
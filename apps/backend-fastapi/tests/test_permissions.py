@@ -0,0 +1,51 @@
+import unittest
+from asyncio import run
+
+from fastapi import HTTPException
+
+from app.core.dependencies import has_permission, require_any_permission, require_permissions
+from app.core.permissions import ROLE_PERMISSIONS, PermissionMatcher, _registry, get_role_matcher
+
+
+class PermissionMatcherTest(unittest.TestCase):
+    def test_matcher_handles_global_exact_and_resource_wildcards(self):
+        matcher = PermissionMatcher(["orders.read", "users.*", "reports.daily.*"])
+
+        self.assertTrue(matcher.allows("orders.read"))
+        self.assertFalse(matcher.allows("orders.refund"))
+        self.assertTrue(matcher.allows("users.write"))
+        self.assertTrue(matcher.allows("reports.daily.export"))
+        self.assertFalse(matcher.allows("reports.weekly.export"))
+        self.assertTrue(PermissionMatcher(["*"]).allows("anything.at.all"))
+
+    def test_compiled_matchers_agree_with_list_check_for_registry(self):
+        for role, permissions in ROLE_PERMISSIONS.items():
+            matcher = get_role_matcher(role)
+            for permission in _registry["permissions"]:
+                self.assertEqual(
+                    matcher.allows(permission),
+                    has_permission(permissions, permission),
+                    f"{role} / {permission}",
+                )
+
+    def test_require_permissions_reports_missing_permissions(self):
+        checker = require_permissions(["orders.read", "users.write"])
+
+        with self.assertRaises(HTTPException) as ctx:
+            run(checker({"app_role": "user"}))
+
+        self.assertEqual(ctx.exception.status_code, 403)
+        self.assertIn("users.write", ctx.exception.detail)
+        self.assertEqual(run(checker({"app_role": "admin"}))["app_role"], "admin")
+
+    def test_require_any_permission_rejects_unknown_role(self):
+        checker = require_any_permission(["orders.read"])
+
+        with self.assertRaises(HTTPException):
+            run(checker({"app_role": "ghost"}))
+
+        self.assertEqual(run(checker({"app_role": "user"}))["app_role"], "user")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from asyncio import run
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from jose import jwt
+
+from app import pg
+from app.repositories.notifications import get_unread_count
+from app.repositories.orders import _orders_cursor_sql, _orders_export_sql, encode_cursor
+from app.repositories.products import get_products_for_vendor, list_products
+
+
+def _settings(**overrides):
+    values = {
+        "database_url": "postgresql://localhost/postgres",
+        "pg_read_paths": frozenset({"orders.list"}),
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class PgReadPathTest(unittest.TestCase):
+    def test_pg_read_enabled_is_switchable_per_path(self):
+        with patch("app.pg.settings", _settings()):
+            self.assertTrue(pg.pg_read_enabled("orders.list"))
+            self.assertFalse(pg.pg_read_enabled("products.list"))
+
+        with patch("app.pg.settings", _settings(pg_read_paths=frozenset({"*"}))):
+            self.assertTrue(pg.pg_read_enabled("products.list"))
+
+        with patch("app.pg.settings", _settings(database_url=None)):
+            self.assertFalse(pg.pg_read_enabled("orders.list"))
+
+    def test_orders_cursor_sql_uses_keyset_and_bind_params(self):
+        cursor = encode_cursor("2026-03-21T10:00:00+00:00", "order-9")
+
+        sql, args = _orders_cursor_sql(
+            vendor_id="vendor-1",
+            status="pending",
+            search="abc",
+            sort="newest",
+            cursor=cursor,
+            limit=20,
+        )
+
+        self.assertEqual(
+            args,
+            [
+                "vendor-1",
+                "abc",
+                "vendor-1",
+                "abc00000-0000-0000-0000-000000000000",
+                "abcfffff-ffff-ffff-ffff-ffffffffffff",
+                "pending",
+                "2026-03-21T10:00:00+00:00",
+                "order-9",
+                21,
+            ],
+        )
+        self.assertIn("from public.search_orders($2, $3::uuid, $4::uuid, $5::uuid) o", sql)
+        self.assertNotIn("search_text", sql)
+        self.assertIn("(o.created_at, o.id) <", sql)
+        self.assertIn("order by o.created_at desc, o.id desc", sql)
+        self.assertNotIn("abc", sql)
+
+    def test_orders_cursor_sql_lists_items_in_cart_order(self):
+        sql, _ = _orders_cursor_sql(user_id="user-1")
+
+        self.assertIn(") order by oi.line_number)", sql)
+
+    def test_orders_cursor_sql_summary_view_skips_items(self):
+        sql, _ = _orders_cursor_sql(user_id="user-1", view="summary")
+
+        self.assertIn("o.item_count, o.first_item_name", sql)
+        self.assertNotIn("order_items", sql)
+
+    def test_orders_cursor_sql_highest_seeks_on_total(self):
+        cursor = encode_cursor(42.5, "order-9", "highest")
+
+        sql, args = _orders_cursor_sql(vendor_id="vendor-1", sort="highest", cursor=cursor)
+
+        self.assertEqual(args, ["vendor-1", "42.5", "order-9", 21])
+        self.assertIn("(o.total, o.id) < ($2::text::numeric, $3::uuid)", sql)
+        self.assertIn("order by o.total desc, o.id desc", sql)
+
+    def test_orders_export_sql_embeds_items_and_refunds(self):
+        sql, args = _orders_export_sql(
+            vendor_id="vendor-1",
+            created_from="2026-01-01T00:00:00+00:00",
+            after=("2026-01-15T08:00:00+00:00", "order-9"),
+            limit=500,
+        )
+
+        self.assertEqual(
+            args,
+            [
+                "vendor-1",
+                "2026-01-01T00:00:00+00:00",
+                "2026-01-15T08:00:00+00:00",
+                "order-9",
+                500,
+            ],
+        )
+        self.assertIn("(o.created_at, o.id) > ($3::text::timestamptz, $4::uuid)", sql)
+        self.assertIn("order by o.created_at, o.id", sql)
+        self.assertIn(") order by oi.line_number)", sql)
+        self.assertIn("as order_items", sql)
+        self.assertIn("as refunds", sql)
+
+    def test_user_transaction_sets_rls_claims_and_role(self):
+        token = jwt.encode({"sub": "user-1", "role": "service_role"}, "secret")
+        conn = Mock()
+        conn.execute = AsyncMock()
+        conn.transaction.return_value = AsyncMock()
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        pool = Mock()
+        pool.acquire = acquire
+
+        async def use():
+            async with pg.user_transaction(token) as active:
+                return active
+
+        with patch("app.pg.get_pg_pool", AsyncMock(return_value=pool)):
+            active = run(use())
+
+        self.assertIs(active, conn)
+        conn.transaction.assert_called_once_with(readonly=True)
+        _, claims, role = conn.execute.await_args.args
+        self.assertIn('"sub": "user-1"', claims)
+        self.assertEqual(role, "authenticated")
+
+    @patch("app.repositories.notifications.get_async_user_client")
+    @patch("app.repositories.notifications.pg_read_enabled", return_value=True)
+    def test_unread_count_reads_from_postgres_when_enabled(self, _enabled, mock_client):
+        conn = Mock()
+        conn.fetchval = AsyncMock(return_value=4)
+
+        @asynccontextmanager
+        async def transaction(_jwt):
+            yield conn
+
+        with patch("app.repositories.notifications.user_transaction", transaction):
+            count = run(get_unread_count("token", "user-1"))
+
+        self.assertEqual(count, 4)
+        mock_client.assert_not_called()
+        self.assertEqual(conn.fetchval.await_args.args[1], "user-1")
+
+    @patch("app.repositories.products.get_async_user_client")
+    def test_product_paths_switch_independently(self, mock_client):
+        mock_client.return_value.table.return_value.select.return_value.execute = AsyncMock(
+            return_value=Mock(data=[{"id": "product-1"}])
+        )
+        conn = Mock()
+        conn.fetchval = AsyncMock(return_value='[{"id": "product-2"}]')
+
+        @asynccontextmanager
+        async def transaction(_jwt):
+            yield conn
+
+        with (
+            patch("app.pg.settings", _settings(pg_read_paths=frozenset({"products.vendor_list"}))),
+            patch("app.repositories.products.user_transaction", transaction),
+        ):
+            listed = run(list_products("token"))
+            catalog = run(get_products_for_vendor("token", "market-1", "vendor-1"))
+
+        self.assertEqual(listed, [{"id": "product-1"}])
+        self.assertEqual(catalog, [{"id": "product-2"}])
+        conn.fetchval.assert_awaited_once()
+        self.assertIn("join public.vendors v", conn.fetchval.await_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
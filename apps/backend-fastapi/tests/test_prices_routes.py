@@ -1,4 +1,5 @@
 import unittest
+from asyncio import run
 from unittest.mock import patch
 
 from app.routes.prices import read_active_prices
@@ -19,7 +20,7 @@ class PricesRoutesTest(unittest.TestCase):
             }
         ]
 
-        result = read_active_prices()
+        result = run(read_active_prices())
 
         self.assertEqual(result[0]["market_id"], "market-1")
         mock_get_active_price_agreements.assert_called_once_with()
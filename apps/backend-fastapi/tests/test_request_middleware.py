@@ -39,6 +39,7 @@ class RequestMiddlewareTest(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("X-Request-ID", response.headers)
         self.assertTrue(response.headers["X-Request-ID"])
+        self.assertIn("total;dur=", response.headers["Server-Timing"])
 
     def test_health_preserves_incoming_request_id(self):
         request = self._build_request(headers=[(b"x-request-id", b"req-123")])
@@ -0,0 +1,75 @@
+import json
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+from pydantic import BaseModel, Field
+
+from app.responses import FastJSONResponse, project, trusted_response
+from app.schemas.orders import CursorPaginatedOrders
+from app.schemas.products import ProductOut
+
+
+class ResponsesTest(unittest.TestCase):
+    def test_project_keeps_declared_fields_only(self):
+        page = {
+            "data": [
+                {
+                    "id": "order-1",
+                    "status": "pending",
+                    "order_items": [{"raw": True}],
+                    "items": [{"product_id": "p-1", "name": "Tilapia", "extra": 1}],
+                    "refunds": [],
+                    "events": [],
+                }
+            ],
+            "next_cursor": None,
+        }
+
+        result = project(CursorPaginatedOrders, page)
+
+        order = result["data"][0]
+        self.assertNotIn("order_items", order)
+        self.assertEqual(order["status"], "pending")
+        self.assertNotIn("extra", order["items"][0])
+        self.assertEqual(order["items"][0]["name"], "Tilapia")
+
+    def test_project_fills_model_defaults_for_lists(self):
+        result = project(List[ProductOut], [{"id": "p-1", "name": "Tilapia", "price": 3}])
+
+        self.assertTrue(result[0]["active"])
+        self.assertEqual(result[0]["stock_quantity"], 0)
+
+    def test_project_calls_default_factories_per_row(self):
+        class Row(BaseModel):
+            id: str
+            tags: list[str] = Field(default_factory=list)
+
+        result = project(List[Row], [{"id": "a"}, {"id": "b"}])
+
+        self.assertEqual(result, [{"id": "a", "tags": []}, {"id": "b", "tags": []}])
+        self.assertIsNot(result[0]["tags"], result[1]["tags"])
+        self.assertEqual(result, [Row(**row).model_dump() for row in result])
+
+    def test_fast_json_response_encodes_decimals(self):
+        response = FastJSONResponse({"total": Decimal("12.50")})
+
+        self.assertEqual(json.loads(response.body), {"total": 12.5})
+
+    def test_trusted_response_can_be_disabled(self):
+        content = {"data": [], "next_cursor": None}
+
+        with patch("app.responses.settings", SimpleNamespace(fast_json_responses=False)):
+            self.assertIs(trusted_response(CursorPaginatedOrders, content), content)
+
+        with patch("app.responses.settings", SimpleNamespace(fast_json_responses=True)):
+            self.assertIsInstance(
+                trusted_response(CursorPaginatedOrders, content),
+                FastJSONResponse,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+import httpx
+
+import app.db as db
+from app.timing import (
+    RequestTimings,
+    UpstreamTiming,
+    content_range_rows,
+    server_timing_header,
+    start_request_timings,
+    timed,
+    upstream_name,
+)
+
+
+class TimingTest(unittest.TestCase):
+    def test_upstream_name_uses_table_or_rpc(self):
+        self.assertEqual(upstream_name("/rest/v1/orders"), "orders")
+        self.assertEqual(upstream_name("/rest/v1/rpc/confirm_order"), "rpc.confirm_order")
+        self.assertEqual(upstream_name("/auth/v1/admin/users/1"), "auth")
+
+    def test_content_range_rows(self):
+        self.assertEqual(content_range_rows("0-19/*"), 20)
+        self.assertEqual(content_range_rows("*/0"), 0)
+        self.assertIsNone(content_range_rows(None))
+
+    def test_server_timing_header_lists_phases_upstreams_and_total(self):
+        timings = RequestTimings(
+            phases={"auth": 1.234},
+            upstream=[UpstreamTiming("orders", 20.5, rows=20, bytes=5120)],
+        )
+
+        header = server_timing_header(timings, 30.0)
+
+        self.assertEqual(
+            header,
+            'auth;dur=1.23, db0;dur=20.50;desc="orders rows=20 bytes=5120", total;dur=30.00',
+        )
+
+    def test_upstream_hooks_record_rows_and_size(self):
+        def handler(_request):
+            return httpx.Response(
+                200,
+                content=b'[{"id":1},{"id":2}]',
+                headers={"content-range": "0-1/*"},
+            )
+
+        http_client = httpx.Client(
+            transport=httpx.MockTransport(handler),
+            event_hooks={
+                "request": [db._on_upstream_request],
+                "response": [db._on_upstream_response],
+            },
+        )
+
+        timings = start_request_timings()
+        with timed("normalize"):
+            http_client.get("https://example.supabase.co/rest/v1/rpc/get_orders")
+        http_client.close()
+
+        entry = timings.upstream[0]
+        self.assertEqual(entry.name, "rpc.get_orders")
+        self.assertEqual(entry.rows, 2)
+        self.assertEqual(entry.bytes, 19)
+        self.assertIn("normalize", timings.phases)
+
+
+if __name__ == "__main__":
+    unittest.main()
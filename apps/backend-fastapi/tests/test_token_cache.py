@@ -0,0 +1,72 @@
+import time
+import unittest
+from asyncio import run
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.core import dependencies
+from app.core.token_cache import VerifiedTokenCache
+
+
+class VerifiedTokenCacheTest(unittest.TestCase):
+    def test_get_counts_hits_and_misses(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=60)
+
+        self.assertIsNone(cache.get("token-a"))
+        cache.set("token-a", {"id": "user-1", "exp": time.time() + 600})
+
+        self.assertEqual(cache.get("token-a")["id"], "user-1")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_entry_expires_at_token_exp(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=600)
+        cache.set("token-a", {"id": "user-1", "exp": time.time() - 1})
+
+        self.assertIsNone(cache.get("token-a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = VerifiedTokenCache(max_entries=2, max_ttl_seconds=60)
+        cache.set("token-a", {"id": "a"})
+        cache.set("token-b", {"id": "b"})
+        cache.get("token-a")
+        cache.set("token-c", {"id": "c"})
+
+        self.assertIsNotNone(cache.get("token-a"))
+        self.assertIsNone(cache.get("token-b"))
+        self.assertIsNotNone(cache.get("token-c"))
+
+    def test_get_current_user_verifies_signature_once_per_token(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl_seconds=60)
+        claims = {
+            "sub": "user-1",
+            "exp": time.time() + 600,
+            "app_metadata": {"role": "user"},
+        }
+        creds = SimpleNamespace(credentials="token-a")
+
+        with patch.object(dependencies, "token_cache", cache), patch.object(
+            dependencies.jwt,
+            "get_unverified_header",
+            return_value={"kid": "kid-1"},
+        ), patch.object(
+            dependencies,
+            "get_signing_key",
+            AsyncMock(return_value={"kid": "kid-1"}),
+        ), patch.object(
+            dependencies.jwt,
+            "decode",
+            side_effect=lambda *args, **kwargs: dict(claims),
+        ) as decode:
+            first = run(dependencies.get_current_user(creds))
+            second = run(dependencies.get_current_user(creds))
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first["id"], "user-1")
+        self.assertEqual(second["app_role"], "user")
+        self.assertEqual(second["_jwt"], "token-a")
+
+
+if __name__ == "__main__":
+    unittest.main()
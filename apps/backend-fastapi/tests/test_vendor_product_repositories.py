@@ -1,66 +1,70 @@
 import unittest
-from unittest.mock import Mock, patch
+from asyncio import run
+from unittest.mock import AsyncMock, Mock, patch
 
+from app.repositories.products import bulk_update_products_for_vendor
 from app.repositories.products import get_product_by_id
 from app.repositories.products import get_products_for_vendor
 from app.repositories.vendors import get_vendor
 
 
 class VendorProductRepositoriesTest(unittest.TestCase):
-    @patch("app.repositories.vendors.get_user_client")
-    def test_get_vendor_returns_none_when_row_missing(self, mock_get_user_client):
+    @patch("app.repositories.vendors.get_async_user_client")
+    def test_get_vendor_returns_none_when_row_missing(self, mock_get_async_user_client):
         query = Mock()
         query.eq.return_value = query
         query.limit.return_value = query
-        query.execute.return_value = Mock(data=[])
+        query.execute = AsyncMock(return_value=Mock(data=[]))
 
         table = Mock()
         table.select.return_value = query
 
         client = Mock()
         client.table.return_value = table
-        mock_get_user_client.return_value = client
+        mock_get_async_user_client.return_value = client
 
-        result = get_vendor("00000000-0000-0000-0000-000000000001", "token")
+        result = run(get_vendor("00000000-0000-0000-0000-000000000001", "token"))
 
         self.assertIsNone(result)
 
-    @patch("app.repositories.products.get_user_client")
-    def test_get_product_by_id_returns_none_when_row_missing(self, mock_get_user_client):
+    @patch("app.repositories.products.get_async_user_client")
+    def test_get_product_by_id_returns_none_when_row_missing(self, mock_get_async_user_client):
         query = Mock()
         query.eq.return_value = query
         query.limit.return_value = query
-        query.execute.return_value = Mock(data=[])
+        query.execute = AsyncMock(return_value=Mock(data=[]))
 
         table = Mock()
         table.select.return_value = query
 
         client = Mock()
         client.table.return_value = table
-        mock_get_user_client.return_value = client
+        mock_get_async_user_client.return_value = client
 
-        result = get_product_by_id("token", "product-1")
+        result = run(get_product_by_id("token", "product-1"))
 
         self.assertIsNone(result)
 
-    @patch("app.repositories.products.get_user_client")
-    def test_get_products_for_vendor_selects_fields_required_by_product_out(self, mock_get_user_client):
+    @patch("app.repositories.products.get_async_user_client")
+    def test_get_products_for_vendor_selects_fields_required_by_product_out(self, mock_get_async_user_client):
         query = Mock()
         query.eq.return_value = query
         query.order.return_value = query
-        query.execute.return_value = Mock(
-            data=[
-                {
-                    "id": "product-1",
-                    "name": "Tomatoes",
-                    "price": 5.5,
-                    "active": True,
-                    "stock_quantity": 12,
-                    "is_available": True,
-                    "vendor_id": "vendor-1",
-                    "created_at": "2026-04-08T00:00:00Z",
-                }
-            ]
+        query.execute = AsyncMock(
+            return_value=Mock(
+                data=[
+                    {
+                        "id": "product-1",
+                        "name": "Tomatoes",
+                        "price": 5.5,
+                        "active": True,
+                        "stock_quantity": 12,
+                        "is_available": True,
+                        "vendor_id": "vendor-1",
+                        "created_at": "2026-04-08T00:00:00Z",
+                    }
+                ]
+            ),
         )
 
         table = Mock()
@@ -68,12 +72,14 @@ class VendorProductRepositoriesTest(unittest.TestCase):
 
         client = Mock()
         client.table.return_value = table
-        mock_get_user_client.return_value = client
-
-        result = get_products_for_vendor(
-            jwt="token",
-            market_id="market-1",
-            vendor_id="vendor-1",
+        mock_get_async_user_client.return_value = client
+
+        result = run(
+            get_products_for_vendor(
+                jwt="token",
+                market_id="market-1",
+                vendor_id="vendor-1",
+            )
         )
 
         self.assertEqual(result[0]["vendor_id"], "vendor-1")
@@ -83,6 +89,59 @@ class VendorProductRepositoriesTest(unittest.TestCase):
         self.assertIn("is_available", select_sql)
         self.assertIn("vendor_id", select_sql)
 
+    @patch("app.repositories.products.get_async_user_client")
+    def test_bulk_update_products_sends_one_rpc(self, mock_get_async_user_client):
+        rpc = Mock()
+        rpc.execute = AsyncMock(
+            return_value=Mock(
+                data={"updated": [{"id": "product-1", "price": 4.5}], "rejected": ["product-2"]}
+            ),
+        )
+
+        client = Mock()
+        client.rpc.return_value = rpc
+        mock_get_async_user_client.return_value = client
+
+        products = [
+            {"id": "product-1", "price": 4.5},
+            {"id": "product-2", "name": "Catfish"},
+            {"id": "product-3"},
+        ]
+        result = run(
+            bulk_update_products_for_vendor(
+                jwt="token",
+                vendor_id="vendor-1",
+                products=products,
+            )
+        )
+
+        self.assertEqual(result["rejected"], ["product-2"])
+        client.table.assert_not_called()
+        client.rpc.assert_called_once_with(
+            "bulk_update_products",
+            {
+                "p_vendor_id": "vendor-1",
+                "p_items": [
+                    {"id": "product-1", "price": 4.5},
+                    {"id": "product-2", "name": "Catfish"},
+                ],
+            },
+        )
+        self.assertEqual(products[0], {"id": "product-1", "price": 4.5})
+
+    @patch("app.repositories.products.get_async_user_client")
+    def test_bulk_update_products_skips_rpc_without_changes(self, mock_get_async_user_client):
+        result = run(
+            bulk_update_products_for_vendor(
+                jwt="token",
+                vendor_id="vendor-1",
+                products=[{"id": "product-1"}],
+            )
+        )
+
+        self.assertEqual(result, {"updated": [], "rejected": []})
+        mock_get_async_user_client.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from asyncio import run
 from unittest.mock import patch
 from uuid import UUID
 
@@ -42,10 +43,10 @@ class VendorRoutesTest(unittest.TestCase):
             market_id="00000000-0000-0000-0000-000000000001",
         )
 
-        result = create_vendor_route(
+        result = run(create_vendor_route(
             payload=payload,
             current_user={"_jwt": "token"},
-        )
+        ))
 
         self.assertEqual(result["name"], "North Stall")
         mock_create_vendor.assert_called_once_with(
@@ -65,14 +66,14 @@ class VendorRoutesTest(unittest.TestCase):
             "created_at": "2026-03-23T00:00:00Z",
         }
 
-        result = create_vendor_for_market(
+        result = run(create_vendor_for_market(
             market_id=UUID("00000000-0000-0000-0000-000000000001"),
             payload=VendorCreate(
                 name="Fresh Fields",
                 market_id="00000000-0000-0000-0000-000000000001",
             ),
             jwt="token",
-        )
+        ))
 
         self.assertEqual(result["name"], "Fresh Fields")
         mock_create_vendor.assert_called_once_with(
@@ -88,13 +89,13 @@ class VendorRoutesTest(unittest.TestCase):
         mock_create_vendor.return_value = None
 
         with self.assertRaises(HTTPException) as ctx:
-            create_vendor_route(
+            run(create_vendor_route(
                 payload=VendorCreate(
                     name="North Stall",
                     market_id="00000000-0000-0000-0000-000000000001",
                 ),
                 current_user={"_jwt": "token"},
-            )
+            ))
 
         self.assertEqual(ctx.exception.status_code, 403)
 
@@ -10,6 +10,7 @@ interface RequestOptions {
   body?: unknown;
   auth?: boolean;
   signal?: AbortSignal;
+  idempotencyKey?: string;
 }
 
 export class ApiError extends Error {
@@ -37,7 +38,7 @@ export function setApiAuthToken(token: string | null) {
 ========================= */
 
 export async function apiRequest<T>(endpoint: string, options: RequestOptions = {}): Promise<T> {
-  const { method = 'GET', body, signal } = options;
+  const { method = 'GET', body, signal, idempotencyKey } = options;
 
   const headers: Record<string, string> = {
     'Content-Type': 'application/json',
@@ -47,6 +48,10 @@ export async function apiRequest<T>(endpoint: string, options: RequestOptions =
     headers.Authorization = `Bearer ${authToken}`;
   }
 
+  if (idempotencyKey) {
+    headers['Idempotency-Key'] = idempotencyKey;
+  }
+
   const res = await fetch(`${ENV.API_URL}${endpoint}`, {
     method,
     headers,
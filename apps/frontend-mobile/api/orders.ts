@@ -1,5 +1,5 @@
 import { apiRequest } from './client';
-import { Order } from './types';
+import { Order, OrderEvent, OrderSummary } from './types';
 
 /* =========================
    Types
@@ -27,10 +27,16 @@ export type OrdersSummary = {
    API
 ========================= */
 
-export function createOrder(marketId: string, vendorId: string, payload: CreateOrderPayload) {
+export function createOrder(
+  marketId: string,
+  vendorId: string,
+  payload: CreateOrderPayload,
+  idempotencyKey?: string
+) {
   return apiRequest<Order>(`/markets/${marketId}/vendors/${vendorId}/orders`, {
     method: 'POST',
     body: payload,
+    idempotencyKey,
   });
 }
 
@@ -46,12 +52,44 @@ export function cancelOrder(orderId: string) {
   });
 }
 
+export type BulkOrderTransitionResult = {
+  order_id: string;
+  result: 'ok' | 'invalid_transition' | 'not_found';
+};
+
+export function confirmOrdersBulk(orderIds: string[]) {
+  return apiRequest<{ results: BulkOrderTransitionResult[] }>('/orders/bulk/confirm', {
+    method: 'POST',
+    body: { order_ids: orderIds },
+  });
+}
+
+export function cancelOrdersBulk(orderIds: string[]) {
+  return apiRequest<{ results: BulkOrderTransitionResult[] }>('/orders/bulk/cancel', {
+    method: 'POST',
+    body: { order_ids: orderIds },
+  });
+}
+
 export function getOrder(orderId: string) {
   return apiRequest<Order>(`/orders/${orderId}`, {
     method: 'GET',
   });
 }
 
+export type CursorPaginatedOrderEvents = {
+  data: OrderEvent[];
+  next_cursor: string | null;
+};
+
+/**
+ * Older order events, newest first. Start from `order.events_next_cursor`.
+ */
+export function fetchOrderEvents(orderId: string, cursor: string, limit = 20) {
+  const query = new URLSearchParams({ cursor, limit: String(limit) });
+  return apiRequest<CursorPaginatedOrderEvents>(`/orders/${orderId}/events?${query.toString()}`);
+}
+
 export function fetchMyOrders(): Promise<Order[]> {
   return fetchOrdersCursor({
     scope: 'user',
@@ -68,6 +106,11 @@ export type CursorPaginatedOrders = {
   next_cursor: string | null;
 };
 
+export type CursorPaginatedOrderSummaries = {
+  data: OrderSummary[];
+  next_cursor: string | null;
+};
+
 export type FetchOrdersParams = {
   scope?: 'user' | 'vendor' | 'admin';
   status?: string;
@@ -75,6 +118,7 @@ export type FetchOrdersParams = {
   search?: string;
   cursor?: string | null;
   limit?: number;
+  view?: 'summary' | 'full';
   signal?: AbortSignal;
 };
 
@@ -87,6 +131,7 @@ export async function fetchOrdersCursor(params: FetchOrdersParams): Promise<Curs
   if (params.search) query.append('search', params.search);
   if (params.cursor) query.append('cursor', params.cursor);
   if (params.limit) query.append('limit', String(params.limit));
+  if (params.view) query.append('view', params.view);
 
   const endpoint = `/orders?${query.toString()}`;
 
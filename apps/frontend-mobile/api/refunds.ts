@@ -1,9 +1,10 @@
 import { apiRequest } from './client';
 import { Order, IssueRefundPayload } from './types';
 
-export function issueRefund(orderId: string, payload: IssueRefundPayload) {
+export function issueRefund(orderId: string, payload: IssueRefundPayload, idempotencyKey?: string) {
   return apiRequest<Order>(`/orders/${orderId}/refund`, {
     method: 'POST',
     body: payload,
+    idempotencyKey,
   });
 }
@@ -27,6 +27,20 @@ export interface Order {
   refunded_total: number;
   refunds: Refund[];
   events: OrderEvent[];
+  events_next_cursor?: string | null;
+}
+
+export interface OrderSummary {
+  id: string;
+  market_id: string;
+  vendor_id: string;
+  user_id: string;
+  status: Order['status'];
+  created_at: string;
+  total: number;
+  refunded_total: number;
+  item_count: number;
+  first_item_name: string | null;
 }
 
 // types.ts
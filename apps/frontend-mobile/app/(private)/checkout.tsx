@@ -1,11 +1,15 @@
 import { View, Text, Pressable, ActivityIndicator, Alert } from 'react-native';
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useRouter } from 'expo-router';
 import { createOrder, confirmOrder } from '../../api/orders';
 import { useAppStore } from '../../store/useAppStore';
 import { Order } from '../../api/types';
 import { useCartStore } from '../../store/useCartStore';
 
+function newIdempotencyKey() {
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 export default function CheckoutScreen() {
   const router = useRouter();
 
@@ -23,6 +27,15 @@ export default function CheckoutScreen() {
   const [loading, setLoading] = useState(false);
   const [order, setOrder] = useState<Order | null>(null);
 
+  // Reused when checkout is retried, so a request that reached the API
+  // before the connection dropped doesn't create a second order. A new
+  // cart, or a placed order, gets a new key.
+  const idempotencyKey = useRef(newIdempotencyKey());
+
+  useEffect(() => {
+    idempotencyKey.current = newIdempotencyKey();
+  }, [marketId, vendorId, items]);
+
   /* ---------- Guard invalid access ---------- */
   if (!marketId || !vendorId || items.length === 0) {
     return (
@@ -44,11 +57,17 @@ export default function CheckoutScreen() {
     try {
       setLoading(true);
 
-      const createdOrder = await createOrder(safeMarketId, safeVendorId, {
-        user_id: user.id,
-        items,
-      });
-
+      const createdOrder = await createOrder(
+        safeMarketId,
+        safeVendorId,
+        {
+          user_id: user.id,
+          items,
+        },
+        idempotencyKey.current
+      );
+
+      idempotencyKey.current = newIdempotencyKey();
       setOrder(createdOrder);
       setActiveOrderId(createdOrder.id);
       lockCart(); // 🔒
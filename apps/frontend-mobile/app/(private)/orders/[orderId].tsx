@@ -1,9 +1,9 @@
-import { useState, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect, useRef } from 'react';
 import { View, ActivityIndicator, Pressable, Alert, TextInput } from 'react-native';
 import { useLocalSearchParams, useFocusEffect, router } from 'expo-router';
 import { Screen, AppText } from '../../../components';
-import { getOrder, cancelOrder } from '../../../api/orders';
-import { Order } from '../../../api/types';
+import { getOrder, cancelOrder, fetchOrderEvents } from '../../../api/orders';
+import { Order, OrderEvent } from '../../../api/types';
 import { usePolling } from '../../../hooks/usePolling';
 import { issueRefund } from '../../../api/refunds';
 import { formatOrderEvent } from '../../../utils/orderEvents';
@@ -21,6 +21,12 @@ export default function OrderDetailsScreen() {
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
   const [notFound, setNotFound] = useState(false);
 
+  /* ---------- Older events (paged) ---------- */
+  const [olderEvents, setOlderEvents] = useState<OrderEvent[]>([]);
+  const [eventsCursor, setEventsCursor] = useState<string | null>(null);
+  const [loadingEvents, setLoadingEvents] = useState(false);
+  const orderRef = useRef<Order | null>(null);
+
   /* ---------- Status ---------- */
   const status = order?.status;
   const isPending = status === 'pending';
@@ -36,16 +42,33 @@ export default function OrderDetailsScreen() {
   const [refunding, setRefunding] = useState(false);
 
   /* ---------- Fetch ---------- */
-  const loadOrder = useCallback(async () => {
+  // Polling keeps paged events: events that drop off the latest page move
+  // into olderEvents, so the cursor still points past the oldest one shown.
+  const loadOrder = useCallback(async (options?: { resetEvents?: boolean }) => {
     if (!orderId) return;
 
     try {
       setErrorMessage(null);
       setNotFound(false);
       const data = await getOrder(orderId);
+      const previous = orderRef.current;
+
+      if (options?.resetEvents || !previous || previous.id !== data.id) {
+        setOlderEvents([]);
+        setEventsCursor(data.events_next_cursor ?? null);
+      } else {
+        const latestIds = new Set(data.events.map((event) => event.id));
+        const dropped = previous.events.filter((event) => !latestIds.has(event.id));
+
+        if (dropped.length > 0) {
+          setOlderEvents((current) => [...current, ...dropped]);
+        }
+      }
 
+      orderRef.current = data;
       setOrder(data);
     } catch (error: any) {
+      orderRef.current = null;
       setOrder(null);
       if (error instanceof ApiError && error.status === 404) {
         setNotFound(true);
@@ -57,8 +80,13 @@ export default function OrderDetailsScreen() {
     }
   }, [orderId]);
 
+  const refreshOrder = useCallback(() => loadOrder({ resetEvents: true }), [loadOrder]);
+
   useEffect(() => {
+    orderRef.current = null;
     setOrder(null);
+    setOlderEvents([]);
+    setEventsCursor(null);
     setLoading(true);
     setErrorMessage(null);
     setNotFound(false);
@@ -67,12 +95,28 @@ export default function OrderDetailsScreen() {
   useFocusEffect(
     useCallback(() => {
       setLoading(true);
-      loadOrder();
-    }, [loadOrder])
+      refreshOrder();
+    }, [refreshOrder])
   );
 
   usePolling(loadOrder, 3000, Boolean(isPending && orderId));
 
+  async function loadOlderEvents() {
+    if (!orderId || !eventsCursor) return;
+
+    try {
+      setLoadingEvents(true);
+      const page = await fetchOrderEvents(orderId, eventsCursor);
+
+      setOlderEvents((current) => [...page.data.slice().reverse(), ...current]);
+      setEventsCursor(page.next_cursor);
+    } catch (e: any) {
+      Alert.alert('Error', e.message ?? 'Failed to load older events');
+    } finally {
+      setLoadingEvents(false);
+    }
+  }
+
   /* ---------- Cancel ---------- */
   async function handleCancelOrder() {
     if (!order || !isPending) return;
@@ -132,7 +176,7 @@ export default function OrderDetailsScreen() {
 
   /* ---------- Ledger-safe totals ---------- */
   const itemsTotal = order?.items?.reduce((sum, i) => sum + i.line_total, 0) ?? 0;
-  const refundedTotal = order?.refunds?.reduce((sum, r) => sum + r.amount, 0) ?? 0;
+  const refundedTotal = order?.refunded_total ?? 0;
 
   const remaining = Math.max(itemsTotal - refundedTotal, 0);
 
@@ -163,7 +207,7 @@ export default function OrderDetailsScreen() {
       <Screen className="gap-4">
         <AppText variant="title">Unable to load order</AppText>
         <AppText>{errorMessage ?? 'Something went wrong while loading this order.'}</AppText>
-        <Pressable onPress={loadOrder} className="rounded-xl bg-black p-4">
+        <Pressable onPress={refreshOrder} className="rounded-xl bg-black p-4">
           <AppText className="text-center font-semibold text-white">Retry</AppText>
         </Pressable>
       </Screen>
@@ -320,7 +364,14 @@ export default function OrderDetailsScreen() {
           </View>
         </View>
       )}
-      {order.events.map((event) => (
+      {eventsCursor && (
+        <Pressable disabled={loadingEvents} onPress={loadOlderEvents}>
+          <AppText className="text-blue-600">
+            {loadingEvents ? 'Loading...' : 'Show older activity'}
+          </AppText>
+        </Pressable>
+      )}
+      {[...olderEvents, ...order.events].map((event) => (
         <View key={event.id}>
           <AppText>{formatOrderEvent(event)}</AppText>
           <AppText>{new Date(event.created_at).toLocaleString()}</AppText>
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from uuid import uuid4
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "apps" / "backend-fastapi"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.config import settings  # noqa: E402
+
+
+LINE_COUNTS = (1, 10, 100)
+
+# Shared by every worker so concurrent carts overlap and contend for the
+# same product rows, in a different order each time.
+PRODUCT_POOL_SIZE = 200
+
+
+async def _setup(conn) -> tuple[str, str, list[str]]:
+    market_id = await conn.fetchval(
+        "insert into public.markets (name, location) values ($1, 'benchmark') returning id",
+        f"benchmark-{uuid4().hex[:8]}",
+    )
+    vendor_id = await conn.fetchval(
+        "insert into public.vendors (market_id, name) values ($1, 'benchmark vendor') returning id",
+        market_id,
+    )
+    rows = await conn.fetch(
+        """
+        insert into public.products (market_id, vendor_id, name, price, stock_quantity)
+        select $1, $2, 'benchmark product ' || n, 1.00, 1000000000
+        from generate_series(1, $3) as n
+        returning id
+        """,
+        market_id,
+        vendor_id,
+        PRODUCT_POOL_SIZE,
+    )
+    return market_id, vendor_id, [row["id"] for row in rows]
+
+
+async def _cleanup(conn, market_id: str, vendor_id: str) -> None:
+    await conn.execute("delete from public.orders where vendor_id = $1", vendor_id)
+    await conn.execute(
+        "delete from public.order_summary_counters where scope = 'vendor' and scope_id = $1",
+        vendor_id,
+    )
+    await conn.execute("delete from public.markets where id = $1", market_id)
+
+
+async def _run(
+    pool,
+    *,
+    market_id: str,
+    vendor_id: str,
+    customer_id: str,
+    product_ids: list[str],
+    lines: int,
+    orders: int,
+    concurrency: int,
+) -> dict:
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    remaining = iter(range(orders))
+
+    async def worker() -> None:
+        async with pool.acquire() as conn:
+            for _ in remaining:
+                items = [
+                    {"product_id": str(product_id), "quantity": 1}
+                    for product_id in random.sample(product_ids, lines)
+                ]
+                started_at = time.perf_counter()
+                try:
+                    await conn.fetchval(
+                        "select (public.create_order_atomic($1, $2, $3, $4::jsonb)).id",
+                        market_id,
+                        vendor_id,
+                        customer_id,
+                        json.dumps(items),
+                    )
+                except Exception as exc:
+                    errors[getattr(exc, "sqlstate", None) or type(exc).__name__] += 1
+                    continue
+                latencies.append((time.perf_counter() - started_at) * 1000)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "ok": len(latencies),
+        "errors": dict(errors),
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+async def _main(args: argparse.Namespace) -> int:
+    import asyncpg
+
+    pool = await asyncpg.create_pool(
+        args.database_url,
+        min_size=args.concurrency,
+        max_size=args.concurrency,
+        statement_cache_size=0,
+    )
+
+    async with pool.acquire() as conn:
+        market_id, vendor_id, product_ids = await _setup(conn)
+
+    try:
+        print(f"{args.orders} orders per run, {args.concurrency} concurrent connections")
+        print(f"{'lines':>5}  {'ok':>5}  {'p50 ms':>8}  {'p95 ms':>8}  {'orders/s':>9}  errors")
+        for lines in args.lines:
+            result = await _run(
+                pool,
+                market_id=market_id,
+                vendor_id=vendor_id,
+                customer_id=args.customer_id,
+                product_ids=product_ids,
+                lines=lines,
+                orders=args.orders,
+                concurrency=args.concurrency,
+            )
+            print(
+                f"{lines:>5}  {result['ok']:>5}  {result['p50']:>8.2f}  "
+                f"{result['p95']:>8.2f}  {result['throughput']:>9.1f}  "
+                f"{result['errors'] or '-'}"
+            )
+    finally:
+        async with pool.acquire() as conn:
+            await _cleanup(conn, market_id, vendor_id)
+        await pool.close()
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark create_order_atomic against a scratch market. "
+            "Needs a database you can write to; 40P01 in the errors column "
+            "means a deadlock."
+        ),
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument(
+        "--customer-id",
+        required=True,
+        help="Existing auth.users id to place the orders as.",
+    )
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--lines",
+        type=lambda value: [int(part) for part in value.split(",")],
+        default=list(LINE_COUNTS),
+    )
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        parser.error("DATABASE_URL or --database-url is required")
+
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
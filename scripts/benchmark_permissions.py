@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "apps" / "backend-fastapi"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.dependencies import has_permission  # noqa: E402
+from app.core.permissions import (  # noqa: E402
+    ROLE_PERMISSIONS,
+    _registry,
+    get_role_matcher,
+)
+
+
+def _cases() -> list[tuple[str, str]]:
+    permissions = [perm for perm in _registry["permissions"] if perm != "*"]
+    return [
+        (role, permission)
+        for role in sorted(ROLE_PERMISSIONS)
+        for permission in permissions
+    ]
+
+
+def _check_equivalence(cases: list[tuple[str, str]]) -> list[str]:
+    mismatches: list[str] = []
+
+    for role, permission in cases:
+        legacy = has_permission(ROLE_PERMISSIONS[role], permission)
+        compiled = get_role_matcher(role).allows(permission)
+        if legacy != compiled:
+            mismatches.append(
+                f"{role} / {permission}: legacy={legacy} compiled={compiled}"
+            )
+
+    return mismatches
+
+
+def main(number: int = 2000) -> int:
+    cases = _cases()
+
+    mismatches = _check_equivalence(cases)
+    if mismatches:
+        for mismatch in mismatches:
+            print(mismatch)
+        return 1
+
+    def legacy() -> None:
+        for role, permission in cases:
+            has_permission(ROLE_PERMISSIONS.get(role, []), permission)
+
+    def compiled() -> None:
+        for role, permission in cases:
+            get_role_matcher(role).allows(permission)
+
+    legacy_seconds = min(timeit.repeat(legacy, number=number, repeat=5))
+    compiled_seconds = min(timeit.repeat(compiled, number=number, repeat=5))
+    checks = len(cases) * number
+
+    print(f"roles={len(ROLE_PERMISSIONS)} permissions={len(cases) // len(ROLE_PERMISSIONS)} checks={checks}")
+    print(f"legacy   {legacy_seconds * 1e9 / checks:8.1f} ns/check")
+    print(f"compiled {compiled_seconds * 1e9 / checks:8.1f} ns/check")
+    print(f"speedup  {legacy_seconds / compiled_seconds:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
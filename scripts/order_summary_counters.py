@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "apps" / "backend-fastapi"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.repositories.orders import (  # noqa: E402
+    check_order_summary_counters,
+    rebuild_order_summary_counters,
+)
+
+
+def _print_drift(rows: list[dict]) -> None:
+    for row in rows:
+        print(
+            f"{row['scope']}:{row['scope_id']} status={row['status']} "
+            f"count={row['actual_count']} (expected {row['expected_count']}) "
+            f"amount={row['actual_amount']} (expected {row['expected_amount']})"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Rebuild or check the order_summary_counters table.",
+    )
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        rows = rebuild_order_summary_counters()
+        print(f"Rebuilt order summary counters ({rows} rows).")
+        return 0
+
+    drift = check_order_summary_counters()
+    if drift:
+        _print_drift(drift)
+        print(f"Order summary counters are out of sync ({len(drift)} rows).")
+        return 1
+
+    print("Order summary counters are consistent.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
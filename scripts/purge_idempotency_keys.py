@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "apps" / "backend-fastapi"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.repositories.idempotency import purge_expired_idempotency_keys  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Delete expired rows from public.idempotency_keys.",
+    )
+    parser.parse_args(argv)
+
+    deleted = purge_expired_idempotency_keys()
+    print(f"Purged {deleted} expired idempotency keys.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,28 @@
+-- Composite (sort key, id) indexes for keyset pagination of order lists.
+-- Each index matches one `order by <key>, id` the API issues, so the
+-- `(key, id) < (cursor)` seek starts directly at the next page.
+
+-- Vendor scope
+create index if not exists idx_orders_vendor_created_id
+on public.orders(vendor_id, created_at desc, id desc);
+create index if not exists idx_orders_vendor_status_created_id
+on public.orders(vendor_id, status, created_at desc, id desc);
+create index if not exists idx_orders_vendor_total_id
+on public.orders(vendor_id, total desc, id desc);
+
+-- Customer scope
+create index if not exists idx_orders_user_created_id
+on public.orders(user_id, created_at desc, id desc);
+
+-- Admin scope
+create index if not exists idx_orders_created_id
+on public.orders(created_at desc, id desc);
+create index if not exists idx_orders_status_created_id
+on public.orders(status, created_at desc, id desc);
+create index if not exists idx_orders_total_id
+on public.orders(total desc, id desc);
+
+-- Superseded by the indexes above (same leading columns).
+drop index if exists public.idx_orders_user_created;
+drop index if exists public.idx_orders_vendor_created;
+drop index if exists public.idx_orders_status;
@@ -0,0 +1,66 @@
+-- Indexed order search (GET /orders?search=).
+--
+-- - Order id prefixes ("#3f2a9c1e") are turned into an id range by the
+--   API and use the primary key.
+-- - Customer email and product names are kept in orders.search_text,
+--   lowercased, behind a trigram index so `ilike '%term%'` stays an
+--   index scan.
+
+create extension if not exists pg_trgm;
+
+alter table public.orders
+add column if not exists search_text text;
+
+create index if not exists idx_orders_search_text_trgm
+on public.orders using gin (search_text gin_trgm_ops);
+
+-- Security definer: customer emails live in auth.users.
+create or replace function public.refresh_order_search_text()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  update public.orders o
+  set search_text = s.search_text
+  from (
+    select
+      oi.order_id,
+      lower(concat_ws(' ', u.email, string_agg(p.name, ' ' order by p.name))) as search_text
+    from public.order_items oi
+    join public.orders so on so.id = oi.order_id
+    join public.products p on p.id = oi.product_id
+    left join auth.users u on u.id = so.user_id
+    where oi.order_id in (select distinct order_id from new_items)
+    group by oi.order_id, u.email
+  ) s
+  where o.id = s.order_id;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_refresh_order_search_text on public.order_items;
+
+create trigger trg_refresh_order_search_text
+after insert on public.order_items
+referencing new table as new_items
+for each statement
+execute function public.refresh_order_search_text();
+
+-- Backfill existing orders.
+update public.orders o
+set search_text = s.search_text
+from (
+  select
+    oi.order_id,
+    lower(concat_ws(' ', u.email, string_agg(p.name, ' ' order by p.name))) as search_text
+  from public.order_items oi
+  join public.orders so on so.id = oi.order_id
+  join public.products p on p.id = oi.product_id
+  left join auth.users u on u.id = so.user_id
+  group by oi.order_id, u.email
+) s
+where o.id = s.order_id
+  and o.search_text is null;
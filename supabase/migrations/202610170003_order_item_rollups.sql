@@ -0,0 +1,66 @@
+-- Per-order item rollups for the summary view of GET /orders
+-- (view=summary): the list reads two columns instead of embedding
+-- order_items and products for every row.
+--
+-- refresh_order_item_rollups() replaces refresh_order_search_text() so
+-- one statement-level trigger keeps all derived order columns in step.
+
+alter table public.orders
+add column if not exists item_count integer not null default 0,
+add column if not exists first_item_name text;
+
+create or replace function public.refresh_order_item_rollups()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  update public.orders o
+  set item_count = s.item_count,
+      first_item_name = s.first_item_name,
+      search_text = s.search_text
+  from (
+    select
+      oi.order_id,
+      count(*)::integer as item_count,
+      min(p.name) as first_item_name,
+      lower(concat_ws(' ', u.email, string_agg(p.name, ' ' order by p.name))) as search_text
+    from public.order_items oi
+    join public.orders so on so.id = oi.order_id
+    join public.products p on p.id = oi.product_id
+    left join auth.users u on u.id = so.user_id
+    where oi.order_id in (select distinct order_id from new_items)
+    group by oi.order_id, u.email
+  ) s
+  where o.id = s.order_id;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_refresh_order_search_text on public.order_items;
+drop function if exists public.refresh_order_search_text();
+
+drop trigger if exists trg_refresh_order_item_rollups on public.order_items;
+
+create trigger trg_refresh_order_item_rollups
+after insert on public.order_items
+referencing new table as new_items
+for each statement
+execute function public.refresh_order_item_rollups();
+
+-- Backfill existing orders.
+update public.orders o
+set item_count = s.item_count,
+    first_item_name = s.first_item_name
+from (
+  select
+    oi.order_id,
+    count(*)::integer as item_count,
+    min(p.name) as first_item_name
+  from public.order_items oi
+  join public.products p on p.id = oi.product_id
+  group by oi.order_id
+) s
+where o.id = s.order_id;
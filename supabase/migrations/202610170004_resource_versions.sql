@@ -0,0 +1,122 @@
+-- Versions for conditional GETs (ETag / If-None-Match).
+--
+-- - Single orders carry orders.version, bumped on every update and on
+--   new refunds (GET /orders/{id}).
+-- - Collections get a row in resource_versions, bumped by triggers:
+--     orders:vendor:<vendor_id>, orders:user:<user_id>   (/orders/summary)
+--     notifications:user:<user_id>                        (/notifications)
+--     products:vendor:<vendor_id>                         (product lists)
+--   A missing row reads as version 0.
+
+alter table public.orders
+add column if not exists version bigint not null default 1;
+
+create table if not exists public.resource_versions (
+  key text primary key,
+  version bigint not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+-- Read by the API with the service role only.
+alter table public.resource_versions enable row level security;
+
+create or replace function public.bump_resource_version(p_key text)
+returns void
+language sql
+as $$
+  insert into public.resource_versions (key, version)
+  values (p_key, 1)
+  on conflict (key) do update
+  set version = public.resource_versions.version + 1,
+      updated_at = now();
+$$;
+
+revoke execute on function public.bump_resource_version(text) from public, anon, authenticated;
+
+-- Trigger arguments are (key prefix, column) pairs, e.g.
+-- ('orders:vendor', 'vendor_id') bumps `orders:vendor:<row.vendor_id>`.
+create or replace function public.bump_row_resource_versions()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_row jsonb;
+  v_index integer := 0;
+begin
+  if tg_op = 'DELETE' then
+    v_row := to_jsonb(old);
+  else
+    v_row := to_jsonb(new);
+  end if;
+
+  while v_index < tg_nargs loop
+    if v_row ->> tg_argv[v_index + 1] is not null then
+      perform public.bump_resource_version(
+        tg_argv[v_index] || ':' || (v_row ->> tg_argv[v_index + 1])
+      );
+    end if;
+    v_index := v_index + 2;
+  end loop;
+
+  return null;
+end;
+$$;
+
+create or replace function public.increment_order_version()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.version := old.version + 1;
+  return new;
+end;
+$$;
+
+create or replace function public.touch_order_version()
+returns trigger
+language plpgsql
+as $$
+begin
+  update public.orders
+  set version = version + 1
+  where id = new.order_id;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_increment_order_version on public.orders;
+drop trigger if exists trg_orders_resource_versions on public.orders;
+drop trigger if exists trg_refunds_touch_order_version on public.refunds;
+drop trigger if exists trg_notifications_resource_versions on public.notifications;
+drop trigger if exists trg_products_resource_versions on public.products;
+
+create trigger trg_increment_order_version
+before update on public.orders
+for each row
+execute function public.increment_order_version();
+
+create trigger trg_orders_resource_versions
+after insert or update or delete on public.orders
+for each row
+execute function public.bump_row_resource_versions(
+  'orders:vendor', 'vendor_id',
+  'orders:user', 'user_id'
+);
+
+create trigger trg_refunds_touch_order_version
+after insert on public.refunds
+for each row
+execute function public.touch_order_version();
+
+create trigger trg_notifications_resource_versions
+after insert or update or delete on public.notifications
+for each row
+execute function public.bump_row_resource_versions('notifications:user', 'user_id');
+
+create trigger trg_products_resource_versions
+after insert or update or delete on public.products
+for each row
+execute function public.bump_row_resource_versions('products:vendor', 'vendor_id');
@@ -0,0 +1,209 @@
+-- Incrementally maintained order summary counters.
+--
+-- One row per (vendor|user, status). The counters change in the same
+-- transaction as the order itself: create_order_atomic,
+-- confirm_order_atomic, cancel_order_atomic and refund_order_atomic all
+-- write orders, and the trigger below applies the delta.
+-- orders_summary_by_scope now reads these rows instead of scanning
+-- every order of the vendor or user.
+--
+-- Maintenance (service role):
+--   select public.rebuild_order_summary_counters();
+--   select * from public.check_order_summary_counters();
+-- or `pnpm orders:summary-counters rebuild|check` in apps/backend-fastapi.
+
+create table if not exists public.order_summary_counters (
+  scope text not null check (scope in ('vendor', 'user')),
+  scope_id uuid not null,
+  status text not null,
+  order_count bigint not null default 0,
+  total_amount numeric(14,2) not null default 0,
+  primary key (scope, scope_id, status)
+);
+
+-- Read through orders_summary_by_scope only.
+alter table public.order_summary_counters enable row level security;
+
+create or replace function public.apply_order_summary_delta(
+  p_vendor_id uuid,
+  p_user_id uuid,
+  p_status text,
+  p_count integer,
+  p_amount numeric
+)
+returns void
+language sql
+as $$
+  -- Vendor row first, then user row: a fixed lock order.
+  insert into public.order_summary_counters as c (scope, scope_id, status, order_count, total_amount)
+  values
+    ('vendor', p_vendor_id, p_status, p_count, p_amount),
+    ('user', p_user_id, p_status, p_count, p_amount)
+  on conflict (scope, scope_id, status) do update
+  set order_count = c.order_count + excluded.order_count,
+      total_amount = c.total_amount + excluded.total_amount;
+$$;
+
+revoke execute on function public.apply_order_summary_delta(uuid, uuid, text, integer, numeric)
+from public, anon, authenticated;
+
+create or replace function public.maintain_order_summary_counters()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  if tg_op = 'UPDATE'
+     and new.status = old.status
+     and new.total = old.total
+     and new.vendor_id = old.vendor_id
+     and new.user_id = old.user_id then
+    return null;
+  end if;
+
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform public.apply_order_summary_delta(old.vendor_id, old.user_id, old.status, -1, -old.total);
+  end if;
+
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform public.apply_order_summary_delta(new.vendor_id, new.user_id, new.status, 1, new.total);
+  end if;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_maintain_order_summary_counters on public.orders;
+
+create trigger trg_maintain_order_summary_counters
+after insert or update or delete on public.orders
+for each row
+execute function public.maintain_order_summary_counters();
+
+create or replace function public.orders_summary_by_scope(
+  scope_column text,
+  scope_value uuid
+)
+returns table (
+  total_orders bigint,
+  pending bigint,
+  confirmed bigint,
+  canceled bigint,
+  total_revenue numeric
+)
+language plpgsql
+stable
+security definer
+set search_path = ''
+as $$
+declare
+  v_scope text;
+begin
+  if scope_column = 'vendor_id' then
+    v_scope := 'vendor';
+  elsif scope_column = 'user_id' then
+    v_scope := 'user';
+  else
+    raise exception 'Unsupported scope column';
+  end if;
+
+  -- Counters bypass RLS, so only the caller's own scope may be read.
+  if coalesce(auth.jwt() ->> 'role', '') <> 'service_role'
+     and not (v_scope = 'user' and scope_value = auth.uid())
+     and not (
+       v_scope = 'vendor'
+       and scope_value::text = auth.jwt() -> 'app_metadata' ->> 'vendor_id'
+     ) then
+    raise exception 'Not allowed to read this summary';
+  end if;
+
+  return query
+  select
+    coalesce(sum(c.order_count), 0)::bigint,
+    coalesce(sum(c.order_count) filter (where c.status = 'pending'), 0)::bigint,
+    coalesce(sum(c.order_count) filter (where c.status = 'confirmed'), 0)::bigint,
+    coalesce(sum(c.order_count) filter (where c.status = 'canceled'), 0)::bigint,
+    coalesce(sum(c.total_amount) filter (where c.status in ('confirmed', 'refunded')), 0)
+  from public.order_summary_counters c
+  where c.scope = v_scope
+    and c.scope_id = scope_value;
+end;
+$$;
+
+create or replace function public.rebuild_order_summary_counters()
+returns bigint
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_rows bigint;
+begin
+  -- Blocks order writes (not reads) until the rebuild commits.
+  lock table public.orders in share mode;
+
+  delete from public.order_summary_counters;
+
+  insert into public.order_summary_counters (scope, scope_id, status, order_count, total_amount)
+  select 'vendor', o.vendor_id, o.status, count(*), coalesce(sum(o.total), 0)
+  from public.orders o
+  group by o.vendor_id, o.status
+  union all
+  select 'user', o.user_id, o.status, count(*), coalesce(sum(o.total), 0)
+  from public.orders o
+  group by o.user_id, o.status;
+
+  get diagnostics v_rows = row_count;
+  return v_rows;
+end;
+$$;
+
+create or replace function public.check_order_summary_counters()
+returns table (
+  scope text,
+  scope_id uuid,
+  status text,
+  expected_count bigint,
+  actual_count bigint,
+  expected_amount numeric,
+  actual_amount numeric
+)
+language sql
+stable
+security definer
+set search_path = ''
+as $$
+  with expected as (
+    select 'vendor'::text as scope, o.vendor_id as scope_id, o.status,
+           count(*) as order_count, coalesce(sum(o.total), 0) as total_amount
+    from public.orders o
+    group by o.vendor_id, o.status
+    union all
+    select 'user'::text, o.user_id, o.status,
+           count(*), coalesce(sum(o.total), 0)
+    from public.orders o
+    group by o.user_id, o.status
+  )
+  select
+    coalesce(e.scope, c.scope),
+    coalesce(e.scope_id, c.scope_id),
+    coalesce(e.status, c.status),
+    coalesce(e.order_count, 0),
+    coalesce(c.order_count, 0),
+    coalesce(e.total_amount, 0),
+    coalesce(c.total_amount, 0)
+  from expected e
+  full join public.order_summary_counters c
+    on c.scope = e.scope
+   and c.scope_id = e.scope_id
+   and c.status = e.status
+  where coalesce(e.order_count, 0) <> coalesce(c.order_count, 0)
+     or coalesce(e.total_amount, 0) <> coalesce(c.total_amount, 0);
+$$;
+
+revoke execute on function public.rebuild_order_summary_counters() from public, anon, authenticated;
+revoke execute on function public.check_order_summary_counters() from public, anon, authenticated;
+
+-- Backfill.
+select public.rebuild_order_summary_counters();
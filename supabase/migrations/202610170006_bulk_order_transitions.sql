@@ -0,0 +1,136 @@
+-- Bulk confirm / cancel for vendor order queues
+-- (POST /orders/bulk/confirm, POST /orders/bulk/cancel).
+--
+-- One call per batch. Each requested id gets a result:
+--   ok                  transition applied
+--   invalid_transition  the vendor's order is not pending
+--   not_found           no such order for this vendor
+-- Orders (and, for cancel, products) are locked in id order, so two
+-- overlapping batches can't deadlock.
+
+create or replace function public.confirm_orders_bulk(
+  p_order_ids uuid[],
+  p_vendor_id uuid
+)
+returns table (order_id uuid, result text)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+  v_confirmed uuid[];
+begin
+  perform 1
+  from public.orders o
+  where o.id = any(p_order_ids)
+    and o.vendor_id = p_vendor_id
+  order by o.id
+  for update;
+
+  with updated as (
+    update public.orders o
+    set status = 'confirmed'
+    where o.id = any(p_order_ids)
+      and o.vendor_id = p_vendor_id
+      and o.status = 'pending'
+    returning o.id
+  )
+  select coalesce(array_agg(updated.id), '{}')
+  into v_confirmed
+  from updated;
+
+  insert into public.order_events (order_id, event)
+  select confirmed_id, 'confirmed'
+  from unnest(v_confirmed) as confirmed_id;
+
+  return query
+  select
+    r.id,
+    case
+      when r.id = any(v_confirmed) then 'ok'
+      when exists (
+        select 1 from public.orders o
+        where o.id = r.id and o.vendor_id = p_vendor_id
+      ) then 'invalid_transition'
+      else 'not_found'
+    end
+  from (select distinct unnest(p_order_ids) as id) r;
+end;
+$$;
+
+create or replace function public.cancel_orders_bulk(
+  p_order_ids uuid[],
+  p_vendor_id uuid
+)
+returns table (order_id uuid, result text)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+  v_canceled uuid[];
+  v_order_id uuid;
+begin
+  perform 1
+  from public.orders o
+  where o.id = any(p_order_ids)
+    and o.vendor_id = p_vendor_id
+  order by o.id
+  for update;
+
+  with updated as (
+    update public.orders o
+    set status = 'canceled'
+    where o.id = any(p_order_ids)
+      and o.vendor_id = p_vendor_id
+      and o.status = 'pending'
+    returning o.id
+  )
+  select coalesce(array_agg(updated.id order by updated.id), '{}')
+  into v_canceled
+  from updated;
+
+  perform 1
+  from public.products p
+  where p.id in (
+    select oi.product_id
+    from public.order_items oi
+    where oi.order_id = any(v_canceled)
+  )
+  order by p.id
+  for update;
+
+  -- Restock per order so each inventory event references its order.
+  perform set_config('app.inventory_event_cause', 'order_canceled', true);
+  foreach v_order_id in array v_canceled
+  loop
+    perform set_config('app.inventory_reference_order_id', v_order_id::text, true);
+
+    update public.products p
+    set stock_quantity = p.stock_quantity + i.quantity,
+        is_available = true
+    from (
+      select oi.product_id, sum(oi.quantity)::integer as quantity
+      from public.order_items oi
+      where oi.order_id = v_order_id
+      group by oi.product_id
+    ) i
+    where p.id = i.product_id;
+  end loop;
+
+  insert into public.order_events (order_id, event)
+  select canceled_id, 'canceled'
+  from unnest(v_canceled) as canceled_id;
+
+  return query
+  select
+    r.id,
+    case
+      when r.id = any(v_canceled) then 'ok'
+      when exists (
+        select 1 from public.orders o
+        where o.id = r.id and o.vendor_id = p_vendor_id
+      ) then 'invalid_transition'
+      else 'not_found'
+    end
+  from (select distinct unnest(p_order_ids) as id) r;
+end;
+$$;
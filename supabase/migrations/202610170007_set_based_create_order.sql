@@ -0,0 +1,121 @@
+-- Set-based create_order_atomic.
+--
+-- The previous version looped over p_items: one SELECT ... FOR UPDATE,
+-- two set_config calls, one UPDATE and one INSERT per line, locking
+-- products in cart order. Two carts listing the same products in a
+-- different order could deadlock.
+--
+-- Now:
+-- - duplicate lines are merged per product;
+-- - every product is locked in one statement, in id order;
+-- - availability and stock are validated as a set;
+-- - the order is inserted with its final total;
+-- - stock is decremented and order_items inserted with one statement each.
+
+create or replace function public.create_order_atomic(
+  p_market_id uuid,
+  p_vendor_id uuid,
+  p_customer_id uuid,
+  p_items jsonb
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_order public.orders;
+  v_product_ids uuid[];
+  v_quantities integer[];
+  v_locked integer;
+  v_total numeric(12,2);
+begin
+  if jsonb_array_length(coalesce(p_items, '[]'::jsonb)) = 0 then
+    raise exception 'Order must contain at least one item';
+  end if;
+
+  select
+    array_agg(r.product_id order by r.product_id),
+    array_agg(r.quantity order by r.product_id)
+  into v_product_ids, v_quantities
+  from (
+    select
+      (item ->> 'product_id')::uuid as product_id,
+      sum((item ->> 'quantity')::integer)::integer as quantity
+    from jsonb_array_elements(p_items) as item
+    group by 1
+  ) r;
+
+  if exists (select 1 from unnest(v_quantities) as quantity where quantity <= 0) then
+    raise exception 'Quantity must be greater than zero';
+  end if;
+
+  select count(*)
+  into v_locked
+  from (
+    select p.id
+    from public.products p
+    where p.id = any(v_product_ids)
+      and p.vendor_id = p_vendor_id
+      and p.market_id = p_market_id
+      and p.active = true
+      and p.is_available = true
+    order by p.id
+    for update
+  ) locked;
+
+  if v_locked <> cardinality(v_product_ids) then
+    raise exception 'Product not found or unavailable';
+  end if;
+
+  if exists (
+    select 1
+    from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+    join public.products p on p.id = r.product_id
+    where p.stock_quantity < r.quantity
+  ) then
+    raise exception 'Insufficient stock';
+  end if;
+
+  select sum(p.price * r.quantity)
+  into v_total
+  from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+  join public.products p on p.id = r.product_id;
+
+  insert into public.orders (market_id, vendor_id, user_id, total)
+  values (p_market_id, p_vendor_id, p_customer_id, v_total)
+  returning * into v_order;
+
+  perform set_config('app.inventory_event_cause', 'order_created', true);
+  perform set_config('app.inventory_reference_order_id', v_order.id::text, true);
+
+  update public.products p
+  set stock_quantity = p.stock_quantity - r.quantity,
+      is_available = case
+        when p.stock_quantity - r.quantity > 0 then p.is_available
+        else false
+      end
+  from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+  where p.id = r.product_id;
+
+  insert into public.order_items (
+    order_id,
+    product_id,
+    quantity,
+    unit_price,
+    line_total
+  )
+  select
+    v_order.id,
+    p.id,
+    r.quantity,
+    p.price,
+    p.price * r.quantity
+  from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+  join public.products p on p.id = r.product_id
+  order by p.id;
+
+  insert into public.order_events (order_id, event)
+  values (v_order.id, 'created');
+
+  return v_order;
+end;
+$$;
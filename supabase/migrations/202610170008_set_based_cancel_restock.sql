@@ -0,0 +1,183 @@
+-- Set-based restock in cancel_order_atomic.
+--
+-- The previous version looped over order_items: two set_config calls
+-- and one UPDATE products per line, and the row-level inventory trigger
+-- inserted one inventory_events row per product update.
+--
+-- Now:
+-- - the order-state check still runs first;
+-- - the order's products are locked in id order, like create_order_atomic;
+-- - every line is restocked with one UPDATE (duplicate lines summed);
+-- - inventory_events for product updates are written by a
+--   statement-level trigger, one INSERT per UPDATE statement.
+--
+-- Event types and causes are unchanged: a cancel still records
+-- `restock` / `order_canceled` with reference_order_id set.
+
+-- -------------------------------------------------
+-- Inventory audit: inserts stay per row, updates are per statement
+-- -------------------------------------------------
+create or replace function public.log_inventory_event()
+returns trigger
+language plpgsql
+as $$
+begin
+  insert into public.inventory_events (
+    product_id,
+    vendor_id,
+    market_id,
+    event_type,
+    cause,
+    stock_quantity_after,
+    change_amount,
+    is_available_after
+  )
+  values (
+    new.id,
+    new.vendor_id,
+    new.market_id,
+    'created',
+    'product_created',
+    new.stock_quantity,
+    new.stock_quantity,
+    new.is_available
+  );
+
+  return new;
+end;
+$$;
+
+create or replace function public.log_inventory_update_events()
+returns trigger
+language plpgsql
+as $$
+declare
+  v_cause text;
+  v_reference_order_id uuid;
+begin
+  v_cause := coalesce(
+    nullif(current_setting('app.inventory_event_cause', true), ''),
+    'manual_edit'
+  );
+  v_reference_order_id := nullif(
+    current_setting('app.inventory_reference_order_id', true),
+    ''
+  )::uuid;
+
+  insert into public.inventory_events (
+    product_id,
+    vendor_id,
+    market_id,
+    event_type,
+    cause,
+    reference_order_id,
+    stock_quantity_before,
+    stock_quantity_after,
+    change_amount,
+    is_available_before,
+    is_available_after
+  )
+  select
+    n.id,
+    n.vendor_id,
+    n.market_id,
+    e.event_type,
+    case
+      when e.event_type = 'availability_change' and v_cause = 'manual_edit'
+        then 'manual_availability'
+      else v_cause
+    end,
+    v_reference_order_id,
+    o.stock_quantity,
+    n.stock_quantity,
+    coalesce(n.stock_quantity, 0) - coalesce(o.stock_quantity, 0),
+    o.is_available,
+    n.is_available
+  from new_products n
+  join old_products o on o.id = n.id
+  cross join lateral (
+    select case
+      when n.stock_quantity < o.stock_quantity then 'decrement'
+      when n.stock_quantity > o.stock_quantity then
+        case
+          when v_cause = 'order_canceled' or o.stock_quantity = 0 then 'restock'
+          else 'manual_adjustment'
+        end
+      else 'availability_change'
+    end as event_type
+  ) e
+  where n.stock_quantity <> o.stock_quantity
+     or n.is_available is distinct from o.is_available;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_log_inventory_event on public.products;
+drop trigger if exists trg_log_inventory_update_events on public.products;
+
+create trigger trg_log_inventory_event
+after insert on public.products
+for each row
+execute function public.log_inventory_event();
+
+create trigger trg_log_inventory_update_events
+after update on public.products
+referencing old table as old_products new table as new_products
+for each statement
+execute function public.log_inventory_update_events();
+
+-- -------------------------------------------------
+-- cancel_order_atomic
+-- -------------------------------------------------
+create or replace function public.cancel_order_atomic(
+  p_order_id uuid,
+  p_vendor_id uuid
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_order public.orders;
+begin
+  update public.orders
+  set status = 'canceled'
+  where id = p_order_id
+    and vendor_id = p_vendor_id
+    and status = 'pending'
+  returning * into v_order;
+
+  if not found then
+    raise exception 'Invalid order status transition';
+  end if;
+
+  perform 1
+  from public.products p
+  where p.id in (
+    select oi.product_id
+    from public.order_items oi
+    where oi.order_id = p_order_id
+  )
+  order by p.id
+  for update;
+
+  perform set_config('app.inventory_event_cause', 'order_canceled', true);
+  perform set_config('app.inventory_reference_order_id', p_order_id::text, true);
+
+  update public.products p
+  set stock_quantity = p.stock_quantity + i.quantity,
+      is_available = true
+  from (
+    select oi.product_id, sum(oi.quantity)::integer as quantity
+    from public.order_items oi
+    where oi.order_id = p_order_id
+    group by oi.product_id
+  ) i
+  where p.id = i.product_id;
+
+  insert into public.order_events (order_id, event)
+  values (p_order_id, 'canceled');
+
+  return v_order;
+end;
+$$;
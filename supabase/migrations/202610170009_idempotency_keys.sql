@@ -0,0 +1,202 @@
+-- Idempotency keys for order creation and refunds.
+--
+-- Clients send an Idempotency-Key header on
+--   POST /markets/{market_id}/vendors/{vendor_id}/orders
+--   POST /orders/{order_id}/refund
+-- and the API calls the *_idempotent wrappers below instead of the
+-- atomic RPCs. The first call claims the key, runs the operation and
+-- stores its result in the same transaction; a retry with the same key
+-- gets the stored row back without locking products or writing refunds.
+--
+-- Keys are scoped per user and per operation. Reusing a key with a
+-- different request body raises 'Idempotency key reused with a
+-- different request'. Expired keys can be claimed again and are
+-- removed by purge_expired_idempotency_keys() (service role), or
+-- `pnpm idempotency:purge` in apps/backend-fastapi.
+
+create table if not exists public.idempotency_keys (
+  user_id uuid not null references auth.users(id) on delete cascade,
+  scope text not null check (scope in ('create_order', 'refund_order')),
+  key text not null,
+  request_hash text not null,
+  response jsonb,
+  created_at timestamptz not null default now(),
+  expires_at timestamptz not null,
+  primary key (user_id, scope, key)
+);
+
+create index if not exists idx_idempotency_keys_expires
+on public.idempotency_keys(expires_at);
+
+-- Reached through the functions below only.
+alter table public.idempotency_keys enable row level security;
+
+-- Returns the stored response for a replay, or null once the caller
+-- holds the key and should run the operation. A concurrent request
+-- with the same key waits here until the first one commits or rolls
+-- back.
+create or replace function public.claim_idempotency_key(
+  p_scope text,
+  p_key text,
+  p_request_hash text,
+  p_ttl_seconds integer
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_user_id uuid := auth.uid();
+  v_existing public.idempotency_keys;
+begin
+  if v_user_id is null then
+    raise exception 'Not authenticated';
+  end if;
+
+  insert into public.idempotency_keys as k (user_id, scope, key, request_hash, expires_at)
+  values (
+    v_user_id,
+    p_scope,
+    p_key,
+    p_request_hash,
+    now() + make_interval(secs => p_ttl_seconds)
+  )
+  on conflict (user_id, scope, key) do update
+  set request_hash = excluded.request_hash,
+      response = null,
+      created_at = now(),
+      expires_at = excluded.expires_at
+  where k.expires_at <= now();
+
+  if found then
+    return null;
+  end if;
+
+  select *
+  into v_existing
+  from public.idempotency_keys k
+  where k.user_id = v_user_id
+    and k.scope = p_scope
+    and k.key = p_key;
+
+  if v_existing.request_hash <> p_request_hash then
+    raise exception 'Idempotency key reused with a different request';
+  end if;
+
+  return v_existing.response;
+end;
+$$;
+
+create or replace function public.store_idempotency_response(
+  p_scope text,
+  p_key text,
+  p_response jsonb
+)
+returns void
+language sql
+security definer
+set search_path = ''
+as $$
+  update public.idempotency_keys
+  set response = p_response
+  where user_id = auth.uid()
+    and scope = p_scope
+    and key = p_key
+    and response is null;
+$$;
+
+create or replace function public.create_order_idempotent(
+  p_idempotency_key text,
+  p_ttl_seconds integer,
+  p_market_id uuid,
+  p_vendor_id uuid,
+  p_customer_id uuid,
+  p_items jsonb
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_stored jsonb;
+  v_order public.orders;
+begin
+  v_stored := public.claim_idempotency_key(
+    'create_order',
+    p_idempotency_key,
+    md5(jsonb_build_object(
+      'market_id', p_market_id,
+      'vendor_id', p_vendor_id,
+      'customer_id', p_customer_id,
+      'items', p_items
+    )::text),
+    p_ttl_seconds
+  );
+
+  if v_stored is not null then
+    return jsonb_populate_record(null::public.orders, v_stored);
+  end if;
+
+  v_order := public.create_order_atomic(p_market_id, p_vendor_id, p_customer_id, p_items);
+
+  perform public.store_idempotency_response('create_order', p_idempotency_key, to_jsonb(v_order));
+
+  return v_order;
+end;
+$$;
+
+create or replace function public.refund_order_idempotent(
+  p_idempotency_key text,
+  p_ttl_seconds integer,
+  p_order_id uuid,
+  p_amount numeric,
+  p_reason text,
+  p_vendor_id uuid
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_stored jsonb;
+  v_order public.orders;
+begin
+  v_stored := public.claim_idempotency_key(
+    'refund_order',
+    p_idempotency_key,
+    md5(jsonb_build_object(
+      'order_id', p_order_id,
+      'amount', p_amount,
+      'reason', p_reason,
+      'vendor_id', p_vendor_id
+    )::text),
+    p_ttl_seconds
+  );
+
+  if v_stored is not null then
+    return jsonb_populate_record(null::public.orders, v_stored);
+  end if;
+
+  v_order := public.refund_order_atomic(p_order_id, p_amount, p_reason, p_vendor_id);
+
+  perform public.store_idempotency_response('refund_order', p_idempotency_key, to_jsonb(v_order));
+
+  return v_order;
+end;
+$$;
+
+create or replace function public.purge_expired_idempotency_keys()
+returns integer
+language plpgsql
+as $$
+declare
+  v_deleted integer;
+begin
+  delete from public.idempotency_keys
+  where expires_at <= now();
+
+  get diagnostics v_deleted = row_count;
+  return v_deleted;
+end;
+$$;
+
+revoke execute on function public.purge_expired_idempotency_keys() from public, anon, authenticated;
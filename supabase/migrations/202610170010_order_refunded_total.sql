@@ -0,0 +1,95 @@
+-- Denormalized refunded_total on orders.
+--
+-- refund_order_atomic summed every refund of the order on each new
+-- refund, and the API summed them again on every read. The running
+-- total now lives on the order row: the refund RPC checks and bumps it
+-- under the order's row lock, so the check no longer depends on the
+-- number of earlier refunds, and list queries can return it without
+-- embedding refunds.
+--
+-- Since every refund now updates its order, trg_increment_order_version
+-- already bumps orders.version; the separate refunds trigger is dropped.
+
+alter table public.orders
+add column if not exists refunded_total numeric(12,2) not null default 0;
+
+update public.orders o
+set refunded_total = r.refunded_total
+from (
+  select order_id, sum(amount) as refunded_total
+  from public.refunds
+  group by order_id
+) r
+where o.id = r.order_id
+  and o.refunded_total is distinct from r.refunded_total;
+
+alter table public.orders
+drop constraint if exists orders_refunded_total_check;
+
+alter table public.orders
+add constraint orders_refunded_total_check
+check (refunded_total >= 0 and refunded_total <= total);
+
+create or replace function public.refund_order_atomic(
+  p_order_id uuid,
+  p_amount numeric,
+  p_reason text,
+  p_vendor_id uuid
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_order public.orders;
+  v_event text;
+begin
+  if p_amount <= 0 then
+    raise exception 'Refund amount must be greater than zero';
+  end if;
+
+  select *
+  into v_order
+  from public.orders
+  where id = p_order_id
+    and vendor_id = p_vendor_id
+  for update;
+
+  if not found then
+    raise exception 'Order not found';
+  end if;
+
+  if v_order.status not in ('confirmed', 'refunded') then
+    raise exception 'Invalid order status transition';
+  end if;
+
+  if v_order.refunded_total + p_amount > v_order.total then
+    raise exception 'Refund exceeds order total';
+  end if;
+
+  insert into public.refunds (order_id, amount, reason)
+  values (p_order_id, p_amount, p_reason);
+
+  update public.orders
+  set refunded_total = refunded_total + p_amount,
+      status = case
+        when refunded_total + p_amount = total then 'refunded'
+        else status
+      end
+  where id = p_order_id
+  returning * into v_order;
+
+  if v_order.refunded_total = v_order.total then
+    v_event := 'refunded_full';
+  else
+    v_event := 'refunded_partial';
+  end if;
+
+  insert into public.order_events (order_id, event, amount, reason)
+  values (p_order_id, v_event, p_amount, p_reason);
+
+  return v_order;
+end;
+$$;
+
+drop trigger if exists trg_refunds_touch_order_version on public.refunds;
+drop function if exists public.touch_order_version();
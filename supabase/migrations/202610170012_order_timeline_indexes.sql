@@ -0,0 +1,12 @@
+-- Order timeline indexes.
+--
+-- GET /orders/{id} embeds the most recent order_events and every refund,
+-- and GET /orders/{id}/events pages older events by (created_at, id).
+-- Both read newest first for one order; without these every detail read
+-- scanned all events and refunds.
+
+create index if not exists idx_order_events_order_created
+on public.order_events(order_id, created_at desc, id desc);
+
+create index if not exists idx_refunds_order_created
+on public.refunds(order_id, created_at desc);
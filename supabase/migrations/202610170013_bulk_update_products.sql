@@ -0,0 +1,86 @@
+-- Single-round-trip bulk product update.
+--
+-- bulk_update_products_for_vendor sent one UPDATE products request per
+-- item. bulk_update_products applies the whole batch in one statement:
+--
+-- - p_items is a JSON array of {id, ...fields}; only the keys present
+--   in an item are written, so {"id": ..., "price": 4} leaves the name
+--   alone. Unknown keys are ignored.
+-- - the ownership guard is the same as before (vendor_id = p_vendor_id)
+--   and RLS still applies, since the function runs as the caller;
+-- - rows are locked in id order first, like the order RPCs;
+-- - if an id appears more than once, its last item wins.
+--
+-- Returns {"updated": [product rows], "rejected": [ids]} where rejected
+-- lists the ids that matched no product of the vendor, in input order.
+--
+-- The single UPDATE fires trg_log_inventory_update_events once, so stock
+-- and availability changes still get their inventory_events rows
+-- (`manual_edit` / `manual_availability`).
+
+create or replace function public.bulk_update_products(
+  p_vendor_id uuid,
+  p_items jsonb
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_result jsonb;
+begin
+  perform 1
+  from public.products p
+  where p.vendor_id = p_vendor_id
+    and p.id in (
+      select (i.item->>'id')::uuid
+      from jsonb_array_elements(p_items) as i(item)
+    )
+  order by p.id
+  for update;
+
+  perform set_config('app.inventory_event_cause', 'manual_edit', true);
+  perform set_config('app.inventory_reference_order_id', '', true);
+
+  with items as (
+    select distinct on ((i.item->>'id')::uuid)
+      (i.item->>'id')::uuid as id,
+      i.position,
+      i.item - 'id' as fields
+    from jsonb_array_elements(p_items) with ordinality as i(item, position)
+    order by (i.item->>'id')::uuid, i.position desc
+  ),
+  updated as (
+    update public.products p
+    set name = case when i.fields ? 'name' then i.fields->>'name' else p.name end,
+        price = case when i.fields ? 'price' then (i.fields->>'price')::numeric else p.price end,
+        active = case when i.fields ? 'active' then (i.fields->>'active')::boolean else p.active end,
+        stock_quantity = case
+          when i.fields ? 'stock_quantity' then (i.fields->>'stock_quantity')::integer
+          else p.stock_quantity
+        end,
+        is_available = case
+          when i.fields ? 'is_available' then (i.fields->>'is_available')::boolean
+          else p.is_available
+        end
+    from items i
+    where p.id = i.id
+      and p.vendor_id = p_vendor_id
+    returning p.*
+  )
+  select jsonb_build_object(
+    'updated', coalesce(
+      jsonb_agg(to_jsonb(u) order by i.position) filter (where u.id is not null),
+      '[]'::jsonb
+    ),
+    'rejected', coalesce(
+      jsonb_agg(i.id order by i.position) filter (where u.id is null),
+      '[]'::jsonb
+    )
+  )
+  into v_result
+  from items i
+  left join updated u on u.id = i.id;
+
+  return v_result;
+end;
+$$;
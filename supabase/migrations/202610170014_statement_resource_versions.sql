@@ -0,0 +1,144 @@
+-- Statement-level resource_versions triggers.
+--
+-- The row-level triggers bumped orders:vendor:<id>, products:vendor:<id>
+-- and notifications:user:<id> once per affected row. A checkout that
+-- updates 100 products hit the same resource_versions row 100 times, and
+-- concurrent writes for one vendor queued on it once per row.
+--
+-- The triggers now run once per statement and read the transition
+-- tables. Each distinct key is bumped once, in key order, so two
+-- statements that touch overlapping scopes lock them in the same order.
+-- Postgres allows transition tables on single-event triggers only, so
+-- each table gets one trigger per event. Updates bump the keys of both
+-- the old and the new rows, e.g. when a product moves to another vendor.
+
+-- Trigger arguments are (key prefix, column) pairs, as before.
+create or replace function public.bump_statement_resource_versions()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_keys text[] := '{}';
+  v_part text[];
+  v_index integer := 0;
+  v_sources text[];
+  v_source text;
+begin
+  v_sources := case tg_op
+    when 'INSERT' then array['new_rows']
+    when 'DELETE' then array['old_rows']
+    else array['new_rows', 'old_rows']
+  end;
+
+  while v_index < tg_nargs loop
+    foreach v_source in array v_sources loop
+      execute format(
+        'select coalesce(array_agg(distinct %L || '':'' || %I::text), ''{}'') from %I where %I is not null',
+        tg_argv[v_index],
+        tg_argv[v_index + 1],
+        v_source,
+        tg_argv[v_index + 1]
+      )
+      into v_part;
+
+      v_keys := v_keys || v_part;
+    end loop;
+    v_index := v_index + 2;
+  end loop;
+
+  insert into public.resource_versions (key, version)
+  select distinct k.key, 1
+  from unnest(v_keys) as k(key)
+  order by k.key
+  on conflict (key) do update
+  set version = public.resource_versions.version + 1,
+      updated_at = now();
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_orders_resource_versions on public.orders;
+drop trigger if exists trg_notifications_resource_versions on public.notifications;
+drop trigger if exists trg_products_resource_versions on public.products;
+drop function if exists public.bump_row_resource_versions();
+
+-- orders
+drop trigger if exists trg_orders_resource_versions_insert on public.orders;
+drop trigger if exists trg_orders_resource_versions_update on public.orders;
+drop trigger if exists trg_orders_resource_versions_delete on public.orders;
+
+create trigger trg_orders_resource_versions_insert
+after insert on public.orders
+referencing new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions(
+  'orders:vendor', 'vendor_id',
+  'orders:user', 'user_id'
+);
+
+create trigger trg_orders_resource_versions_update
+after update on public.orders
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions(
+  'orders:vendor', 'vendor_id',
+  'orders:user', 'user_id'
+);
+
+create trigger trg_orders_resource_versions_delete
+after delete on public.orders
+referencing old table as old_rows
+for each statement
+execute function public.bump_statement_resource_versions(
+  'orders:vendor', 'vendor_id',
+  'orders:user', 'user_id'
+);
+
+-- notifications
+drop trigger if exists trg_notifications_resource_versions_insert on public.notifications;
+drop trigger if exists trg_notifications_resource_versions_update on public.notifications;
+drop trigger if exists trg_notifications_resource_versions_delete on public.notifications;
+
+create trigger trg_notifications_resource_versions_insert
+after insert on public.notifications
+referencing new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions('notifications:user', 'user_id');
+
+create trigger trg_notifications_resource_versions_update
+after update on public.notifications
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions('notifications:user', 'user_id');
+
+create trigger trg_notifications_resource_versions_delete
+after delete on public.notifications
+referencing old table as old_rows
+for each statement
+execute function public.bump_statement_resource_versions('notifications:user', 'user_id');
+
+-- products
+drop trigger if exists trg_products_resource_versions_insert on public.products;
+drop trigger if exists trg_products_resource_versions_update on public.products;
+drop trigger if exists trg_products_resource_versions_delete on public.products;
+
+create trigger trg_products_resource_versions_insert
+after insert on public.products
+referencing new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions('products:vendor', 'vendor_id');
+
+create trigger trg_products_resource_versions_update
+after update on public.products
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function public.bump_statement_resource_versions('products:vendor', 'vendor_id');
+
+create trigger trg_products_resource_versions_delete
+after delete on public.products
+referencing old table as old_rows
+for each statement
+execute function public.bump_statement_resource_versions('products:vendor', 'vendor_id');
@@ -0,0 +1,84 @@
+-- Statement-level order summary counters.
+--
+-- apply_order_summary_delta locked the vendor row and then the user row,
+-- order by order. A bulk confirm/cancel touches many orders, so two
+-- statements covering overlapping vendors and customers in a different
+-- order could deadlock on the counter rows.
+--
+-- The counters are now maintained once per statement: the deltas of
+-- every affected order are summed per (scope, scope_id, status) from the
+-- transition tables and upserted sorted by that key, so every writer
+-- locks counter rows in the same order. Deltas that cancel out (e.g. an
+-- update that leaves status and total alone) are skipped. Postgres
+-- allows transition tables on single-event triggers only, so orders gets
+-- one trigger per event.
+
+create or replace function public.maintain_order_summary_counters()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_rows text;
+begin
+  v_rows := case tg_op
+    when 'INSERT' then
+      'select vendor_id, user_id, status, 1 as order_count, total as total_amount from new_rows'
+    when 'DELETE' then
+      'select vendor_id, user_id, status, -1 as order_count, -total as total_amount from old_rows'
+    else
+      'select vendor_id, user_id, status, 1 as order_count, total as total_amount from new_rows
+       union all
+       select vendor_id, user_id, status, -1, -total from old_rows'
+  end;
+
+  execute format(
+    $sql$
+    insert into public.order_summary_counters as c (scope, scope_id, status, order_count, total_amount)
+    select d.scope, d.scope_id, d.status, sum(d.order_count), sum(d.total_amount)
+    from (
+      select 'vendor'::text as scope, r.vendor_id as scope_id, r.status, r.order_count, r.total_amount
+      from (%1$s) r
+      union all
+      select 'user'::text, r.user_id, r.status, r.order_count, r.total_amount
+      from (%1$s) r
+    ) d
+    group by d.scope, d.scope_id, d.status
+    having sum(d.order_count) <> 0 or sum(d.total_amount) <> 0
+    order by d.scope, d.scope_id, d.status
+    on conflict (scope, scope_id, status) do update
+    set order_count = c.order_count + excluded.order_count,
+        total_amount = c.total_amount + excluded.total_amount
+    $sql$,
+    v_rows
+  );
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_maintain_order_summary_counters on public.orders;
+drop trigger if exists trg_order_summary_counters_insert on public.orders;
+drop trigger if exists trg_order_summary_counters_update on public.orders;
+drop trigger if exists trg_order_summary_counters_delete on public.orders;
+
+create trigger trg_order_summary_counters_insert
+after insert on public.orders
+referencing new table as new_rows
+for each statement
+execute function public.maintain_order_summary_counters();
+
+create trigger trg_order_summary_counters_update
+after update on public.orders
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function public.maintain_order_summary_counters();
+
+create trigger trg_order_summary_counters_delete
+after delete on public.orders
+referencing old table as old_rows
+for each statement
+execute function public.maintain_order_summary_counters();
+
+drop function if exists public.apply_order_summary_delta(uuid, uuid, text, integer, numeric);
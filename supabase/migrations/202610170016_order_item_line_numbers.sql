@@ -0,0 +1,199 @@
+-- Cart order on order_items, and first_item_name from it.
+--
+-- first_item_name was min(product name), the alphabetically first name
+-- rather than the first line of the order. Order items had nothing that
+-- recorded cart order (random uuid ids, no timestamp, and
+-- create_order_atomic inserts lines in product id order for locking),
+-- so order_items gets a line_number: 1-based position of the product's
+-- first line in the cart, duplicates merged as before.
+--
+-- Order items also get a created_at. Existing rows take their order's
+-- created_at, so their cart order is not recoverable: they are numbered
+-- by (created_at, id), which is at least stable across vacuums and
+-- restores, unlike physical order.
+
+alter table public.order_items
+add column if not exists created_at timestamptz not null default now();
+
+update public.order_items oi
+set created_at = o.created_at
+from public.orders o
+where o.id = oi.order_id
+  and oi.created_at <> o.created_at;
+
+alter table public.order_items
+add column if not exists line_number integer;
+
+update public.order_items oi
+set line_number = n.line_number
+from (
+  select
+    id,
+    row_number() over (partition by order_id order by created_at, id)::integer as line_number
+  from public.order_items
+) n
+where oi.id = n.id
+  and oi.line_number is null;
+
+alter table public.order_items
+alter column line_number set not null;
+
+create or replace function public.create_order_atomic(
+  p_market_id uuid,
+  p_vendor_id uuid,
+  p_customer_id uuid,
+  p_items jsonb
+)
+returns public.orders
+language plpgsql
+as $$
+declare
+  v_order public.orders;
+  v_product_ids uuid[];
+  v_quantities integer[];
+  v_positions bigint[];
+  v_locked integer;
+  v_total numeric(12,2);
+begin
+  if jsonb_array_length(coalesce(p_items, '[]'::jsonb)) = 0 then
+    raise exception 'Order must contain at least one item';
+  end if;
+
+  select
+    array_agg(r.product_id order by r.product_id),
+    array_agg(r.quantity order by r.product_id),
+    array_agg(r.position order by r.product_id)
+  into v_product_ids, v_quantities, v_positions
+  from (
+    select
+      (item ->> 'product_id')::uuid as product_id,
+      sum((item ->> 'quantity')::integer)::integer as quantity,
+      min(position) as position
+    from jsonb_array_elements(p_items) with ordinality as i(item, position)
+    group by 1
+  ) r;
+
+  if exists (select 1 from unnest(v_quantities) as quantity where quantity <= 0) then
+    raise exception 'Quantity must be greater than zero';
+  end if;
+
+  select count(*)
+  into v_locked
+  from (
+    select p.id
+    from public.products p
+    where p.id = any(v_product_ids)
+      and p.vendor_id = p_vendor_id
+      and p.market_id = p_market_id
+      and p.active = true
+      and p.is_available = true
+    order by p.id
+    for update
+  ) locked;
+
+  if v_locked <> cardinality(v_product_ids) then
+    raise exception 'Product not found or unavailable';
+  end if;
+
+  if exists (
+    select 1
+    from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+    join public.products p on p.id = r.product_id
+    where p.stock_quantity < r.quantity
+  ) then
+    raise exception 'Insufficient stock';
+  end if;
+
+  select sum(p.price * r.quantity)
+  into v_total
+  from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+  join public.products p on p.id = r.product_id;
+
+  insert into public.orders (market_id, vendor_id, user_id, total)
+  values (p_market_id, p_vendor_id, p_customer_id, v_total)
+  returning * into v_order;
+
+  perform set_config('app.inventory_event_cause', 'order_created', true);
+  perform set_config('app.inventory_reference_order_id', v_order.id::text, true);
+
+  update public.products p
+  set stock_quantity = p.stock_quantity - r.quantity,
+      is_available = case
+        when p.stock_quantity - r.quantity > 0 then p.is_available
+        else false
+      end
+  from unnest(v_product_ids, v_quantities) as r(product_id, quantity)
+  where p.id = r.product_id;
+
+  insert into public.order_items (
+    order_id,
+    product_id,
+    product_name,
+    line_number,
+    quantity,
+    unit_price,
+    line_total
+  )
+  select
+    v_order.id,
+    p.id,
+    p.name,
+    row_number() over (order by r.position)::integer,
+    r.quantity,
+    p.price,
+    p.price * r.quantity
+  from unnest(v_product_ids, v_quantities, v_positions) as r(product_id, quantity, position)
+  join public.products p on p.id = r.product_id
+  order by p.id;
+
+  insert into public.order_events (order_id, event)
+  values (v_order.id, 'created');
+
+  return v_order;
+end;
+$$;
+
+create or replace function public.refresh_order_item_rollups()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  update public.orders o
+  set item_count = s.item_count,
+      first_item_name = s.first_item_name,
+      search_text = s.search_text
+  from (
+    select
+      oi.order_id,
+      count(*)::integer as item_count,
+      (array_agg(oi.product_name order by oi.line_number, oi.id))[1] as first_item_name,
+      lower(concat_ws(
+        ' ',
+        u.email,
+        string_agg(oi.product_name, ' ' order by oi.product_name)
+      )) as search_text
+    from public.order_items oi
+    join public.orders so on so.id = oi.order_id
+    left join auth.users u on u.id = so.user_id
+    where oi.order_id in (select distinct order_id from new_items)
+    group by oi.order_id, u.email
+  ) s
+  where o.id = s.order_id;
+
+  return null;
+end;
+$$;
+
+update public.orders o
+set first_item_name = s.first_item_name
+from (
+  select
+    oi.order_id,
+    (array_agg(oi.product_name order by oi.line_number, oi.id))[1] as first_item_name
+  from public.order_items oi
+  group by oi.order_id
+) s
+where o.id = s.order_id
+  and o.first_item_name is distinct from s.first_item_name;
@@ -0,0 +1,118 @@
+-- Lock down the idempotency helpers.
+--
+-- claim_idempotency_key and store_idempotency_response are security
+-- definer and were executable by every API role, so a client could claim
+-- a key or overwrite a stored response over PostgREST without running
+-- the wrapped mutation. They are now revoked from public, anon and
+-- authenticated.
+--
+-- The *_idempotent wrappers call them, so the wrappers become security
+-- definer too. The atomic RPCs they call then run as the function owner,
+-- which bypasses RLS. The wrappers therefore check the caller the way
+-- the API does: the customer must be auth.uid(), and the refunding
+-- vendor must be the vendor_id in the caller's JWT app_metadata. The
+-- atomic RPCs still do their own vendor/market/ownership checks.
+
+create or replace function public.create_order_idempotent(
+  p_idempotency_key text,
+  p_ttl_seconds integer,
+  p_market_id uuid,
+  p_vendor_id uuid,
+  p_customer_id uuid,
+  p_items jsonb
+)
+returns public.orders
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_stored jsonb;
+  v_order public.orders;
+begin
+  if p_customer_id is distinct from auth.uid() then
+    raise exception 'Not allowed to place this order';
+  end if;
+
+  v_stored := public.claim_idempotency_key(
+    'create_order',
+    p_idempotency_key,
+    md5(jsonb_build_object(
+      'market_id', p_market_id,
+      'vendor_id', p_vendor_id,
+      'customer_id', p_customer_id,
+      'items', p_items
+    )::text),
+    p_ttl_seconds
+  );
+
+  if v_stored is not null then
+    return jsonb_populate_record(null::public.orders, v_stored);
+  end if;
+
+  v_order := public.create_order_atomic(p_market_id, p_vendor_id, p_customer_id, p_items);
+
+  perform public.store_idempotency_response('create_order', p_idempotency_key, to_jsonb(v_order));
+
+  return v_order;
+end;
+$$;
+
+create or replace function public.refund_order_idempotent(
+  p_idempotency_key text,
+  p_ttl_seconds integer,
+  p_order_id uuid,
+  p_amount numeric,
+  p_reason text,
+  p_vendor_id uuid
+)
+returns public.orders
+language plpgsql
+security definer
+set search_path = ''
+as $$
+declare
+  v_stored jsonb;
+  v_order public.orders;
+begin
+  if p_vendor_id::text is distinct from auth.jwt() -> 'app_metadata' ->> 'vendor_id' then
+    raise exception 'Not allowed to refund this order';
+  end if;
+
+  v_stored := public.claim_idempotency_key(
+    'refund_order',
+    p_idempotency_key,
+    md5(jsonb_build_object(
+      'order_id', p_order_id,
+      'amount', p_amount,
+      'reason', p_reason,
+      'vendor_id', p_vendor_id
+    )::text),
+    p_ttl_seconds
+  );
+
+  if v_stored is not null then
+    return jsonb_populate_record(null::public.orders, v_stored);
+  end if;
+
+  v_order := public.refund_order_atomic(p_order_id, p_amount, p_reason, p_vendor_id);
+
+  perform public.store_idempotency_response('refund_order', p_idempotency_key, to_jsonb(v_order));
+
+  return v_order;
+end;
+$$;
+
+revoke execute on function public.claim_idempotency_key(text, text, text, integer)
+from public, anon, authenticated;
+revoke execute on function public.store_idempotency_response(text, text, jsonb)
+from public, anon, authenticated;
+
+revoke execute on function public.create_order_idempotent(text, integer, uuid, uuid, uuid, jsonb)
+from public, anon;
+revoke execute on function public.refund_order_idempotent(text, integer, uuid, numeric, text, uuid)
+from public, anon;
+grant execute on function public.create_order_idempotent(text, integer, uuid, uuid, uuid, jsonb)
+to authenticated;
+grant execute on function public.refund_order_idempotent(text, integer, uuid, numeric, text, uuid)
+to authenticated;
@@ -0,0 +1,160 @@
+-- Customer emails out of the API-readable orders table.
+--
+-- orders.search_text held a lowercased copy of the customer email, and
+-- any role that can read an order over PostgREST (vendors included)
+-- could select it. The copy also went stale when a user changed email.
+--
+-- The search text now lives in order_search, which has RLS on, no
+-- policies and no grants for anon/authenticated. Search goes through
+-- search_orders(), so an email can be matched but never read back:
+--
+-- - it is security definer and bypasses RLS, so callers other than the
+--   service role must pass their own vendor_id (JWT app_metadata), the
+--   same check as orders_summary_by_scope;
+-- - it returns the orders matching either the text or the id prefix
+--   range, so the API applies its usual select, filters and keyset on
+--   the result.
+--
+-- The text is rebuilt when order items are inserted (as before) and when
+-- a user's email changes.
+
+create table if not exists public.order_search (
+  order_id uuid primary key references public.orders(id) on delete cascade,
+  vendor_id uuid not null,
+  search_text text not null
+);
+
+alter table public.order_search enable row level security;
+
+revoke all on public.order_search from public, anon, authenticated;
+
+create index if not exists idx_order_search_text_trgm
+on public.order_search using gin (search_text gin_trgm_ops);
+
+create index if not exists idx_order_search_vendor
+on public.order_search (vendor_id);
+
+create or replace function public.refresh_order_search(p_order_ids uuid[])
+returns void
+language sql
+security definer
+set search_path = ''
+as $$
+  insert into public.order_search as s (order_id, vendor_id, search_text)
+  select
+    o.id,
+    o.vendor_id,
+    lower(concat_ws(
+      ' ',
+      u.email,
+      string_agg(oi.product_name, ' ' order by oi.product_name)
+    ))
+  from public.orders o
+  join public.order_items oi on oi.order_id = o.id
+  left join auth.users u on u.id = o.user_id
+  where o.id = any(p_order_ids)
+  group by o.id, o.vendor_id, u.email
+  order by o.id
+  on conflict (order_id) do update
+  set search_text = excluded.search_text;
+$$;
+
+revoke execute on function public.refresh_order_search(uuid[]) from public, anon, authenticated;
+
+create or replace function public.refresh_order_item_rollups()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  update public.orders o
+  set item_count = s.item_count,
+      first_item_name = s.first_item_name
+  from (
+    select
+      oi.order_id,
+      count(*)::integer as item_count,
+      (array_agg(oi.product_name order by oi.line_number, oi.id))[1] as first_item_name
+    from public.order_items oi
+    where oi.order_id in (select distinct order_id from new_items)
+    group by oi.order_id
+  ) s
+  where o.id = s.order_id;
+
+  perform public.refresh_order_search(array(select distinct order_id from new_items));
+
+  return null;
+end;
+$$;
+
+create or replace function public.refresh_user_order_search()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+  perform public.refresh_order_search(
+    array(select o.id from public.orders o where o.user_id = new.id)
+  );
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_refresh_user_order_search on auth.users;
+
+create trigger trg_refresh_user_order_search
+after update of email on auth.users
+for each row
+when (old.email is distinct from new.email)
+execute function public.refresh_user_order_search();
+
+create or replace function public.search_orders(
+  p_text text default null,
+  p_vendor_id uuid default null,
+  p_id_from uuid default null,
+  p_id_to uuid default null
+)
+returns setof public.orders
+language plpgsql
+stable
+security definer
+set search_path = ''
+as $$
+begin
+  if coalesce(auth.jwt() ->> 'role', '') <> 'service_role'
+     and (
+       p_vendor_id is null
+       or p_vendor_id::text is distinct from auth.jwt() -> 'app_metadata' ->> 'vendor_id'
+     ) then
+    raise exception 'Not allowed to search these orders';
+  end if;
+
+  return query
+  select o.*
+  from public.orders o
+  where (p_vendor_id is null or o.vendor_id = p_vendor_id)
+    and (
+      o.id between p_id_from and p_id_to
+      or o.id in (
+        select s.order_id
+        from public.order_search s
+        where s.search_text ilike '%' || p_text || '%'
+          and (p_vendor_id is null or s.vendor_id = p_vendor_id)
+      )
+    );
+end;
+$$;
+
+revoke execute on function public.search_orders(text, uuid, uuid, uuid) from public, anon;
+grant execute on function public.search_orders(text, uuid, uuid, uuid) to authenticated;
+
+-- Backfill, then drop the readable copy.
+select public.refresh_order_search(array(select o.id from public.orders o));
+
+drop index if exists public.idx_orders_search_text_trgm;
+
+alter table public.orders
+drop column if exists search_text;